@@ -53,7 +53,10 @@ def run_migrations_online() -> None:
     with connectable.connect() as connection:
         context.configure(
             connection=connection,
-            target_metadata=target_metadata
+            target_metadata=target_metadata,
+            # One transaction per revision, so a long migration does not hold the
+            # locks of earlier ones and app.db.online_migrations can commit between steps
+            transaction_per_migration=True
         )
 
         with context.begin_transaction():
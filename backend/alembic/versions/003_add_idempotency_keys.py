@@ -0,0 +1,42 @@
+"""Add idempotency_keys table
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create idempotency_keys table (shared replay store for multi-worker deployments)
+    op.create_table(
+        'idempotency_keys',
+        sa.Column('key', sa.String(length=300), nullable=False),
+        sa.Column('request_fingerprint', sa.String(length=64), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('response_headers', postgresql.JSONB(), nullable=True),
+        sa.Column('response_body', sa.LargeBinary(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+    )
+
+    # Create indexes
+    op.create_index(op.f('ix_idempotency_keys_expires_at'), 'idempotency_keys', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    # Drop indexes
+    op.drop_index(op.f('ix_idempotency_keys_expires_at'), table_name='idempotency_keys')
+
+    # Drop table
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,63 @@
+"""Add full-text and trigram search to channel_registrations
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 15:00:00.000000
+
+Needs a maintenance window on a large table: adding the stored generated column rewrites
+channel_registrations under an ACCESS EXCLUSIVE lock, blocking reads and writes until every
+row has its search_vector (PostgreSQL cannot add a generated column without computing it,
+so it cannot be backfilled in batches). The indexes are built concurrently afterwards.
+
+"""
+from alembic import op
+
+from app.db.online_migrations import create_index_concurrently, drop_index_concurrently, run_with_lock_timeout
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+# 'simple' config: channel names are brand names in many languages, so no stemming or stop words.
+# Titles rank above descriptions.
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('simple'::regconfig, coalesce(open_channel_title, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(closed_channel_title, '')), 'A') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(open_channel_description, '')), 'B') || "
+    "setweight(to_tsvector('simple'::regconfig, coalesce(closed_channel_description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    # Trigram operators for fuzzy title matching
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    # Generated tsvector column, kept up to date by PostgreSQL on every insert/update.
+    # The rewrite runs to completion once it has its lock (statement_timeout 0).
+    run_with_lock_timeout([
+        "ALTER TABLE channel_registrations ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR_EXPRESSION}) STORED"
+    ])
+
+    create_index_concurrently(
+        'ix_channel_registrations_search_vector', 'channel_registrations', ['search_vector'], using='gin'
+    )
+    create_index_concurrently(
+        'ix_channel_registrations_open_channel_title_trgm', 'channel_registrations',
+        ['open_channel_title gin_trgm_ops'], using='gin'
+    )
+    create_index_concurrently(
+        'ix_channel_registrations_closed_channel_title_trgm', 'channel_registrations',
+        ['closed_channel_title gin_trgm_ops'], using='gin'
+    )
+
+
+def downgrade() -> None:
+    drop_index_concurrently('ix_channel_registrations_closed_channel_title_trgm')
+    drop_index_concurrently('ix_channel_registrations_open_channel_title_trgm')
+    drop_index_concurrently('ix_channel_registrations_search_vector')
+
+    run_with_lock_timeout(["ALTER TABLE channel_registrations DROP COLUMN IF EXISTS search_vector"])
+    # pg_trgm is left installed; other objects may depend on it
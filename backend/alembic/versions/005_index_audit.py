@@ -0,0 +1,58 @@
+"""Index audit: drop redundant indexes, add partial indexes for real query shapes
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Duplicates of the primary key indexes
+    op.drop_index('ix_channel_registrations_id', table_name='channel_registrations')
+    op.drop_index('ix_network_currency_mappings_id', table_name='network_currency_mappings')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+
+    # B-tree on a boolean: too unselective for the planner to use, still maintained on every write
+    op.drop_index('ix_channel_registrations_is_active', table_name='channel_registrations')
+
+    # Moderation queue: active, unverified registrations, oldest first
+    op.create_index(
+        'ix_channel_registrations_pending_created_at', 'channel_registrations', ['created_at'],
+        unique=False, postgresql_where=sa.text('is_active AND NOT verified')
+    )
+
+    # Listings of active registrations, newest first
+    op.create_index(
+        'ix_channel_registrations_active_created_at', 'channel_registrations', [sa.text('created_at DESC')],
+        unique=False, postgresql_where=sa.text('is_active')
+    )
+
+    # Active currencies per network; replaces the plain network_code index
+    op.drop_index('ix_network_currency_mappings_network_code', table_name='network_currency_mappings')
+    op.create_index(
+        'ix_network_currency_mappings_active_network', 'network_currency_mappings',
+        ['network_code', 'currency_code'],
+        unique=False, postgresql_where=sa.text('is_active')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_network_currency_mappings_active_network', table_name='network_currency_mappings')
+    op.create_index('ix_network_currency_mappings_network_code', 'network_currency_mappings', ['network_code'])
+
+    op.drop_index('ix_channel_registrations_active_created_at', table_name='channel_registrations')
+    op.drop_index('ix_channel_registrations_pending_created_at', table_name='channel_registrations')
+
+    op.create_index('ix_channel_registrations_is_active', 'channel_registrations', ['is_active'])
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index('ix_network_currency_mappings_id', 'network_currency_mappings', ['id'])
+    op.create_index('ix_channel_registrations_id', 'channel_registrations', ['id'])
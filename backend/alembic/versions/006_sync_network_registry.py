@@ -0,0 +1,111 @@
+"""Sync network_currency_mappings with the network registry
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+mappings_table = sa.table(
+    'network_currency_mappings',
+    sa.column('network_code', sa.String),
+    sa.column('network_name', sa.String),
+    sa.column('currency_code', sa.String),
+    sa.column('currency_name', sa.String),
+)
+
+# app.services.network_registry.MAPPINGS as of this revision, copied so the migration
+# does not change when the registry does
+REGISTRY_006 = [
+    ('BTC', 'Bitcoin', 'BTC', 'Bitcoin'),
+    ('ETH', 'Ethereum', 'ETH', 'Ethereum'),
+    ('ETH', 'Ethereum', 'USDT', 'Tether USD'),
+    ('ETH', 'Ethereum', 'USDC', 'USD Coin'),
+    ('ETH', 'Ethereum', 'DAI', 'Dai Stablecoin'),
+    ('BSC', 'Binance Smart Chain', 'BNB', 'BNB'),
+    ('BSC', 'Binance Smart Chain', 'USDT', 'Tether USD'),
+    ('BSC', 'Binance Smart Chain', 'USDC', 'USD Coin'),
+    ('BSC', 'Binance Smart Chain', 'BUSD', 'Binance USD'),
+    ('POLYGON', 'Polygon', 'MATIC', 'Polygon'),
+    ('POLYGON', 'Polygon', 'USDT', 'Tether USD'),
+    ('POLYGON', 'Polygon', 'USDC', 'USD Coin'),
+    ('ARBITRUM', 'Arbitrum', 'ETH', 'Ethereum'),
+    ('ARBITRUM', 'Arbitrum', 'USDT', 'Tether USD'),
+    ('ARBITRUM', 'Arbitrum', 'USDC', 'USD Coin'),
+    ('OPTIMISM', 'Optimism', 'ETH', 'Ethereum'),
+    ('OPTIMISM', 'Optimism', 'USDT', 'Tether USD'),
+    ('OPTIMISM', 'Optimism', 'USDC', 'USD Coin'),
+    ('AVALANCHE', 'Avalanche C-Chain', 'AVAX', 'Avalanche'),
+    ('AVALANCHE', 'Avalanche C-Chain', 'USDT', 'Tether USD'),
+    ('AVALANCHE', 'Avalanche C-Chain', 'USDC', 'USD Coin'),
+    ('BASE', 'Base', 'ETH', 'Ethereum'),
+    ('BASE', 'Base', 'USDC', 'USD Coin'),
+    ('LINEA', 'Linea', 'ETH', 'Ethereum'),
+    ('LINEA', 'Linea', 'USDC', 'USD Coin'),
+    ('SOL', 'Solana', 'SOL', 'Solana'),
+    ('SOL', 'Solana', 'USDT', 'Tether USD'),
+    ('SOL', 'Solana', 'USDC', 'USD Coin'),
+    ('TRX', 'Tron', 'TRX', 'Tron'),
+    ('TRX', 'Tron', 'USDT', 'Tether USD'),
+    ('TRX', 'Tron', 'USDC', 'USD Coin'),
+    ('TON', 'The Open Network', 'TON', 'Toncoin'),
+    ('TON', 'The Open Network', 'USDT', 'Tether USD'),
+]
+
+# Rows seeded by 001 (SOLANA/TRON codes, different display names), restored on downgrade
+SEED_001 = [
+    ('BTC', 'Bitcoin', 'BTC', 'Bitcoin'),
+    ('ETH', 'Ethereum', 'ETH', 'Ethereum'),
+    ('ETH', 'Ethereum', 'USDT', 'Tether USD'),
+    ('ETH', 'Ethereum', 'USDC', 'USD Coin'),
+    ('BSC', 'BNB Smart Chain', 'BNB', 'Binance Coin'),
+    ('BSC', 'BNB Smart Chain', 'USDT', 'Tether USD'),
+    ('BSC', 'BNB Smart Chain', 'BUSD', 'Binance USD'),
+    ('POLYGON', 'Polygon', 'MATIC', 'Polygon'),
+    ('POLYGON', 'Polygon', 'USDT', 'Tether USD'),
+    ('POLYGON', 'Polygon', 'USDC', 'USD Coin'),
+    ('ARBITRUM', 'Arbitrum', 'ETH', 'Ethereum'),
+    ('ARBITRUM', 'Arbitrum', 'USDT', 'Tether USD'),
+    ('ARBITRUM', 'Arbitrum', 'USDC', 'USD Coin'),
+    ('OPTIMISM', 'Optimism', 'ETH', 'Ethereum'),
+    ('OPTIMISM', 'Optimism', 'USDT', 'Tether USD'),
+    ('OPTIMISM', 'Optimism', 'USDC', 'USD Coin'),
+    ('AVALANCHE', 'Avalanche', 'AVAX', 'Avalanche'),
+    ('AVALANCHE', 'Avalanche', 'USDT', 'Tether USD'),
+    ('AVALANCHE', 'Avalanche', 'USDC', 'USD Coin'),
+    ('BASE', 'Base', 'ETH', 'Ethereum'),
+    ('BASE', 'Base', 'USDC', 'USD Coin'),
+    ('LINEA', 'Linea', 'ETH', 'Ethereum'),
+    ('LINEA', 'Linea', 'USDT', 'Tether USD'),
+    ('LINEA', 'Linea', 'USDC', 'USD Coin'),
+    ('SOLANA', 'Solana', 'SOL', 'Solana'),
+    ('SOLANA', 'Solana', 'USDT', 'Tether USD'),
+    ('SOLANA', 'Solana', 'USDC', 'USD Coin'),
+    ('TRON', 'Tron', 'TRX', 'Tron'),
+    ('TRON', 'Tron', 'USDT', 'Tether USD'),
+    ('TON', 'The Open Network', 'TON', 'Toncoin'),
+    ('TON', 'The Open Network', 'USDT', 'Tether USD'),
+]
+
+
+COLUMNS = ('network_code', 'network_name', 'currency_code', 'currency_name')
+
+
+def upgrade() -> None:
+    # A few dozen rows: replace them wholesale with the registry's view.
+    # A later registry change needs its own revision with a new snapshot.
+    op.execute(mappings_table.delete())
+    op.bulk_insert(mappings_table, [dict(zip(COLUMNS, row)) for row in REGISTRY_006])
+
+
+def downgrade() -> None:
+    op.execute(mappings_table.delete())
+    op.bulk_insert(mappings_table, [dict(zip(COLUMNS, row)) for row in SEED_001])
@@ -0,0 +1,26 @@
+"""Add channel_registrations.verification_notes
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 19:00:00.000000
+
+"""
+from app.db.online_migrations import run_with_lock_timeout
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Nullable without a default: a catalog-only change, but it still needs an ACCESS EXCLUSIVE lock.
+    # IF NOT EXISTS covers databases created from the models by init_db().
+    run_with_lock_timeout([
+        "ALTER TABLE channel_registrations ADD COLUMN IF NOT EXISTS verification_notes VARCHAR(500)"
+    ])
+
+
+def downgrade() -> None:
+    run_with_lock_timeout(["ALTER TABLE channel_registrations DROP COLUMN IF EXISTS verification_notes"])
@@ -0,0 +1,69 @@
+"""Notify registration_events on new registrations and moderation changes
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+from alembic import op
+
+from app.db.online_migrations import run_with_lock_timeout
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+# Payload fields are those of ChannelRegistrationResponse, plus the event type and which
+# moderation fields changed; well under the 8000-byte NOTIFY payload limit
+CREATE_FUNCTION = """
+CREATE OR REPLACE FUNCTION notify_registration_event() RETURNS trigger AS $$
+DECLARE
+    changed text[] := '{}';
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        IF NEW.verified IS DISTINCT FROM OLD.verified THEN
+            changed := changed || 'verified'::text;
+        END IF;
+        IF NEW.verification_notes IS DISTINCT FROM OLD.verification_notes THEN
+            changed := changed || 'verification_notes'::text;
+        END IF;
+        IF NEW.is_active IS DISTINCT FROM OLD.is_active THEN
+            changed := changed || 'is_active'::text;
+        END IF;
+        IF cardinality(changed) = 0 THEN
+            RETURN NULL;
+        END IF;
+    END IF;
+    PERFORM pg_notify('registration_events', json_build_object(
+        'type', CASE TG_OP WHEN 'INSERT' THEN 'registration.created' ELSE 'registration.moderated' END,
+        'id', NEW.id,
+        'open_channel_id', NEW.open_channel_id,
+        'open_channel_title', NEW.open_channel_title,
+        'closed_channel_id', NEW.closed_channel_id,
+        'closed_channel_title', NEW.closed_channel_title,
+        'created_at', NEW.created_at,
+        'is_active', NEW.is_active,
+        'verified', NEW.verified,
+        'changed', to_json(changed)
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    op.execute(CREATE_FUNCTION)
+    # AFTER ... FOR EACH ROW: notifications are delivered on commit, never for rolled-back rows
+    run_with_lock_timeout([
+        "CREATE TRIGGER channel_registrations_notify "
+        "AFTER INSERT OR UPDATE OF verified, verification_notes, is_active ON channel_registrations "
+        "FOR EACH ROW EXECUTE FUNCTION notify_registration_event()"
+    ])
+
+
+def downgrade() -> None:
+    run_with_lock_timeout(["DROP TRIGGER IF EXISTS channel_registrations_notify ON channel_registrations"])
+    op.execute("DROP FUNCTION IF EXISTS notify_registration_event()")
@@ -2,8 +2,9 @@
 API Router - Version 1
 Aggregates all API endpoints
 """
-from fastapi import APIRouter
-from app.api.v1.endpoints import registration, networks, auth
+from fastapi import APIRouter, Depends
+from app.api.v1.endpoints import registration, networks, auth, admin
+from app.core.security import require_admin
 
 api_router = APIRouter()
 
@@ -11,3 +12,4 @@ api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(registration.router, prefix="/register", tags=["registration"])
 api_router.include_router(networks.router, prefix="/networks", tags=["networks"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
@@ -0,0 +1,344 @@
+"""
+Admin Endpoints
+Support and diagnostics API, guarded by the X-Admin-Token header
+"""
+from dataclasses import asdict
+from typing import AsyncIterator, Optional
+import asyncio
+import csv
+import io
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.responses import model_json_response
+from app.db.database import AsyncSessionLocal, ReplicaSessionLocal, get_read_db, get_write_db, pool_metrics
+from app.db.read_models import RegistrationExportRow
+from app.db.query_stats import query_stats
+from app.middleware.admission import admission_stats
+from app.schemas.channel import (
+    ChannelBulkModerationRequest, ChannelBulkModerationResponse, ChannelRegistrationListResponse,
+    ChannelRegistrationResponse, ChannelSearchResponse,
+)
+from app.services.channel_availability import channel_id_index
+from app.services.memory_diagnostics import component_sizes, memory_diagnostics
+from app.services.moderation import RegistrationModerationService
+from app.services.profiling import profile_store
+from app.services.recaptcha import RecaptchaService
+from app.services.registration_events import CLOSED, OVERFLOW, encode_event, registration_events
+from app.services.registrations import RegistrationReadService
+from app.services.response_cache import cache_stats, invalidate_caches
+from app.services.search import ChannelSearchService
+
+router = APIRouter()
+
+
+@router.get("/channels/search", response_model=ChannelSearchResponse)
+async def search_channels(
+    q: str = Query(..., min_length=1, max_length=200, description="Words or part of a channel title"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, max_length=200, description="next_cursor from the previous page"),
+    include_inactive: bool = Query(False),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Search channel registrations by title and description
+
+    Results are ordered by relevance. Supports web-search syntax
+    ("quoted phrases", -excluded, or) and tolerates typos in titles.
+    """
+    page = await ChannelSearchService.search(db, q.strip(), limit, cursor, include_inactive)
+    return model_json_response(page)
+
+
+@router.get("/channels", response_model=ChannelRegistrationListResponse)
+async def list_channels(
+    status_filter: str = Query("pending", alias="status", pattern="^(pending|active|all)$",
+                               description="pending: moderation queue, oldest first; active/all: newest first"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, max_length=200, description="next_cursor from the previous page"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """Page through channel registrations"""
+    rows, next_cursor = await RegistrationReadService.list_page(db, status_filter, limit, cursor)
+    return model_json_response(ChannelRegistrationListResponse(
+        results=[ChannelRegistrationResponse.model_validate(row) for row in rows],
+        next_cursor=next_cursor
+    ))
+
+
+@router.get("/channels/export")
+async def export_channels(include_inactive: bool = Query(False)):
+    """
+    Download all registrations as CSV, streamed in id order
+
+    The query runs and its first batch is fetched before the response starts, so a failing
+    query is an error response rather than a truncated 200. A failure later in the stream
+    can only end it early.
+    """
+    # Request-scoped sessions are closed before a streamed body is sent; use our own
+    session = (ReplicaSessionLocal or AsyncSessionLocal)()
+    rows = RegistrationReadService.export(session, include_inactive)
+    try:
+        first: Optional[RegistrationExportRow] = await anext(rows, None)
+    except BaseException:
+        await rows.aclose()
+        await session.close()
+        raise
+
+    async def generate() -> AsyncIterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(RegistrationExportRow._fields)
+        try:
+            if first is not None:
+                writer.writerow(first)
+                async for row in rows:
+                    writer.writerow(row)
+                    if buffer.tell() >= 64 * 1024:
+                        yield buffer.getvalue()
+                        buffer.seek(0)
+                        buffer.truncate()
+        finally:
+            await rows.aclose()
+            await session.close()
+        yield buffer.getvalue()
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="channel_registrations.csv"'}
+    )
+
+
+@router.post("/channels/moderation", response_model=ChannelBulkModerationResponse)
+async def moderate_channels(body: ChannelBulkModerationRequest, db: AsyncSession = Depends(get_write_db)):
+    """
+    Set verified, verification_notes and/or is_active on many registrations at once
+
+    Select them by `ids` or by `filter` (default status: pending). Changes are applied in
+    batches of MODERATION_BATCH_SIZE, each one UPDATE in its own transaction.
+    """
+    return model_json_response(await RegistrationModerationService.apply(db, body))
+
+
+@router.get("/channels/{registration_id}", response_model=ChannelRegistrationResponse)
+async def get_channel(registration_id: int, db: AsyncSession = Depends(get_read_db)):
+    """Look up one registration by id"""
+    row = await RegistrationReadService.get(db, registration_id)
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Registration not found")
+    return model_json_response(ChannelRegistrationResponse.model_validate(row))
+
+
+@router.get("/profiles")
+async def list_profiles():
+    """List stored request profiles, newest first (requires PROFILING_ENABLED)"""
+    return {"profiles": [asdict(artifact) for artifact in profile_store.list()]}
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str):
+    """
+    Download one profile
+
+    - collapsed: text, one stack per line; feed to flamegraph.pl or speedscope
+    - pstats: binary; open with `python -m pstats <file>` or snakeviz
+    """
+    artifact = profile_store.get(profile_id)
+    if artifact is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+
+    data_path = profile_store.data_path(artifact.id, artifact.format)
+    if not data_path.exists():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    media_type = "text/plain" if artifact.format == "collapsed" else "application/octet-stream"
+    return FileResponse(data_path, media_type=media_type, filename=data_path.name)
+
+
+@router.get("/sql/statements")
+async def top_sql_statements(
+    limit: int = Query(20, ge=1, le=500),
+    order_by: str = Query("total_ms", pattern="^(total_ms|mean_ms|max_ms|calls|slow_calls)$")
+):
+    """Top normalized SQL statements of this worker since start or the last reset"""
+    return {
+        "since": query_stats.started_at,
+        "slow_query_ms": query_stats.slow_query_ms,
+        "statements": query_stats.top_statements(limit, order_by),
+    }
+
+
+@router.get("/sql/routes")
+async def sql_by_route():
+    """Statements and DB time per route of this worker, most DB time first"""
+    return {"since": query_stats.started_at, "routes": query_stats.routes()}
+
+
+@router.delete("/sql/stats", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_sql_stats():
+    """Clear this worker's SQL statistics"""
+    query_stats.reset()
+
+
+@router.get("/db")
+async def database_status():
+    """Connection pool state per engine (primary and optional replica) and read routing counters"""
+    return pool_metrics()
+
+
+@router.get("/caches")
+async def list_caches():
+    """Response cache sizes and hit/miss counters of this worker"""
+    return {"caches": cache_stats()}
+
+
+@router.delete("/caches/{name}")
+async def invalidate_cache(name: str, prefix: Optional[str] = Query(None, description="Only keys starting with this")):
+    """Drop entries from a response cache of this worker"""
+    return {"invalidated": invalidate_caches(name, prefix=prefix)}
+
+
+@router.get("/recaptcha")
+async def recaptcha_status():
+    """reCAPTCHA circuit breaker state and counters of this worker"""
+    return {
+        "failure_policy": settings.RECAPTCHA_FAILURE_POLICY,
+        "timeout_seconds": settings.RECAPTCHA_TIMEOUT_SECONDS,
+        "breaker": RecaptchaService.breaker.stats(),
+    }
+
+
+@router.get("/admission")
+async def admission_status():
+    """Admission control limits, queue depth and shed counts of this worker"""
+    return {
+        "enabled": settings.ADMISSION_CONTROL_ENABLED,
+        "request_timeout_seconds": settings.REQUEST_TIMEOUT_SECONDS,
+        "limiters": admission_stats(),
+    }
+
+
+@router.get("/channel-id-filter")
+async def channel_id_filter_status():
+    """Size, fill and hit counters of this worker's channel ID availability filter"""
+    return {
+        "enabled": settings.CHANNEL_ID_FILTER_ENABLED,
+        "refresh_seconds": settings.CHANNEL_ID_FILTER_REFRESH_SECONDS,
+        "filter": channel_id_index.stats(),
+    }
+
+
+@router.get("/events")
+async def registration_event_stream():
+    """
+    Server-Sent Events: registration.created and registration.moderated as they commit
+
+    Payloads carry the ChannelRegistrationResponse fields plus `changed` (moderation fields
+    that changed). A `stream.reconnected` event means events may have been missed, and
+    `stream.overflow` that this stream fell behind and was closed: refetch in both cases.
+    Idle streams get a comment line every EVENTS_HEARTBEAT_SECONDS.
+    """
+    if not settings.EVENTS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Event stream is disabled")
+    if not registration_events.has_capacity():
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many open event streams")
+
+    async def generate() -> AsyncIterator[str]:
+        # Subscribed inside the generator so its finally always runs, even on early disconnects
+        subscriber = registration_events.subscribe()
+        if subscriber is None:
+            yield encode_event(OVERFLOW)
+            return
+        try:
+            yield "retry: 5000\n\n"
+            while not subscriber.overflowed:
+                try:
+                    event = await asyncio.wait_for(subscriber.queue.get(), settings.EVENTS_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield encode_event(event)
+                if event is CLOSED:
+                    return
+            yield encode_event(OVERFLOW)
+        finally:
+            registration_events.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/events/stats")
+async def registration_event_stats():
+    """Listener state, open streams and delivery counters of this worker"""
+    return {"enabled": settings.EVENTS_ENABLED, **registration_events.stats()}
+
+
+@router.get("/memory")
+async def memory_status():
+    """
+    RSS, tracemalloc state and snapshots, and entry counts of in-process caches and pools
+
+    Everything here is per worker (see `pid`); with several workers, successive admin
+    calls may reach different ones.
+    """
+    return {**memory_diagnostics.status(), "components": component_sizes()}
+
+
+@router.post("/memory/tracing/start")
+async def start_memory_tracing(frames: int = Query(settings.MEMORY_TRACE_FRAMES, ge=1, le=50)):
+    """Start tracemalloc on this worker (no-op if already running)"""
+    memory_diagnostics.start(frames)
+    return memory_diagnostics.status()
+
+
+@router.post("/memory/tracing/stop")
+async def stop_memory_tracing():
+    """Stop tracemalloc on this worker; snapshots are kept"""
+    memory_diagnostics.stop()
+    return memory_diagnostics.status()
+
+
+@router.post("/memory/snapshots", status_code=status.HTTP_201_CREATED)
+async def take_memory_snapshot(name: str = Query(..., pattern=r"^[A-Za-z0-9_.-]{1,64}$")):
+    """Take a named tracemalloc snapshot (replaces one with the same name)"""
+    try:
+        return await asyncio.to_thread(memory_diagnostics.take_snapshot, name)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.get("/memory/snapshots")
+async def list_memory_snapshots():
+    """Snapshots held by this worker, oldest first"""
+    return {"snapshots": memory_diagnostics.list()}
+
+
+@router.get("/memory/snapshots/{name}/diff")
+async def diff_memory_snapshots(
+    name: str,
+    against: Optional[str] = Query(None, description="Later snapshot; default: a snapshot taken now"),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    limit: int = Query(25, ge=1, le=500)
+):
+    """Allocations that grew the most between two snapshots, by file and line"""
+    try:
+        result = await asyncio.to_thread(memory_diagnostics.diff, name, against, group_by, limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Snapshot not found")
+    return result
+
+
+@router.delete("/memory/snapshots/{name}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_memory_snapshot(name: str):
+    """Drop a snapshot"""
+    if not memory_diagnostics.delete(name):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Snapshot not found")
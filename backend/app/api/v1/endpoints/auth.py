@@ -1,8 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import math
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.database import get_async_db
+from slowapi.util import get_remote_address
+from app.core.config import settings
+from app.core.responses import model_json_response
+from app.db.database import get_read_db, get_write_db
 from app.schemas.auth import UserSignup, UserLogin, AuthResponse, UserResponse
 from app.services.auth import AuthService
+from app.services.login_throttle import login_throttle
 
 router = APIRouter()
 
@@ -10,7 +16,7 @@ router = APIRouter()
 @router.post("/signup", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
 async def signup(
     signup_data: UserSignup,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """
     Create a new user account
@@ -25,10 +31,13 @@ async def signup(
         user = await AuthService.create_user(db, signup_data)
 
         # Return response
-        return AuthResponse(
-            user=UserResponse.model_validate(user),
-            message="Account created successfully! You can now log in.",
-            token=None  # Can add JWT token here later
+        return model_json_response(
+            AuthResponse(
+                user=UserResponse.model_validate(user),
+                message="Account created successfully! You can now log in.",
+                token=None  # Can add JWT token here later
+            ),
+            status_code=status.HTTP_201_CREATED
         )
     except HTTPException:
         raise
@@ -41,24 +50,48 @@ async def signup(
 
 @router.post("/login", response_model=AuthResponse)
 async def login(
+    request: Request,
     login_data: UserLogin,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Login to an existing account
 
     - **email**: User email address
     - **password**: User password
+
+    Attempts are throttled per email and per IP before any password check
     """
+    client_ip = get_remote_address(request)
+
+    if settings.LOGIN_THROTTLE_ENABLED:
+        retry_after = login_throttle.check(login_data.email, client_ip)
+        if retry_after is not None:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts. Please try again later.",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+            )
+
     try:
         # Authenticate user
-        user = await AuthService.authenticate_user(db, login_data)
+        try:
+            user = await AuthService.authenticate_user(db, login_data)
+        except HTTPException as e:
+            if settings.LOGIN_THROTTLE_ENABLED and e.status_code == status.HTTP_401_UNAUTHORIZED:
+                login_throttle.record_failure(login_data.email, client_ip)
+            raise
+
+        if settings.LOGIN_THROTTLE_ENABLED:
+            login_throttle.record_success(login_data.email, client_ip)
 
         # Return response
-        return AuthResponse(
-            user=UserResponse.model_validate(user),
-            message="Login successful!",
-            token=None  # Can add JWT token here later
+        return model_json_response(
+            AuthResponse(
+                user=UserResponse.model_validate(user),
+                message="Login successful!",
+                token=None  # Can add JWT token here later
+            )
         )
     except HTTPException:
         raise
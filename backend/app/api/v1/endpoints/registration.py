@@ -1,13 +1,19 @@
 """
 Channel Registration API Endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from app.db.database import get_async_db
-from app.schemas.channel import ChannelRegistrationCreate, ChannelRegistrationResponse
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.core.config import settings
+from app.core.responses import model_json_response
+from app.db.database import get_read_db, get_write_db
+from app.db.group_commit import GroupCommitWriter
+from app.schemas.channel import ChannelAvailabilityResponse, ChannelRegistrationCreate, ChannelRegistrationResponse
 from app.models.channel import ChannelRegistration
-from app.services.validators import CryptoAddressValidator, validate_channel_id, sanitize_input
+from app.services.channel_availability import channel_id_index
+from app.services.validators import CryptoAddressValidator, sanitize_input
+from app.services.network_registry import is_supported_pair
 from app.services.recaptcha import RecaptchaService
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -17,7 +23,22 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Rate limiter
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=get_remote_address, enabled=settings.RATE_LIMIT_ENABLED)
+
+# Columns returned by the registration insert (the fields of ChannelRegistrationResponse)
+REGISTRATION_RESPONSE_COLUMNS = [
+    getattr(ChannelRegistration, name) for name in ChannelRegistrationResponse.model_fields
+]
+
+# Used instead of the request's own transaction when GROUP_COMMIT_ENABLED
+registration_writer = GroupCommitWriter(
+    ChannelRegistration,
+    REGISTRATION_RESPONSE_COLUMNS,
+    unique_keys=("open_channel_id", "closed_channel_id"),
+    window_ms=settings.GROUP_COMMIT_WINDOW_MS,
+    max_batch=settings.GROUP_COMMIT_MAX_BATCH,
+    statement_timeout_ms=settings.GROUP_COMMIT_STATEMENT_TIMEOUT_MS,
+)
 
 
 @router.post("/", response_model=ChannelRegistrationResponse, status_code=status.HTTP_201_CREATED)
@@ -25,14 +46,14 @@ limiter = Limiter(key_func=get_remote_address)
 async def register_channel(
     request: Request,
     registration_data: ChannelRegistrationCreate,
-    db: AsyncSession = Depends(get_async_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """
     Register a new Telegram channel for subscription payments
 
     Rate limited to 5 registrations per hour per IP address
     """
-    logger.info(f"Registration attempt from IP: {get_remote_address(request)}")
+    logger.info("Registration attempt from IP: %s", get_remote_address(request))
 
     # 1. Verify reCAPTCHA
     is_valid, score = await RecaptchaService.verify_token(
@@ -41,35 +62,15 @@ async def register_channel(
     )
 
     if not is_valid:
-        logger.warning(f"reCAPTCHA verification failed. Score: {score}")
+        logger.warning("reCAPTCHA verification failed. Score: %s", score)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="reCAPTCHA verification failed. Please try again."
         )
 
-    # 2. Validate channel IDs
-    is_valid, error_msg = validate_channel_id(registration_data.open_channel_id)
-    if not is_valid:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Open channel: {error_msg}")
-
-    is_valid, error_msg = validate_channel_id(registration_data.closed_channel_id)
-    if not is_valid:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Closed channel: {error_msg}")
-
-    # 3. Check if channel already exists
-    stmt = select(ChannelRegistration).where(
-        (ChannelRegistration.open_channel_id == registration_data.open_channel_id) |
-        (ChannelRegistration.closed_channel_id == registration_data.closed_channel_id)
-    )
-    result = await db.execute(stmt)
-    existing = result.scalar_one_or_none()
+    # 2. Channel ID format and length are enforced by ChannelRegistrationCreate
 
-    if existing:
-        logger.warning(f"Duplicate channel registration attempt: {registration_data.open_channel_id}")
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Channel already registered. Please contact support if you need to update your registration."
-        )
+    # 3. Duplicate channels are rejected by the insert itself (step 7)
 
     # 4. Validate cryptocurrency address
     is_valid, error_msg = CryptoAddressValidator.validate_address(
@@ -78,9 +79,17 @@ async def register_channel(
     )
 
     if not is_valid:
-        logger.warning(f"Invalid wallet address: {error_msg}")
+        logger.warning("Invalid wallet address: %s", error_msg)
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=error_msg)
 
+    # Network and currency codes are upper-cased by the schema
+    if not is_supported_pair(registration_data.client_payout_network, registration_data.client_payout_currency):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{registration_data.client_payout_currency} payouts are not supported on "
+                   f"{registration_data.client_payout_network}"
+        )
+
     # 5. Validate tier configuration
     if registration_data.sub_1_price and not registration_data.sub_1_time:
         raise HTTPException(
@@ -108,24 +117,66 @@ async def register_channel(
     }
 
     # 7. Create database record
+    # One round trip: the unique indexes on open/closed channel ID arbitrate concurrent
+    # submissions, and RETURNING hands back server defaults without a refresh query
     try:
-        new_registration = ChannelRegistration(**sanitized_data)
-        db.add(new_registration)
-        await db.commit()
-        await db.refresh(new_registration)
-
-        logger.info(f"Successfully registered channel: {new_registration.open_channel_id}")
-
-        return new_registration
+        if settings.GROUP_COMMIT_ENABLED:
+            # Shares one INSERT and one commit with registrations arriving alongside it
+            created = await registration_writer.insert(sanitized_data, client_key=get_remote_address(request))
+        else:
+            stmt = (
+                pg_insert(ChannelRegistration)
+                .values(**sanitized_data)
+                .on_conflict_do_nothing()
+                .returning(*REGISTRATION_RESPONSE_COLUMNS)
+            )
+            result = await db.execute(stmt)
+            created = result.mappings().one_or_none()
+            await db.commit()
 
     except Exception as e:
         await db.rollback()
-        logger.error(f"Database error during registration: {e}")
+        logger.error("Database error during registration: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Registration failed. Please try again later."
         )
 
+    if created is None:
+        logger.warning("Duplicate channel registration attempt: %s", registration_data.open_channel_id)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Channel already registered. Please contact support if you need to update your registration."
+        )
+
+    logger.info("Successfully registered channel: %s", created["open_channel_id"])
+    channel_id_index.add(created["open_channel_id"], created["closed_channel_id"])
+
+    return model_json_response(
+        ChannelRegistrationResponse.model_validate(dict(created)),
+        status_code=status.HTTP_201_CREATED
+    )
+
+
+@router.get("/availability", response_model=ChannelAvailabilityResponse)
+@limiter.limit("60/minute")  # called as the user types (debounced by the form)
+async def channel_availability(
+    request: Request,
+    channel_id: str = Query(..., min_length=5, max_length=50, pattern=r'^-[0-9]+$',
+                            description="Telegram channel ID (\"-\" followed by digits)"),
+    kind: Literal["open", "closed"] = Query("open", description="Which registration field the ID is for"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Whether a channel ID is still free to register
+
+    Answered from this worker's Bloom filter of registered IDs when the ID is certainly
+    free; only IDs that may be taken are looked up in the database
+    """
+    taken, source = await channel_id_index.is_taken(db, kind, channel_id)
+    logger.debug("Availability of %s channel %s answered from %s", kind, channel_id, source)
+    return ChannelAvailabilityResponse(channel_id=channel_id, kind=kind, available=not taken)
+
 
 @router.get("/health")
 async def registration_health():
@@ -3,7 +3,7 @@ Configuration Management using Pydantic Settings
 """
 from pydantic_settings import BaseSettings
 from pydantic import Field, validator
-from typing import List
+from typing import Dict, List
 import secrets
 
 
@@ -15,9 +15,11 @@ class Settings(BaseSettings):
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = False
     ENVIRONMENT: str = "development"
+    OPENAPI_SCHEMA_PATH: str = ""  # written at image build by app.openapi_export; empty = generate on first request
 
     # Security
     SECRET_KEY: str = Field(default_factory=lambda: secrets.token_urlsafe(32))
+    ADMIN_API_TOKEN: str = ""  # X-Admin-Token for /api/v1/admin; empty disables the admin API
 
     # Database
     DB_HOST: str = "localhost"
@@ -27,10 +29,45 @@ class Settings(BaseSettings):
     DB_PASSWORD: str = ""
     INSTANCE_CONNECTION_NAME: str = ""
 
+    # Read replica (optional; empty DB_REPLICA_HOST sends all reads to the primary)
+    DB_REPLICA_HOST: str = ""
+    DB_REPLICA_PORT: int = 5432
+    DB_REPLICA_NAME: str = ""  # defaults to DB_NAME
+    DB_REPLICA_USER: str = ""  # defaults to DB_USER
+    DB_REPLICA_PASSWORD: str = ""  # defaults to DB_PASSWORD
+    DB_REPLICA_POOL_SIZE: int = 5
+    DB_REPLICA_MAX_OVERFLOW: int = 10
+    DB_READ_AFTER_WRITE_SECONDS: float = 5.0  # reads stay on the primary this long after a client's write
+
+    # Group commit for registrations (off by default; see app/db/group_commit.py)
+    GROUP_COMMIT_ENABLED: bool = False
+    GROUP_COMMIT_WINDOW_MS: float = 5.0  # how long the first row of a batch waits for others
+    GROUP_COMMIT_MAX_BATCH: int = 100  # a full batch is flushed without waiting
+    # Batches hold at most as many rows as /api/v1/register requests run at once, i.e. its
+    # ADMISSION_ROUTE_LIMITS entry (10 per worker by default); raise both together
+    GROUP_COMMIT_STATEMENT_TIMEOUT_MS: int = 5000  # per batch, independent of any caller's deadline
+
+    # Channel ID availability filter (per worker Bloom filter; see app/services/channel_availability.py)
+    CHANNEL_ID_FILTER_ENABLED: bool = True  # when off, every availability check queries the database
+    CHANNEL_ID_FILTER_CAPACITY: int = 1000000  # IDs, two per registration; rebuilt twice as large when full
+    CHANNEL_ID_FILTER_ERROR_RATE: float = 0.001  # share of free IDs that still need a database lookup
+    CHANNEL_ID_FILTER_REFRESH_SECONDS: float = 30.0  # picks up registrations made by other workers
+
     # reCAPTCHA
     RECAPTCHA_SECRET_KEY: str = ""
     RECAPTCHA_SITE_KEY: str = ""
     RECAPTCHA_THRESHOLD: float = 0.5
+    RECAPTCHA_VERIFY_URL: str = "https://www.google.com/recaptcha/api/siteverify"
+    RECAPTCHA_TIMEOUT_SECONDS: float = 2.0  # total budget for one siteverify call
+    RECAPTCHA_FAILURE_POLICY: str = "closed"  # "closed" rejects, "open" accepts when Google can't answer
+    RECAPTCHA_TOKEN_MIN_LENGTH: int = 20
+    RECAPTCHA_TOKEN_MAX_LENGTH: int = 4096
+    RECAPTCHA_BREAKER_WINDOW: int = 20  # recent calls considered
+    RECAPTCHA_BREAKER_MIN_CALLS: int = 10
+    RECAPTCHA_BREAKER_FAILURE_RATE: float = 0.5
+    RECAPTCHA_BREAKER_SLOW_CALL_SECONDS: float = 1.0
+    RECAPTCHA_BREAKER_SLOW_CALL_RATE: float = 0.5
+    RECAPTCHA_BREAKER_COOLDOWN_SECONDS: float = 30.0
 
     # CORS
     CORS_ORIGINS: List[str] = ["http://localhost:5173", "http://localhost:3000"]
@@ -41,8 +78,86 @@ class Settings(BaseSettings):
     RATE_LIMIT_REGISTRATIONS_PER_HOUR: int = 5
     RATE_LIMIT_API_PER_MINUTE: int = 10
 
+    # Login Throttling (checked before bcrypt)
+    LOGIN_THROTTLE_ENABLED: bool = True
+    LOGIN_THROTTLE_EMAIL_BURST: int = 5
+    LOGIN_THROTTLE_EMAIL_PER_MINUTE: float = 5.0
+    LOGIN_THROTTLE_IP_BURST: int = 20
+    LOGIN_THROTTLE_IP_PER_MINUTE: float = 30.0
+    LOGIN_THROTTLE_EMAIL_LOCKOUT_AFTER: int = 5
+    LOGIN_THROTTLE_IP_LOCKOUT_AFTER: int = 20
+    LOGIN_THROTTLE_LOCKOUT_BASE_SECONDS: float = 30.0
+    LOGIN_THROTTLE_LOCKOUT_MAX_SECONDS: float = 3600.0
+    LOGIN_THROTTLE_FAILURE_WINDOW_SECONDS: float = 900.0  # failures are forgotten after this long without one
+    LOGIN_THROTTLE_MAX_ENTRIES: int = 100000
+    LOGIN_THROTTLE_STORAGE_URI: str = ""  # e.g. redis://host:6379 to share across workers
+
+    # Admission control (see app/middleware/admission.py; stats at /api/v1/admin/admission)
+    ADMISSION_CONTROL_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 100  # requests in flight per worker on routes without their own limit
+    ADMISSION_ROUTE_LIMITS: Dict[str, int] = {
+        "/api/v1/register": 10, "/api/v1/register/availability": 50, "/api/v1/auth": 20,
+    }  # path prefix -> limit (longest match wins)
+    ADMISSION_QUEUE_SIZE: int = 50  # requests waiting per limit; more are shed immediately
+    ADMISSION_MAX_WAIT_SECONDS: float = 2.0
+    ADMISSION_RETRY_AFTER_SECONDS: int = 2
+    ADMISSION_EXEMPT_PATHS: List[str] = ["/api/v1/health", "/api/v1/admin/events"]  # health checks, long-lived streams
+    REQUEST_TIMEOUT_SECONDS: float = 10.0  # budget from arrival; caps reCAPTCHA waits and statement_timeout
+
+    # Bulk moderation (POST /api/v1/admin/channels/moderation)
+    MODERATION_BATCH_SIZE: int = 1000  # ids per UPDATE; each batch is its own short transaction
+    MODERATION_MAX_SELECTION: int = 50000  # larger id lists or filter matches are rejected
+
+    # Live registration events (SSE at /api/v1/admin/events, fed by LISTEN/NOTIFY from migration 008)
+    EVENTS_ENABLED: bool = True
+    EVENTS_MAX_SUBSCRIBERS: int = 100  # open streams per worker; more get 503
+    EVENTS_SUBSCRIBER_BUFFER: int = 256  # events queued per stream; a stream that falls further behind is dropped
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0  # comment lines keep proxies from closing idle streams
+
+    # Idempotency-Key support for POST /register and /auth/signup
+    IDEMPOTENCY_ENABLED: bool = True
+    IDEMPOTENCY_BACKEND: str = "memory"  # "memory" (per worker) or "postgres" (shared)
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_MAX_ENTRIES: int = 10000
+    IDEMPOTENCY_WAIT_SECONDS: float = 10.0
+
     # Logging
     LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # "json" (structured, one object per line) or "text"
+    LOG_QUEUE_SIZE: int = 10000  # records beyond this are dropped instead of blocking requests
+    LOG_SAMPLING: Dict[str, float] = {}  # logger name -> fraction of sub-WARNING records kept
+
+    # Response cache (in-process, per worker; see app/services/response_cache.py)
+    RESPONSE_CACHE_ENABLED: bool = True
+
+    # SQL accounting (statement timing via engine events; see /api/v1/admin/sql)
+    SQL_STATS_ENABLED: bool = True
+    SLOW_QUERY_MS: float = 200.0  # statements at least this slow are logged with their route
+    QUERY_COUNT_WARN: int = 20  # requests issuing this many statements are logged (N+1 suspects)
+    SQL_STATS_MAX_STATEMENTS: int = 500  # distinct normalized statements tracked per worker
+
+    # Request profiling (off unless enabled; see /api/v1/admin/profiles)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0  # fraction of requests profiled without the X-Profile header
+    PROFILER: str = "auto"  # "auto", "sampling" (pyinstrument, requirements-profiling.txt) or "deterministic" (cProfile)
+    PROFILING_INTERVAL_MS: float = 1.0  # pyinstrument sampling interval
+    PROFILING_DIR: str = "/tmp/paygate-profiles"  # shared by the workers of one instance
+    PROFILING_MAX_ARTIFACTS: int = 50
+
+    # Memory diagnostics (tracemalloc snapshots at /api/v1/admin/memory; off until started there)
+    MEMORY_TRACE_FRAMES: int = 1  # frames kept per allocation; more gives tracebacks but costs memory
+    MEMORY_MAX_SNAPSHOTS: int = 5  # snapshots kept per worker; each holds every traced block
+
+    # Server (app.server production entry point)
+    SERVER_HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WEB_CONCURRENCY: int = 0  # 0 = one worker per CPU in the container quota
+    SERVER_MAX_WORKERS: int = 8
+    SERVER_BACKLOG: int = 2048
+    SERVER_KEEPALIVE_SECONDS: int = 620  # Cloud Run's front end keeps idle connections for 600s
+    SERVER_GRACEFUL_SHUTDOWN_SECONDS: int = 8  # Cloud Run sends SIGKILL 10s after SIGTERM
+    SERVER_ACCESS_LOG: bool = False
+    FORWARDED_ALLOW_IPS: str = "127.0.0.1"  # proxies trusted for X-Forwarded-For; widen to the load balancer's addresses, never "*"
 
     @validator("CORS_ORIGINS", pre=True)
     def parse_cors_origins(cls, v):
@@ -62,6 +177,14 @@ class Settings(BaseSettings):
         """Construct async database URL"""
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def async_replica_database_url(self) -> str:
+        """Construct async database URL for the read replica"""
+        user = self.DB_REPLICA_USER or self.DB_USER
+        password = self.DB_REPLICA_PASSWORD or self.DB_PASSWORD
+        name = self.DB_REPLICA_NAME or self.DB_NAME
+        return f"postgresql+asyncpg://{user}:{password}@{self.DB_REPLICA_HOST}:{self.DB_REPLICA_PORT}/{name}"
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,41 @@
+"""
+Request Deadlines
+Per-request time budget, set by AdmissionControlMiddleware and read by outbound calls
+"""
+from contextvars import ContextVar
+from typing import Optional
+import time
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+# Monotonic time by which the current request should have produced its response
+request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceeded(HTTPException):
+    """The request's budget ran out before more work could start; a 503 like a shed request"""
+
+    def __init__(self, detail: str = "Request deadline exceeded. Please retry shortly."):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER_SECONDS)},
+        )
+
+
+def time_remaining() -> Optional[float]:
+    """Seconds left in the current request's budget (never negative), or None outside a request"""
+    deadline = request_deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+def cap_timeout(timeout: Optional[float]) -> Optional[float]:
+    """`timeout` shortened to what is left of the request budget"""
+    remaining = time_remaining()
+    if remaining is None:
+        return timeout
+    return remaining if timeout is None else min(timeout, remaining)
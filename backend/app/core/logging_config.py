@@ -0,0 +1,134 @@
+"""
+Logging Configuration
+Queue-based logging: request threads only enqueue records; a background thread formats and writes them
+"""
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+
+from app.core.config import settings
+
+# Set per request by RequestIdMiddleware; copied onto records on the calling thread
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed through `extra=`
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "request_id", "taskName",
+    "color_message",  # uvicorn's ANSI-coloured duplicate of the message
+}
+
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the field names Cloud Logging recognizes"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "severity": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of records below WARNING for the configured loggers
+    Rates apply to a logger and its children, e.g. {"app.api.v1.endpoints.networks": 0.01}
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = dict(rates)
+        self._resolved: Dict[str, float] = {}
+        self.sampled_out = 0
+
+    def _rate_for(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate = 1.0
+            candidate = name
+            while candidate:
+                if candidate in self.rates:
+                    rate = self.rates[candidate]
+                    break
+                candidate = candidate.rpartition(".")[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate_for(record.name)
+        if rate >= 1.0 or random.random() < rate:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Enqueues records without formatting them and never blocks the caller
+    Message arguments are merged on the listener thread; records are dropped
+    (and counted) when the queue is full
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The request ID lives in a context variable, which the listener thread cannot see
+        record.request_id = request_id_var.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging() -> None:
+    """Route all logging through a bounded queue to a background writer; safe to call more than once"""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    if settings.LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(request_id)s:%(message)s"))
+
+    queue_handler = NonBlockingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+    if settings.LOG_SAMPLING:
+        queue_handler.addFilter(SamplingFilter(settings.LOG_SAMPLING))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(settings.LOG_LEVEL)
+
+    _listener = QueueListener(queue_handler.queue, stream_handler)
+    _listener.start()
+    # Flush whatever is still queued on interpreter exit
+    atexit.register(_listener.stop)
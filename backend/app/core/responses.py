@@ -0,0 +1,20 @@
+"""
+Response Helpers
+Serialize already-validated Pydantic models straight to JSON
+"""
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def model_json_response(model: BaseModel, status_code: int = 200) -> Response:
+    """
+    Return `model` as a JSON response
+
+    Returning a Response bypasses FastAPI's response_model re-validation; the
+    route's response_model is still used for the OpenAPI schema.
+    """
+    return Response(
+        content=model.model_dump_json(),
+        status_code=status_code,
+        media_type="application/json",
+    )
@@ -0,0 +1,37 @@
+"""
+Admin Access Control
+Shared-secret header check for support and diagnostics endpoints
+"""
+from typing import Optional
+import secrets
+
+from fastapi import Header, HTTPException, status
+
+from app.core.config import settings
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """True if `token` matches the configured ADMIN_API_TOKEN (never when it is unset)"""
+    if not (settings.ADMIN_API_TOKEN and token):
+        return False
+    # Bytes, not str: compare_digest raises TypeError on non-ASCII strings from arbitrary headers
+    return secrets.compare_digest(token.encode("utf-8"), settings.ADMIN_API_TOKEN.encode("utf-8"))
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """
+    Dependency guarding admin endpoints
+    Requires the X-Admin-Token header to match ADMIN_API_TOKEN; admin endpoints
+    are disabled entirely while ADMIN_API_TOKEN is empty
+    """
+    if not settings.ADMIN_API_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin API is disabled"
+        )
+
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token"
+        )
@@ -1,25 +1,22 @@
 """
 Database Connection and Session Management
 """
-from sqlalchemy import create_engine
+from collections import OrderedDict
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator, AsyncGenerator
+from typing import Generator, AsyncGenerator, Optional
+from fastapi import Request
 from app.core.config import settings
+from app.core.deadline import DeadlineExceeded, time_remaining
+from app.db.query_stats import install_query_stats
 import logging
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
-# Synchronous engine (for migrations)
-sync_engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
-    echo=settings.DEBUG
-)
-
-# Async engine (for FastAPI endpoints)
+# Async engine (for FastAPI endpoints) - primary, takes all writes
 async_engine = create_async_engine(
     settings.async_database_url,
     pool_pre_ping=True,
@@ -28,28 +25,156 @@ async_engine = create_async_engine(
     echo=settings.DEBUG
 )
 
-# Session makers
-SyncSessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=sync_engine
-)
+# Optional read-replica engine; reads fall back to the primary when it is not configured
+replica_engine = None
+if settings.DB_REPLICA_HOST:
+    replica_engine = create_async_engine(
+        settings.async_replica_database_url,
+        pool_pre_ping=True,
+        pool_size=settings.DB_REPLICA_POOL_SIZE,
+        max_overflow=settings.DB_REPLICA_MAX_OVERFLOW,
+        echo=settings.DEBUG
+    )
+
+
+# Statement timing, per-request query counts and the slow-query log
+if settings.SQL_STATS_ENABLED:
+    install_query_stats(async_engine.sync_engine)
+    if replica_engine is not None:
+        install_query_stats(replica_engine.sync_engine)
+
+
+class PrimarySession(Session):
+    """Sync session class behind primary async sessions; commits are tracked for read-your-writes"""
+
+
+# Synchronous engine (for migrations and admin scripts), created on first use: API
+# workers never need it, and building it imports psycopg2 during cold start
+_sync_engine = None
+_sync_session_local = None
 
+
+def get_sync_engine():
+    global _sync_engine
+    if _sync_engine is None:
+        _sync_engine = create_engine(
+            settings.database_url,
+            pool_pre_ping=True,
+            pool_size=5,
+            max_overflow=10,
+            echo=settings.DEBUG
+        )
+        if settings.SQL_STATS_ENABLED:
+            install_query_stats(_sync_engine)
+    return _sync_engine
+
+
+def get_sync_sessionmaker() -> sessionmaker:
+    global _sync_session_local
+    if _sync_session_local is None:
+        _sync_session_local = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=get_sync_engine()
+        )
+    return _sync_session_local
+
+
+def __getattr__(name: str):
+    # Keeps `from app.db.database import sync_engine, SyncSessionLocal` working
+    if name == "sync_engine":
+        return get_sync_engine()
+    if name == "SyncSessionLocal":
+        return get_sync_sessionmaker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Session makers
 AsyncSessionLocal = async_sessionmaker(
     async_engine,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False
 )
 
+ReplicaSessionLocal = None
+if replica_engine is not None:
+    ReplicaSessionLocal = async_sessionmaker(
+        replica_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autocommit=False,
+        autoflush=False
+    )
+
+
+class _RecentWrites:
+    """Bounded map of client key -> monotonic time of that client's last committed write"""
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, key: str) -> None:
+        with self._lock:
+            self._entries[key] = time.monotonic()
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def is_fresh(self, key: str, window: float) -> bool:
+        last_write = self._entries.get(key)
+        return last_write is not None and time.monotonic() - last_write < window
+
+
+recent_writes = _RecentWrites()
+
+# Session routing counters, reported by pool_metrics()
+routing_stats = {
+    "write": 0,
+    "read_replica": 0,
+    "read_primary": 0,  # no replica configured
+    "read_after_write": 0,  # replica configured, but the client wrote recently
+}
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _record_write(session: Session) -> None:
+    client_key = session.info.get("client_key")
+    if client_key is not None:
+        recent_writes.mark(client_key)
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_request_deadline(session: Session, transaction, connection) -> None:
+    # Statements of a transaction begun inside a request may only use what is left of its
+    # budget; SET LOCAL ends with the transaction, so pooled connections are unaffected
+    remaining = time_remaining()
+    if remaining is None:
+        return
+    timeout_ms = int(remaining * 1000)
+    if timeout_ms <= 0:
+        # Stop before the transaction does any work, rather than letting it fail on a
+        # statement_timeout of next to nothing
+        raise DeadlineExceeded()
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {timeout_ms}")
+
+
+def _client_key(request: Request) -> str:
+    # Same key as the rate limiters (slowapi get_remote_address)
+    return request.client.host if request.client else "127.0.0.1"
+
 
 def get_sync_db() -> Generator[Session, None, None]:
     """
     Dependency for getting synchronous database session
     Use for migrations and admin scripts
     """
-    db = SyncSessionLocal()
+    db = get_sync_sessionmaker()()
     try:
         yield db
     finally:
@@ -68,6 +193,64 @@ async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_write_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for a session on the primary
+    Use for endpoints that write; commits route the client's next reads to the primary
+    """
+    routing_stats["write"] += 1
+    async with AsyncSessionLocal() as session:
+        session.sync_session.info["client_key"] = _client_key(request)
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for a read-only session
+    Uses the replica when configured, unless this client committed a write within
+    DB_READ_AFTER_WRITE_SECONDS (the replica may not have replayed it yet)
+    """
+    session_factory = AsyncSessionLocal
+    if ReplicaSessionLocal is None:
+        routing_stats["read_primary"] += 1
+    elif recent_writes.is_fresh(_client_key(request), settings.DB_READ_AFTER_WRITE_SECONDS):
+        routing_stats["read_after_write"] += 1
+    else:
+        routing_stats["read_replica"] += 1
+        session_factory = ReplicaSessionLocal
+
+    async with session_factory() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+def _pool_status(engine) -> Optional[dict]:
+    if engine is None:
+        return None
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "status": pool.status(),
+    }
+
+
+def pool_metrics() -> dict:
+    """Connection pool state per engine plus session routing counters"""
+    return {
+        "primary": _pool_status(async_engine),
+        "replica": _pool_status(replica_engine),
+        "routing": dict(routing_stats),
+    }
+
+
 async def init_db():
     """Initialize database - create tables if they don't exist"""
     from app.models.channel import Base
@@ -81,4 +264,6 @@ async def init_db():
 async def close_db():
     """Close database connections"""
     await async_engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
     logger.info("Database connections closed")
@@ -0,0 +1,193 @@
+"""
+Group Commit
+Merges inserts that arrive within a few milliseconds into one multi-row
+INSERT ... ON CONFLICT DO NOTHING RETURNING and one commit
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+import asyncio
+import contextvars
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.db.database import AsyncSessionLocal, recent_writes
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingRow:
+    values: Dict[str, Any]
+    client_key: Optional[str]
+    future: asyncio.Future
+
+
+class GroupCommitWriter:
+    """
+    Batches single-row inserts into `model`
+
+    insert() queues the row and waits. The first row of a batch starts a `window_ms`
+    timer; the batch is written when the timer fires or `max_batch` rows are queued,
+    whichever comes first. Each caller gets back its own RETURNING row, or None when
+    its row conflicted with an existing one (including an earlier row of the same
+    batch). `unique_keys` are the columns of the unique constraints; the first one
+    identifies rows in the RETURNING output.
+
+    If the batch statement fails (e.g. one row violates a check constraint), its rows
+    are retried one per transaction so only the offending caller sees the error.
+
+    Batches are written outside every caller's request context: each transaction gets
+    `statement_timeout_ms` rather than the first caller's remaining budget, and its
+    queries count as background work in the query stats. Callers stop waiting at their
+    own deadline; their rows are written regardless.
+    """
+
+    def __init__(self, model, returning: Sequence, unique_keys: Sequence[str],
+                 window_ms: float = 5.0, max_batch: int = 100, statement_timeout_ms: int = 5000,
+                 session_factory=AsyncSessionLocal):
+        self.model = model
+        self.unique_keys = tuple(unique_keys)
+        returned = {column.key for column in returning}
+        self.returning = list(returning) + [
+            getattr(model, key) for key in self.unique_keys[:1] if key not in returned
+        ]
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.statement_timeout_ms = statement_timeout_ms
+        self.session_factory = session_factory
+        self._pending: List[_PendingRow] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self.counters = {"rows": 0, "batches": 0, "conflicts": 0, "fallbacks": 0, "errors": 0, "largest_batch": 0}
+        _writers.append(self)
+
+    async def insert(self, values: Dict[str, Any], client_key: Optional[str] = None) -> Optional[Mapping]:
+        """Queue one row; returns its RETURNING mapping, or None on conflict"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(_PendingRow(values, client_key, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            # A fresh context: the batch belongs to none of its callers, whichever one filled it
+            task = asyncio.create_task(self._write(batch), context=contextvars.Context())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    def _resolve(row: _PendingRow, result: Optional[Mapping]) -> None:
+        # The caller may have gone away (client disconnect); its row is written regardless
+        if not row.future.done():
+            row.future.set_result(result)
+
+    async def _write(self, batch: List[_PendingRow]) -> None:
+        self.counters["batches"] += 1
+        self.counters["rows"] += len(batch)
+        self.counters["largest_batch"] = max(self.counters["largest_batch"], len(batch))
+
+        # Within one statement the later of two duplicates would be skipped silently but
+        # still match the earlier one's RETURNING row; settle those here
+        claimed = {key: set() for key in self.unique_keys}
+        rows = []
+        for row in batch:
+            if any(row.values[key] in claimed[key] for key in self.unique_keys):
+                self.counters["conflicts"] += 1
+                self._resolve(row, None)
+                continue
+            for key in self.unique_keys:
+                claimed[key].add(row.values[key])
+            rows.append(row)
+
+        try:
+            created = await self._insert_rows(rows)
+        except Exception as e:
+            if len(rows) > 1:
+                self.counters["fallbacks"] += 1
+                logger.warning("Group insert of %d rows failed (%s); retrying rows one by one",
+                               len(rows), type(e).__name__)
+                for row in rows:
+                    await self._write_single(row)
+            else:
+                self.counters["errors"] += 1
+                if rows and not rows[0].future.done():
+                    rows[0].future.set_exception(e)
+            return
+
+        self._deliver(rows, created)
+
+    async def _write_single(self, row: _PendingRow) -> None:
+        try:
+            created = await self._insert_rows([row])
+        except Exception as e:
+            self.counters["errors"] += 1
+            if not row.future.done():
+                row.future.set_exception(e)
+            return
+        self._deliver([row], created)
+
+    async def _insert_rows(self, rows: List[_PendingRow]) -> Dict[Any, Mapping]:
+        identity = self.unique_keys[0]
+        stmt = (
+            pg_insert(self.model)
+            .values([row.values for row in rows])
+            .on_conflict_do_nothing()
+            .returning(*self.returning)
+        )
+        async with self.session_factory() as session:
+            await session.execute(text(f"SET LOCAL statement_timeout = {int(self.statement_timeout_ms)}"))
+            result = await session.execute(stmt)
+            created = {mapping[identity]: mapping for mapping in result.mappings()}
+            await session.commit()
+        return created
+
+    def _deliver(self, rows: List[_PendingRow], created: Dict[Any, Mapping]) -> None:
+        identity = self.unique_keys[0]
+        for row in rows:
+            mapping = created.get(row.values[identity])
+            if mapping is None:
+                self.counters["conflicts"] += 1
+            elif row.client_key is not None:
+                # Same read-your-writes bookkeeping as a commit on a get_write_db session
+                recent_writes.mark(row.client_key)
+            self._resolve(row, mapping)
+
+    async def close(self) -> None:
+        """Write whatever is queued and wait for in-flight batches"""
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "table": self.model.__tablename__,
+            "window_ms": self.window * 1000.0,
+            "max_batch": self.max_batch,
+            "statement_timeout_ms": self.statement_timeout_ms,
+            "pending": len(self._pending),
+            "rows_per_batch": round(self.counters["rows"] / self.counters["batches"], 2)
+            if self.counters["batches"] else None,
+            **self.counters,
+        }
+
+
+_writers: List[GroupCommitWriter] = []
+
+
+async def close_writers() -> None:
+    """Shutdown hook: drain every writer before the engines are disposed"""
+    for writer in _writers:
+        await writer.close()
+
+
+def group_commit_stats() -> List[dict]:
+    return [writer.stats() for writer in _writers]
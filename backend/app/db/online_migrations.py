@@ -0,0 +1,294 @@
+"""
+Online Migration Helpers
+Alembic operations that avoid long exclusive locks on busy tables, plus a lock report for dry runs
+
+Conventions for migrations touching channel_registrations or users:
+- build and drop indexes with create_index_concurrently / drop_index_concurrently
+- run other DDL through run_with_lock_timeout, so it gives up quickly instead of queueing
+  behind a long transaction (and blocking every query queued behind it) and retries later
+- add NOT NULL / foreign key / check constraints as NOT VALID, then VALIDATE separately
+- never rewrite data in the DDL migration; use backfill() in batches
+- preview a deploy with `python -m app.db.online_migrations plan` before `alembic upgrade head`
+
+Usage from a migration:
+    from app.db.online_migrations import create_index_concurrently
+
+    def upgrade() -> None:
+        create_index_concurrently('ix_users_created_at', 'users', ['created_at'])
+"""
+from typing import Callable, List, Optional, Sequence, Tuple
+import argparse
+import logging
+import random
+import re
+import subprocess
+import sys
+import time
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+LOCK_NOT_AVAILABLE = "55P03"
+QUERY_CANCELED = "57014"  # statement_timeout
+
+DEFAULT_LOCK_TIMEOUT = "3s"
+DEFAULT_RETRIES = 5
+
+
+def _is_offline() -> bool:
+    return op.get_context().as_sql
+
+
+def _sqlstate(error: DBAPIError) -> Optional[str]:
+    orig = error.orig
+    return getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+
+
+def run_with_lock_timeout(statements: Sequence[str], lock_timeout: str = DEFAULT_LOCK_TIMEOUT,
+                          statement_timeout: str = "0", retries: int = DEFAULT_RETRIES,
+                          backoff_seconds: float = 2.0,
+                          before_retry: Optional[Callable[[], None]] = None) -> None:
+    """
+    Run DDL in its own short transactions with lock_timeout/statement_timeout set
+
+    A statement that cannot get its lock within `lock_timeout` fails fast instead of
+    queueing ahead of application queries; it is retried up to `retries` times with
+    jittered exponential backoff. Must not be called inside another transaction, so
+    it opens an autocommit block itself.
+    """
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        for statement in statements:
+            attempt = 0
+            while True:
+                try:
+                    if not _is_offline():
+                        bind.exec_driver_sql(f"SET lock_timeout = '{lock_timeout}'")
+                        bind.exec_driver_sql(f"SET statement_timeout = '{statement_timeout}'")
+                    op.execute(statement)
+                    break
+                except DBAPIError as e:
+                    if _sqlstate(e) not in (LOCK_NOT_AVAILABLE, QUERY_CANCELED) or attempt >= retries:
+                        raise
+                    attempt += 1
+                    delay = backoff_seconds * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+                    logger.warning("Lock/statement timeout on %r (attempt %d/%d); retrying in %.1fs",
+                                   statement[:80], attempt, retries, delay)
+                    time.sleep(delay)
+                    if before_retry is not None:
+                        before_retry()
+                finally:
+                    if not _is_offline():
+                        bind.exec_driver_sql("RESET lock_timeout")
+                        bind.exec_driver_sql("RESET statement_timeout")
+
+
+def _drop_invalid_index(name: str) -> None:
+    # A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind
+    invalid = op.get_bind().execute(
+        sa.text("SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name AND NOT i.indisvalid"),
+        {"name": name}
+    ).scalar()
+    if invalid:
+        op.get_bind().exec_driver_sql(f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"')
+
+
+def create_index_concurrently(name: str, table: str, columns: List[str], unique: bool = False,
+                              using: Optional[str] = None, where: Optional[str] = None,
+                              lock_timeout: str = DEFAULT_LOCK_TIMEOUT, retries: int = DEFAULT_RETRIES) -> None:
+    """
+    CREATE INDEX CONCURRENTLY outside the migration transaction
+
+    Takes SHARE UPDATE EXCLUSIVE, so reads and writes continue while it builds.
+    `columns` are SQL expressions (e.g. "created_at DESC"); `where` makes a partial index.
+    """
+    statement = (
+        f"CREATE {'UNIQUE ' if unique else ''}INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table}"
+        f"{f' USING {using}' if using else ''} ({', '.join(columns)})"
+        f"{f' WHERE {where}' if where else ''}"
+    )
+    if not _is_offline():
+        with op.get_context().autocommit_block():
+            _drop_invalid_index(name)
+    run_with_lock_timeout([statement], lock_timeout=lock_timeout, retries=retries,
+                          before_retry=None if _is_offline() else lambda: _drop_invalid_index(name))
+
+
+def drop_index_concurrently(name: str, lock_timeout: str = DEFAULT_LOCK_TIMEOUT,
+                            retries: int = DEFAULT_RETRIES) -> None:
+    """DROP INDEX CONCURRENTLY outside the migration transaction (SHARE UPDATE EXCLUSIVE)"""
+    run_with_lock_timeout([f'DROP INDEX CONCURRENTLY IF EXISTS "{name}"'],
+                          lock_timeout=lock_timeout, retries=retries)
+
+
+def backfill(table: str, set_clause: str, where_clause: str = "TRUE", key: str = "id",
+             batch_size: int = 5000, pause_seconds: float = 0.1, params: Optional[dict] = None,
+             lock_timeout: str = DEFAULT_LOCK_TIMEOUT) -> int:
+    """
+    UPDATE `table` in keyset batches of `batch_size` keys, one transaction per batch
+
+    Each batch covers the next `batch_size` keys after the previous batch (so it walks
+    the primary key index once) and only updates rows matching `where_clause`. Sleeps
+    `pause_seconds` between batches to leave headroom for replication and traffic.
+    Returns the number of rows updated; in --sql mode only emits the first batch.
+    """
+    params = dict(params or {})
+    upper_sql = (
+        f"SELECT max({key}) FROM (SELECT {key} FROM {table} WHERE {key} > :last_key "
+        f"ORDER BY {key} LIMIT :batch_size) AS batch"
+    )
+    update_sql = (
+        f"UPDATE {table} SET {set_clause} "
+        f"WHERE {key} > :last_key AND {key} <= :upper_key AND ({where_clause})"
+    )
+
+    if _is_offline():
+        # The first batch, with the upper key inlined, stands in for the loop
+        first_upper = f"({upper_sql.replace(':last_key', '0').replace(':batch_size', str(batch_size))})"
+        op.execute(update_sql.replace(":last_key", "0").replace(":upper_key", first_upper))
+        return 0
+
+    total = 0
+    last_key = 0
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        bind.exec_driver_sql(f"SET lock_timeout = '{lock_timeout}'")
+        try:
+            while True:
+                with bind.begin():
+                    upper_key = bind.execute(
+                        sa.text(upper_sql), {"last_key": last_key, "batch_size": batch_size}
+                    ).scalar()
+                    if upper_key is None:
+                        break
+                    result = bind.execute(
+                        sa.text(update_sql), {**params, "last_key": last_key, "upper_key": upper_key}
+                    )
+                total += result.rowcount
+                last_key = upper_key
+                logger.info("Backfill %s: %d rows updated, up to %s=%s", table, total, key, last_key)
+                if pause_seconds:
+                    time.sleep(pause_seconds)
+        finally:
+            bind.exec_driver_sql("RESET lock_timeout")
+    return total
+
+
+# Dry run: lock levels PostgreSQL takes for each statement kind.
+# Order matters; the first matching pattern wins.
+LOCK_RULES: List[Tuple[str, str, str]] = [
+    (r"^CREATE (UNIQUE )?INDEX CONCURRENTLY", "SHARE UPDATE EXCLUSIVE", "other DDL and VACUUM only"),
+    (r"^DROP INDEX CONCURRENTLY", "SHARE UPDATE EXCLUSIVE", "other DDL and VACUUM only"),
+    (r"^CREATE (UNIQUE )?INDEX", "SHARE", "INSERT/UPDATE/DELETE for the whole build"),
+    (r"^DROP INDEX", "ACCESS EXCLUSIVE", "all reads and writes"),
+    (r"^ALTER TABLE .* VALIDATE CONSTRAINT", "SHARE UPDATE EXCLUSIVE", "other DDL and VACUUM only"),
+    (r"^ALTER TABLE .* ADD COLUMN .* GENERATED ALWAYS AS .* STORED", "ACCESS EXCLUSIVE",
+     "all reads and writes; rewrites the table"),
+    (r"^ALTER TABLE .* ALTER COLUMN .* TYPE", "ACCESS EXCLUSIVE", "all reads and writes; may rewrite the table"),
+    (r"^ALTER TABLE .* SET NOT NULL", "ACCESS EXCLUSIVE", "all reads and writes; scans the table"),
+    (r"^ALTER TABLE .* ADD CONSTRAINT .* NOT VALID", "ACCESS EXCLUSIVE", "all reads and writes, briefly"),
+    (r"^ALTER TABLE .* ADD (CONSTRAINT|PRIMARY KEY|UNIQUE|FOREIGN KEY|CHECK)", "ACCESS EXCLUSIVE",
+     "all reads and writes; validates existing rows"),
+    (r"^ALTER TABLE", "ACCESS EXCLUSIVE", "all reads and writes, briefly"),
+    (r"^CREATE TABLE", "none on existing tables", "nothing"),
+    (r"^DROP TABLE", "ACCESS EXCLUSIVE", "all reads and writes"),
+    (r"^(UPDATE|DELETE)", "ROW EXCLUSIVE", "writes to the same rows"),
+    (r"^INSERT", "ROW EXCLUSIVE", "nothing"),
+    (r"^CREATE EXTENSION", "none on application tables", "nothing"),
+    (r"^(CREATE|DROP) TRIGGER", "SHARE ROW EXCLUSIVE", "INSERT/UPDATE/DELETE, briefly"),
+    (r"^(CREATE|DROP) (OR REPLACE )?FUNCTION", "none on application tables", "nothing"),
+]
+
+
+def classify_lock(statement: str) -> Tuple[str, str]:
+    """(lock mode, what it blocks) for one SQL statement"""
+    normalized = " ".join(statement.split()).upper()
+    for pattern, lock, blocks in LOCK_RULES:
+        if re.search(pattern, normalized):
+            return lock, blocks
+    return "-", "-"
+
+
+def _current_revision() -> Optional[str]:
+    from app.core.config import settings
+    engine = sa.create_engine(settings.database_url)
+    try:
+        with engine.connect() as conn:
+            return conn.execute(sa.text("SELECT version_num FROM alembic_version")).scalar()
+    finally:
+        engine.dispose()
+
+
+def _split_statements(sql: str) -> List[str]:
+    """Statements of alembic --sql output; semicolons inside $$-quoted bodies don't end one"""
+    statements: List[str] = []
+    pending = ""
+    for part in sql.split(";\n"):
+        pending = f"{pending};\n{part}" if pending else part
+        if pending.count("$$") % 2 == 0:
+            statements.append(pending.strip())
+            pending = ""
+    if pending:
+        statements.append(pending.strip())
+    return statements
+
+
+def plan(revision_range: str) -> int:
+    """Print the SQL of `revision_range` (alembic --sql mode) with the lock each statement takes"""
+    result = subprocess.run(
+        [sys.executable, "-m", "alembic", "upgrade", revision_range, "--sql"],
+        capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr, file=sys.stderr)
+        return result.returncode
+
+    in_transaction = False
+    for statement in _split_statements(result.stdout):
+        lines = [line for line in statement.splitlines() if line.strip() and not line.startswith("--")]
+        if not lines:
+            if statement.startswith("-- Running upgrade"):
+                print(f"\n{statement.splitlines()[0]}")
+            continue
+        sql = " ".join(" ".join(lines).split())
+        upper = sql.upper()
+        for comment in (line for line in statement.splitlines() if line.startswith("-- Running upgrade")):
+            print(f"\n{comment}")
+        if upper in ("BEGIN", "COMMIT"):
+            in_transaction = upper == "BEGIN"
+            continue
+        if upper.startswith(("SET ", "RESET ")) or "ALEMBIC_VERSION" in upper:
+            continue
+        lock, blocks = classify_lock(sql)
+        scope = "in transaction" if in_transaction else "autocommit"
+        print(f"  [{lock:<24}] blocks {blocks} ({scope})")
+        print(f"      {sql[:160]}{'...' if len(sql) > 160 else ''}")
+    return 0
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Online migration tools")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    plan_parser = subcommands.add_parser("plan", help="Dry run: show pending SQL and the locks it takes")
+    plan_parser.add_argument("--from", dest="from_revision", default=None,
+                             help="Start revision (default: read from the database)")
+    plan_parser.add_argument("--to", dest="to_revision", default="head")
+    args = parser.parse_args(argv)
+
+    from_revision = args.from_revision
+    if from_revision is None:
+        try:
+            from_revision = _current_revision()
+        except sa.exc.SQLAlchemyError as e:
+            print(f"Could not read the current revision ({type(e).__name__}); pass --from", file=sys.stderr)
+            return 2
+    revision_range = f"{from_revision}:{args.to_revision}" if from_revision else args.to_revision
+    return plan(revision_range)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
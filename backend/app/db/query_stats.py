@@ -0,0 +1,200 @@
+"""
+SQL Statement Accounting
+Times every statement through engine events, aggregates by normalized statement and
+by route, and logs statements slower than SLOW_QUERY_MS
+"""
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, List, Optional
+import logging
+import re
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+OTHER_STATEMENTS = "<other>"
+
+# asyncpg ($1, with SQLAlchemy's type cast) and psycopg2 (%(name)s, %s) placeholders
+_BIND_PARAMETER = re.compile(r"\$\d+(?:::\w+(?:\[\])?)?|%\(\w+\)s|%s")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![A-Za-z0-9_])-?\d+(?:\.\d+)?(?![A-Za-z0-9_])")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def normalize_statement(statement: str) -> str:
+    """Replace parameters and literals with ? so one query shape maps to one key"""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _BIND_PARAMETER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _VALUE_LIST.sub("(?, ...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+@dataclass
+class RequestQueryStats:
+    """Queries issued while handling one request"""
+    scope: dict
+    queries: int = 0
+    db_time_ms: float = 0.0
+
+    @property
+    def route(self) -> str:
+        # FastAPI stores the matched route in the scope once routing has run
+        route = self.scope.get("route")
+        path = getattr(route, "path", None) or self.scope.get("path", "")
+        return f"{self.scope.get('method', '')} {path}"
+
+
+@dataclass
+class StatementStats:
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    slow_calls: int = 0
+    routes: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self, statement: str) -> dict:
+        return {
+            "statement": statement,
+            "calls": self.calls,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "slow_calls": self.slow_calls,
+            "routes": dict(sorted(self.routes.items(), key=lambda item: -item[1])[:5]),
+        }
+
+
+@dataclass
+class RouteStats:
+    requests: int = 0
+    queries: int = 0
+    db_time_ms: float = 0.0
+    max_queries: int = 0
+
+    def to_dict(self, route: str) -> dict:
+        return {
+            "route": route,
+            "requests": self.requests,
+            "queries": self.queries,
+            "queries_per_request": round(self.queries / self.requests, 2) if self.requests else 0.0,
+            "max_queries": self.max_queries,
+            "db_time_ms": round(self.db_time_ms, 3),
+            "db_time_per_request_ms": round(self.db_time_ms / self.requests, 3) if self.requests else 0.0,
+        }
+
+
+# Set per request by QueryStatsMiddleware
+current_request_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("current_request_stats", default=None)
+
+
+class QueryStatsCollector:
+    """Per-worker aggregate of statement and route statistics"""
+
+    def __init__(self, max_statements: int, slow_query_ms: float):
+        self.max_statements = max_statements
+        self.slow_query_ms = slow_query_ms
+        self._statements: Dict[str, StatementStats] = {}
+        self._routes: Dict[str, RouteStats] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def record_statement(self, statement: str, elapsed_ms: float) -> None:
+        request = current_request_stats.get()
+        route = request.route if request is not None else "<background>"
+        if request is not None:
+            request.queries += 1
+            request.db_time_ms += elapsed_ms
+
+        normalized = normalize_statement(statement)
+        slow = elapsed_ms >= self.slow_query_ms
+        with self._lock:
+            stats = self._statements.get(normalized)
+            if stats is None:
+                if len(self._statements) >= self.max_statements:
+                    normalized = OTHER_STATEMENTS
+                stats = self._statements.setdefault(normalized, StatementStats())
+            stats.calls += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            stats.routes[route] = stats.routes.get(route, 0) + 1
+            if slow:
+                stats.slow_calls += 1
+
+        if slow:
+            logger.warning(
+                "Slow query (%.1f ms) on %s: %s", elapsed_ms, route, normalized,
+                extra={"duration_ms": round(elapsed_ms, 3), "route": route, "statement": normalized}
+            )
+
+    def record_request(self, request: RequestQueryStats) -> None:
+        if not request.queries:
+            return
+        route = request.route
+        with self._lock:
+            stats = self._routes.setdefault(route, RouteStats())
+            stats.requests += 1
+            stats.queries += request.queries
+            stats.db_time_ms += request.db_time_ms
+            stats.max_queries = max(stats.max_queries, request.queries)
+
+        if request.queries >= settings.QUERY_COUNT_WARN:
+            logger.warning(
+                "%d queries (%.1f ms) for one request on %s; possible N+1",
+                request.queries, request.db_time_ms, route,
+                extra={"queries": request.queries, "db_time_ms": round(request.db_time_ms, 3), "route": route}
+            )
+
+    def top_statements(self, limit: int = 20, order_by: str = "total_ms") -> List[dict]:
+        with self._lock:
+            rows = [stats.to_dict(statement) for statement, stats in self._statements.items()]
+        rows.sort(key=lambda row: row[order_by], reverse=True)
+        return rows[:limit]
+
+    def routes(self) -> List[dict]:
+        with self._lock:
+            rows = [stats.to_dict(route) for route, stats in self._routes.items()]
+        rows.sort(key=lambda row: row["db_time_ms"], reverse=True)
+        return rows
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statements.clear()
+            self._routes.clear()
+            self.started_at = time.time()
+
+
+# Global collector instance
+query_stats = QueryStatsCollector(settings.SQL_STATS_MAX_STATEMENTS, settings.SLOW_QUERY_MS)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_start_time"].pop()
+    query_stats.record_statement(statement, (time.perf_counter() - started) * 1000.0)
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_time"):
+        connection.info["query_start_time"].pop()
+
+
+def install_query_stats(engine: Engine) -> None:
+    """Attach the timing hooks to a (sync) engine; for async engines pass engine.sync_engine"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,98 @@
+"""
+Read Models
+Compact named-tuple rows loaded by column-projected Core selects, for read paths that do
+not modify what they load (listings, exports, lookups)
+
+A row type's field names are model attribute names; select_rows() selects exactly
+those columns, so the ORM identity map, instance state and unused columns are skipped.
+Named tuples have no per-instance __dict__ and work with Pydantic schemas that use
+from_attributes=True.
+"""
+from datetime import datetime
+from typing import AsyncIterator, List, NamedTuple, Optional, Type, TypeVar
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.channel import ChannelRegistration
+from app.models.user import User
+
+RowT = TypeVar("RowT", bound=tuple)
+
+
+class RegistrationSummary(NamedTuple):
+    """The fields of ChannelRegistrationResponse"""
+    id: int
+    open_channel_id: str
+    open_channel_title: str
+    closed_channel_id: str
+    closed_channel_title: str
+    created_at: datetime
+    is_active: bool
+    verified: bool
+
+
+class RegistrationExportRow(NamedTuple):
+    """Every stored registration field except the generated search vector"""
+    id: int
+    open_channel_id: str
+    open_channel_title: str
+    open_channel_description: str
+    closed_channel_id: str
+    closed_channel_title: str
+    closed_channel_description: str
+    sub_1_price: Optional[float]
+    sub_1_time: Optional[int]
+    sub_2_price: Optional[float]
+    sub_2_time: Optional[int]
+    sub_3_price: Optional[float]
+    sub_3_time: Optional[int]
+    client_wallet_address: str
+    client_payout_currency: str
+    client_payout_network: str
+    created_at: datetime
+    updated_at: Optional[datetime]
+    is_active: bool
+    verified: bool
+    verification_notes: Optional[str]  # column added by migration 007
+
+
+class UserCredentials(NamedTuple):
+    """What login needs: the UserResponse fields plus the password hash"""
+    id: int
+    email: str
+    username: str
+    is_active: bool
+    is_verified: bool
+    created_at: datetime
+    password_hash: str
+
+
+def select_rows(row_type: Type[RowT], model) -> Select:
+    """SELECT of the `model` columns named by `row_type`'s fields, in field order"""
+    return select(*(getattr(model, field) for field in row_type._fields))
+
+
+async def fetch_rows(db: AsyncSession, statement: Select, row_type: Type[RowT]) -> List[RowT]:
+    result = await db.execute(statement)
+    return [row_type._make(row) for row in result.tuples()]
+
+
+async def fetch_row(db: AsyncSession, statement: Select, row_type: Type[RowT]) -> Optional[RowT]:
+    row = (await db.execute(statement)).first()
+    return None if row is None else row_type._make(row)
+
+
+async def stream_rows(db: AsyncSession, statement: Select, row_type: Type[RowT],
+                      batch_size: int = 1000) -> AsyncIterator[RowT]:
+    """Server-side cursor: at most `batch_size` rows are held at a time"""
+    result = await db.stream(statement.execution_options(yield_per=batch_size))
+    async for partition in result.partitions():
+        for row in partition:
+            yield row_type._make(row)
+
+
+# Registration and user selects used by the read services
+REGISTRATION_SUMMARY = select_rows(RegistrationSummary, ChannelRegistration)
+REGISTRATION_EXPORT = select_rows(RegistrationExportRow, ChannelRegistration)
+USER_CREDENTIALS = select_rows(UserCredentials, User)
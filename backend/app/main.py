@@ -6,10 +6,16 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
+from app.core.config import settings
+from app.core.logging_config import configure_logging
+from app.middleware.idempotency import IdempotencyMiddleware
+from app.middleware.request_id import RequestIdMiddleware
+from pathlib import Path
+import json
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (queued, formatted off the event loop)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app instance
@@ -21,6 +27,19 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Idempotency-Key support for retried POSTs (added first so CORS and headers wrap replays)
+if settings.IDEMPOTENCY_ENABLED:
+    app.add_middleware(
+        IdempotencyMiddleware,
+        paths=["/api/v1/register/", "/api/v1/auth/signup"],
+    )
+
+# Concurrency limits, load shedding and per-request deadlines; inside CORS so shed
+# responses still carry CORS headers and the browser can read the 503
+if settings.ADMISSION_CONTROL_ENABLED:
+    from app.middleware.admission import AdmissionControlMiddleware
+    app.add_middleware(AdmissionControlMiddleware)
+
 # CORS Configuration
 # TODO: Load from environment variables
 origins = [
@@ -34,6 +53,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Retry-After"],
 )
 
 # Security Headers Middleware
@@ -47,6 +67,19 @@ async def add_security_headers(request, call_next):
     response.headers["Content-Security-Policy"] = "default-src 'self'"
     return response
 
+# Per-request SQL statement counts and DB time
+if settings.SQL_STATS_ENABLED:
+    from app.middleware.query_stats import QueryStatsMiddleware
+    app.add_middleware(QueryStatsMiddleware)
+
+# On-demand request profiling; not installed at all unless enabled
+if settings.PROFILING_ENABLED:
+    from app.middleware.profiling import ProfilingMiddleware
+    app.add_middleware(ProfilingMiddleware)
+
+# Request IDs (outermost, so every log record of the request carries the ID)
+app.add_middleware(RequestIdMiddleware)
+
 
 @app.get("/")
 async def root():
@@ -74,6 +107,23 @@ async def health_check():
 from app.api.v1.api import api_router
 app.include_router(api_router, prefix="/api/v1")
 
+
+def openapi_schema() -> dict:
+    """
+    OpenAPI schema for /openapi.json and /docs, built once per worker on first request,
+    or read from OPENAPI_SCHEMA_PATH when the image build precomputed it
+    """
+    if app.openapi_schema is None:
+        schema_path = Path(settings.OPENAPI_SCHEMA_PATH) if settings.OPENAPI_SCHEMA_PATH else None
+        if schema_path is not None and schema_path.is_file():
+            app.openapi_schema = json.loads(schema_path.read_text())
+        else:
+            FastAPI.openapi(app)
+    return app.openapi_schema
+
+
+app.openapi = openapi_schema
+
 # Startup and shutdown events
 @app.on_event("startup")
 async def startup_event():
@@ -82,6 +132,11 @@ async def startup_event():
     logger.info("Application starting up...")
     # Uncomment to auto-create tables (use migrations in production)
     # await init_db()
+    if settings.CHANNEL_ID_FILTER_ENABLED:
+        # Loads in the background; availability checks use the database until it is ready
+        from app.db.database import AsyncSessionLocal, ReplicaSessionLocal
+        from app.services.channel_availability import channel_id_index
+        channel_id_index.start(ReplicaSessionLocal or AsyncSessionLocal)
     logger.info("Application startup complete")
 
 
@@ -89,17 +144,20 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown"""
     from app.db.database import close_db
+    from app.db.group_commit import close_writers
+    from app.services.channel_availability import channel_id_index
+    from app.services.recaptcha import RecaptchaService
+    from app.services.registration_events import registration_events
     logger.info("Application shutting down...")
+    await channel_id_index.stop()
+    await registration_events.close()
+    await RecaptchaService.close()
+    await close_writers()
     await close_db()
     logger.info("Application shutdown complete")
 
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
-        log_level="info"
-    )
+    # Auto-reload for local development only; production runs `python -m app.server`
+    from app.server import run
+    run(reload=settings.DEBUG)
@@ -0,0 +1,163 @@
+"""
+Admission Control Middleware
+Per-route concurrency limits with a bounded wait queue; sheds excess load with 503 + Retry-After
+and starts each admitted request's deadline
+"""
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import time
+
+from app.core.config import settings
+from app.core.deadline import request_deadline
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrencyLimiter:
+    """
+    At most `limit` holders at once; up to `queue_size` more wait in FIFO order
+
+    acquire() returns False immediately when the queue is full, and after
+    `timeout` seconds if no slot freed up. Single event loop use.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self.last_shed_log = 0.0
+        self.counters = {"admitted": 0, "queued": 0, "shed_queue_full": 0, "shed_timeout": 0}
+
+    async def acquire(self, timeout: float) -> bool:
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.counters["admitted"] += 1
+            return True
+        if len(self._waiters) >= self.queue_size or timeout <= 0:
+            self.counters["shed_queue_full"] += 1
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.counters["queued"] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # Handed a slot just as the wait ran out; keep it
+                self.counters["admitted"] += 1
+                return True
+            waiter.cancel()
+            self.counters["shed_timeout"] += 1
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            waiter.cancel()
+            raise
+        finally:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+        self.counters["admitted"] += 1
+        return True
+
+    def release(self) -> None:
+        # Hand the slot straight to the oldest live waiter; in_flight stays the same
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {"name": self.name, "limit": self.limit, "queue_size": self.queue_size,
+                "in_flight": self.in_flight, "waiting": len(self._waiters), **self.counters}
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware in front of the routes
+
+    Each request is matched to the limiter of the longest ADMISSION_ROUTE_LIMITS prefix,
+    or the shared default limiter. It waits at most ADMISSION_MAX_WAIT_SECONDS for a slot
+    (less if the queue is full: then it is shed at once). Admitted requests get a
+    deadline of REQUEST_TIMEOUT_SECONDS from arrival, so queueing time counts against it.
+    """
+
+    def __init__(self, app, route_limits: Optional[Dict[str, int]] = None,
+                 exempt_paths: Optional[List[str]] = None):
+        self.app = app
+        route_limits = settings.ADMISSION_ROUTE_LIMITS if route_limits is None else route_limits
+        self.exempt_paths = tuple(settings.ADMISSION_EXEMPT_PATHS if exempt_paths is None else exempt_paths)
+        # Longest prefix first
+        self.limiters: List[Tuple[str, ConcurrencyLimiter]] = [
+            (prefix, ConcurrencyLimiter(prefix, limit, settings.ADMISSION_QUEUE_SIZE))
+            for prefix, limit in sorted(route_limits.items(), key=lambda item: -len(item[0]))
+        ]
+        self.default_limiter = ConcurrencyLimiter("*", settings.ADMISSION_MAX_CONCURRENCY, settings.ADMISSION_QUEUE_SIZE)
+        _middlewares.append(self)
+
+    def limiter_for(self, path: str) -> ConcurrencyLimiter:
+        for prefix, limiter in self.limiters:
+            if path.startswith(prefix):
+                return limiter
+        return self.default_limiter
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        arrived = time.monotonic()
+        limiter = self.limiter_for(scope["path"])
+        if not await limiter.acquire(settings.ADMISSION_MAX_WAIT_SECONDS):
+            # At most one log line per second per limiter while overloaded
+            if arrived - limiter.last_shed_log >= 1.0:
+                limiter.last_shed_log = arrived
+                logger.warning(
+                    "Shedding load on %s: %d in flight, %d waiting, %d shed so far",
+                    limiter.name, limiter.in_flight, len(limiter._waiters),
+                    limiter.counters["shed_queue_full"] + limiter.counters["shed_timeout"]
+                )
+            await self._shed(send)
+            return
+
+        token = request_deadline.set(arrived + settings.REQUEST_TIMEOUT_SECONDS)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_deadline.reset(token)
+            limiter.release()
+
+    @staticmethod
+    async def _shed(send) -> None:
+        body = json.dumps({"detail": "Server is busy. Please retry shortly."}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER_SECONDS).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    def stats(self) -> List[dict]:
+        return [limiter.stats() for _, limiter in self.limiters] + [self.default_limiter.stats()]
+
+
+# Instances built by Starlette's middleware stack, for /admin/admission
+_middlewares: List[AdmissionControlMiddleware] = []
+
+
+def admission_stats() -> List[dict]:
+    return [stats for middleware in _middlewares for stats in middleware.stats()]
@@ -0,0 +1,228 @@
+"""
+Idempotency-Key Middleware
+Replays the stored response for retried POSTs instead of re-running the handler
+"""
+from typing import Iterable, List, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+from app.core.config import settings
+from app.services.idempotency import IdempotencyRecord, create_idempotency_store
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+AUTHORIZATION_HEADER = b"authorization"
+MAX_KEY_LENGTH = 255
+MAX_STORED_BODY_BYTES = 64 * 1024
+
+# Hop-by-hop and per-response headers that must not be replayed
+_SKIPPED_HEADERS = {b"content-length", b"date", b"server", b"set-cookie"}
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware implementing the Idempotency-Key header for selected POST routes
+
+    Keys are scoped to the client (its Authorization header, or else its address),
+    so one client can never be replayed another's response. The first request for
+    a key runs normally and its status, headers and body are stored. Retries with
+    the same key and body get the stored response; a retry with a different body
+    is rejected with 422. Duplicates that arrive while the first request is still
+    running wait for its result.
+    """
+
+    def __init__(self, app, paths: Iterable[str], store=None):
+        self.app = app
+        self.paths = frozenset(paths)
+        self.store = store if store is not None else create_idempotency_store()
+        self.wait_seconds = settings.IDEMPOTENCY_WAIT_SECONDS
+        self._inflight: dict[str, asyncio.Event] = {}
+        _middlewares.append(self)
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] not in self.paths
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        raw_key = self._get_header(scope, IDEMPOTENCY_HEADER)
+        if raw_key is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not raw_key or len(raw_key) > MAX_KEY_LENGTH:
+            await self._send_json(send, 400, {"detail": f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"})
+            return
+
+        body = await self._read_body(receive)
+        if body is None:
+            # The client went away mid-body; never run the handler on a partial request
+            return
+        fingerprint = hashlib.sha256(body).hexdigest()
+        key = self._store_key(scope, raw_key)
+
+        deadline = time.monotonic() + self.wait_seconds
+        while True:
+            record = await self.store.get(key)
+            if record is not None:
+                if record.fingerprint != fingerprint:
+                    await self._send_json(send, 422, {"detail": "Idempotency-Key was already used with a different request body"})
+                    return
+                if record.completed:
+                    await self._replay(send, record)
+                    return
+                if not await self._wait_for(key, deadline):
+                    await self._send_json(
+                        send, 409,
+                        {"detail": "A request with this Idempotency-Key is still being processed"},
+                        retry_after=1,
+                    )
+                    return
+                continue
+
+            if await self.store.claim(key, fingerprint):
+                break
+
+        await self._run_and_store(scope, receive, send, body, key)
+
+    async def _run_and_store(self, scope, receive, send, body: bytes, key: str) -> None:
+        done = asyncio.Event()
+        self._inflight[key] = done
+
+        status_code: Optional[int] = None
+        headers: list = []
+        chunks: list[bytes] = []
+
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        async def capture_send(message):
+            nonlocal status_code, headers
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = [
+                    [name.decode("latin-1"), value.decode("latin-1")]
+                    for name, value in message.get("headers", [])
+                    if name.lower() not in _SKIPPED_HEADERS
+                ]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except BaseException:
+            await self.store.release(key)
+            raise
+        else:
+            response_body = b"".join(chunks)
+            if self._is_storable(status_code, response_body):
+                await self.store.complete(key, status_code, headers, response_body)
+            else:
+                await self.store.release(key)
+        finally:
+            self._inflight.pop(key, None)
+            done.set()
+
+    async def _wait_for(self, key: str, deadline: float) -> bool:
+        """Wait for an in-flight request for `key`; False once the deadline passes"""
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+
+        event = self._inflight.get(key)
+        if event is None:
+            # In flight on another worker; poll the shared store
+            await asyncio.sleep(min(0.05, remaining))
+            return True
+
+        try:
+            await asyncio.wait_for(event.wait(), timeout=remaining)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    @staticmethod
+    def _is_storable(status_code: Optional[int], body: bytes) -> bool:
+        # Server errors and rate limiting are transient; let the client retry them
+        if status_code is None or status_code >= 500 or status_code == 429:
+            return False
+        return len(body) <= MAX_STORED_BODY_BYTES
+
+    @classmethod
+    def _store_key(cls, scope, raw_key: bytes) -> str:
+        """path:sha256(client identity, key); fixed length, and the raw key is not stored"""
+        client = cls._get_header(scope, AUTHORIZATION_HEADER)
+        if client is None:
+            # Behind the server's proxy_headers handling this is the forwarded client address
+            client = (scope.get("client") or ("",))[0].encode("latin-1")
+        digest = hashlib.sha256(client + b"\0" + raw_key).hexdigest()
+        return f"{scope['path']}:{digest}"
+
+    @staticmethod
+    def _get_header(scope, name: bytes) -> Optional[bytes]:
+        for header_name, value in scope.get("headers", []):
+            if header_name.lower() == name:
+                return value.strip()
+        return None
+
+    @staticmethod
+    async def _read_body(receive) -> Optional[bytes]:
+        """The full request body, or None if the client disconnected before sending it"""
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return None
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        return b"".join(chunks)
+
+    @staticmethod
+    async def _replay(send, record: IdempotencyRecord) -> None:
+        headers = [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in (record.headers or [])
+        ]
+        headers.append((b"content-length", str(len(record.body)).encode("latin-1")))
+        headers.append((b"idempotent-replayed", b"true"))
+        await send({"type": "http.response.start", "status": record.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": record.body})
+
+    @staticmethod
+    async def _send_json(send, status_code: int, content: dict, retry_after: Optional[int] = None) -> None:
+        body = json.dumps(content).encode("utf-8")
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("latin-1")),
+        ]
+        if retry_after is not None:
+            headers.append((b"retry-after", str(retry_after).encode("latin-1")))
+        await send({"type": "http.response.start", "status": status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def stats(self) -> dict:
+        store_entries = len(self.store) if hasattr(self.store, "__len__") else None
+        return {"backend": type(self.store).__name__, "entries": store_entries, "in_flight": len(self._inflight)}
+
+
+# Instances built by Starlette's middleware stack, for /admin/memory
+_middlewares: List[IdempotencyMiddleware] = []
+
+
+def idempotency_stats() -> List[dict]:
+    return [middleware.stats() for middleware in _middlewares]
@@ -0,0 +1,105 @@
+"""
+Profiling Middleware
+Profiles individual requests on demand (authorized header) or by sampling
+"""
+import logging
+import random
+import time
+
+from app.core.config import settings
+from app.core.logging_config import request_id_var
+from app.core.security import is_admin_token
+from app.services.profiling import ProfileArtifact, RequestProfiler, new_profile_id, profile_store
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+ADMIN_TOKEN_HEADER = b"x-admin-token"
+PROFILE_ID_HEADER = b"x-profile-id"
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles a request when it carries `X-Profile: 1` plus a valid
+    X-Admin-Token, or with probability PROFILING_SAMPLE_RATE
+
+    Only added when PROFILING_ENABLED is set, so it costs nothing otherwise. One request
+    per worker is profiled at a time; others run unprofiled meanwhile. The profile ID is
+    returned in the X-Profile-Id header and the artifact is listed under /api/v1/admin/profiles.
+
+    The cProfile fallback records everything the event-loop thread runs, not just this
+    request, so it only starts when no other request is in flight. Requests that arrive
+    while it runs still land in the profile; their number is stored as concurrent_requests.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+        self._busy = False
+        self._in_flight = 0  # requests running unprofiled on this worker
+        self._overlapping = 0  # of those, started while a profile was open
+
+    def _requested(self, scope) -> bool:
+        headers = dict(scope["headers"])
+        if headers.get(PROFILE_HEADER) == b"1":
+            token = headers.get(ADMIN_TOKEN_HEADER)
+            return token is not None and is_admin_token(token.decode("latin-1"))
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def _run_unprofiled(self, scope, receive, send) -> None:
+        self._in_flight += 1
+        if self._busy:
+            self._overlapping += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self._busy or not self._requested(scope):
+            await self._run_unprofiled(scope, receive, send)
+            return
+
+        profiler = RequestProfiler()
+        if profiler.captures_whole_thread and self._in_flight:
+            logger.info("Not profiling %s %s: cProfile would also record %d concurrent request(s)",
+                        scope["method"], scope["path"], self._in_flight)
+            await self._run_unprofiled(scope, receive, send)
+            return
+
+        self._busy = True
+        self._overlapping = 0
+        artifact_id = new_profile_id()
+        status_code = None
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {**message, "headers": [*message.get("headers", []), (PROFILE_ID_HEADER, artifact_id.encode())]}
+            await send(message)
+
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
+            duration_ms = (time.perf_counter() - started) * 1000.0
+            self._busy = False
+            artifact = ProfileArtifact(
+                id=artifact_id,
+                method=scope["method"],
+                path=scope["path"],
+                status_code=status_code,
+                duration_ms=round(duration_ms, 3),
+                created_at=time.time(),
+                format=profiler.format,
+                request_id=request_id_var.get(),
+                concurrent_requests=self._overlapping,
+            )
+            await profile_store.save(artifact, profiler)
+            logger.info("Stored %s profile %s for %s %s", artifact.format, artifact_id, artifact.method, artifact.path)
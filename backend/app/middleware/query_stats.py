@@ -0,0 +1,44 @@
+"""
+Query Stats Middleware
+Counts the SQL statements and DB time of each request; admin requests get them in Server-Timing
+"""
+from app.core.security import is_admin_token
+from app.db.query_stats import RequestQueryStats, current_request_stats, query_stats
+
+SERVER_TIMING_HEADER = b"server-timing"
+ADMIN_TOKEN_HEADER = b"x-admin-token"
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that opens a per-request statement counter read by the engine hooks
+
+    Every request is counted for /api/v1/admin/sql and the slow-query log, but the
+    Server-Timing header is only added for requests carrying a valid X-Admin-Token:
+    DB timings would tell anonymous clients about backend load and query shapes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats(scope)
+        token = dict(scope["headers"]).get(ADMIN_TOKEN_HEADER)
+        report_timing = token is not None and is_admin_token(token.decode("latin-1"))
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start" and report_timing and stats.queries:
+                timing = f'db;dur={stats.db_time_ms:.1f};desc="{stats.queries} queries"'
+                message = {**message, "headers": [*message.get("headers", []), (SERVER_TIMING_HEADER, timing.encode())]}
+            await send(message)
+
+        context_token = current_request_stats.set(stats)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request_stats.reset(context_token)
+            query_stats.record_request(stats)
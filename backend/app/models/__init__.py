@@ -1,5 +1,6 @@
 # Models package
 from app.models.channel import ChannelRegistration, NetworkCurrencyMapping
 from app.models.user import User
+from app.models.idempotency import IdempotencyKey
 
-__all__ = ["ChannelRegistration", "NetworkCurrencyMapping", "User"]
+__all__ = ["ChannelRegistration", "NetworkCurrencyMapping", "User", "IdempotencyKey"]
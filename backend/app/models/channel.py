@@ -1,8 +1,10 @@
 """
 Database Models for Channel Registration
 """
-from sqlalchemy import Column, String, Integer, Float, DateTime, Boolean
+from sqlalchemy import Column, String, Integer, Float, DateTime, Boolean, Computed, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from datetime import datetime
 
@@ -13,9 +15,14 @@ class ChannelRegistration(Base):
     """Channel registration model"""
 
     __tablename__ = "channel_registrations"
+    __table_args__ = (
+        # Partial index matching the moderation queue (migration 005)
+        Index("ix_channel_registrations_pending_created_at", "created_at",
+              postgresql_where=text("is_active AND NOT verified")),
+    )
 
     # Primary Key
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
 
     # Open Channel (Public)
     open_channel_id = Column(String(50), unique=True, nullable=False, index=True)
@@ -49,6 +56,19 @@ class ChannelRegistration(Base):
     verified = Column(Boolean, default=False, nullable=False)
     verification_notes = Column(String(500), nullable=True)
 
+    # Full-text search (generated by PostgreSQL, GIN indexed; see migration 004)
+    # Deferred so regular loads don't fetch it
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple'::regconfig, coalesce(open_channel_title, '')), 'A') || "
+            "setweight(to_tsvector('simple'::regconfig, coalesce(closed_channel_title, '')), 'A') || "
+            "setweight(to_tsvector('simple'::regconfig, coalesce(open_channel_description, '')), 'B') || "
+            "setweight(to_tsvector('simple'::regconfig, coalesce(closed_channel_description, '')), 'B')",
+            persisted=True
+        )
+    ))
+
     def __repr__(self):
         return f"<ChannelRegistration(id={self.id}, open_channel_id='{self.open_channel_id}')>"
 
@@ -57,9 +77,13 @@ class NetworkCurrencyMapping(Base):
     """Network to currency mappings"""
 
     __tablename__ = "network_currency_mappings"
+    __table_args__ = (
+        Index("ix_network_currency_mappings_active_network", "network_code", "currency_code",
+              postgresql_where=text("is_active")),
+    )
 
-    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    network_code = Column(String(20), nullable=False, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    network_code = Column(String(20), nullable=False)
     network_name = Column(String(50), nullable=False)
     currency_code = Column(String(10), nullable=False, index=True)
     currency_name = Column(String(50), nullable=False)
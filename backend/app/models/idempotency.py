@@ -0,0 +1,27 @@
+"""
+Database Model for Idempotency-Key Responses
+"""
+from sqlalchemy import Column, String, Integer, DateTime, LargeBinary
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.models.channel import Base
+
+
+class IdempotencyKey(Base):
+    """Stored response for a client-supplied Idempotency-Key"""
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(300), primary_key=True)
+    request_fingerprint = Column(String(64), nullable=False)
+
+    # NULL while the first request is still in flight
+    status_code = Column(Integer, nullable=True)
+    response_headers = Column(JSONB, nullable=True)
+    response_body = Column(LargeBinary, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(key='{self.key}', status_code={self.status_code})>"
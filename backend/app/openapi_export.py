@@ -0,0 +1,31 @@
+"""
+OpenAPI Schema Export
+Writes the API's OpenAPI schema to a file at image build time; workers started with
+OPENAPI_SCHEMA_PATH pointing at it serve /openapi.json without generating the schema
+
+Usage:
+    python -m app.openapi_export openapi.json
+"""
+from pathlib import Path
+import json
+import sys
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("usage: python -m app.openapi_export <output.json>", file=sys.stderr)
+        return 2
+
+    from fastapi import FastAPI
+    from app.main import app
+
+    # The class method generates it; app.openapi() would read the file being replaced
+    schema = FastAPI.openapi(app)
+    Path(argv[0]).write_text(json.dumps(schema, separators=(",", ":")))
+    print(f"Wrote OpenAPI schema ({len(schema.get('paths', {}))} paths) to {argv[0]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,35 +1,25 @@
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, StringConstraints, model_validator
 from datetime import datetime
-import re
+from typing import Annotated
+
+
+# Username rules run in pydantic-core: allowed characters via pattern, then lowercased
+Username = Annotated[str, StringConstraints(min_length=3, max_length=30, pattern=r'^[a-zA-Z0-9_-]+$', to_lower=True)]
 
 
 class UserSignup(BaseModel):
     """User signup request schema"""
     email: EmailStr = Field(..., description="User email address")
-    username: str = Field(..., min_length=3, max_length=30, description="Username (3-30 characters)")
+    username: Username = Field(..., description="Username (3-30 characters, letters, numbers, _ and -)")
     password: str = Field(..., min_length=8, max_length=100, description="Password (min 8 characters)")
     confirm_password: str = Field(..., description="Password confirmation")
 
-    @field_validator('username')
-    @classmethod
-    def validate_username(cls, v: str) -> str:
-        """Validate username format"""
-        if not re.match(r'^[a-zA-Z0-9_-]+$', v):
-            raise ValueError('Username can only contain letters, numbers, underscores, and hyphens')
-        return v.lower()
-
-    @field_validator('password')
-    @classmethod
-    def validate_password(cls, v: str) -> str:
-        """Validate password strength (basic)"""
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        return v
-
-    def model_post_init(self, __context) -> None:
+    @model_validator(mode='after')
+    def validate_password_confirmation(self) -> 'UserSignup':
         """Validate password confirmation"""
         if self.password != self.confirm_password:
             raise ValueError('Passwords do not match')
+        return self
 
 
 class UserLogin(BaseModel):
@@ -40,6 +30,8 @@ class UserLogin(BaseModel):
 
 class UserResponse(BaseModel):
     """User response schema"""
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     email: str
     username: str
@@ -47,9 +39,6 @@ class UserResponse(BaseModel):
     is_verified: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
-
 
 class AuthResponse(BaseModel):
     """Authentication response schema"""
@@ -1,18 +1,23 @@
 """
 Pydantic Schemas for Channel Registration
 """
-from pydantic import BaseModel, Field, validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, TypeAdapter, model_validator
+from typing import Annotated, List, Literal, Optional
 from datetime import datetime
 
 
+# Constraints are enforced inside pydantic-core, without Python-level validator calls
+ChannelId = Annotated[str, StringConstraints(min_length=5, max_length=50, pattern=r'^-[0-9]+$')]
+UpperCode = Annotated[str, StringConstraints(to_upper=True)]
+
+
 class ChannelRegistrationBase(BaseModel):
     """Base schema for channel registration"""
-    open_channel_id: str = Field(..., min_length=5, max_length=50, description="Open channel Telegram ID")
+    open_channel_id: ChannelId = Field(..., description="Open channel Telegram ID (\"-\" followed by digits)")
     open_channel_title: str = Field(..., min_length=1, max_length=200, description="Open channel title")
     open_channel_description: str = Field(..., min_length=1, max_length=1000, description="Open channel description")
 
-    closed_channel_id: str = Field(..., min_length=5, max_length=50, description="Closed channel Telegram ID")
+    closed_channel_id: ChannelId = Field(..., description="Closed channel Telegram ID (\"-\" followed by digits)")
     closed_channel_title: str = Field(..., min_length=1, max_length=200, description="Closed channel title")
     closed_channel_description: str = Field(..., min_length=1, max_length=1000, description="Closed channel description")
 
@@ -26,22 +31,8 @@ class ChannelRegistrationBase(BaseModel):
 
     # Payment info
     client_wallet_address: str = Field(..., min_length=10, max_length=110, description="Wallet address")
-    client_payout_currency: str = Field(..., min_length=2, max_length=10, description="Currency code")
-    client_payout_network: str = Field(..., min_length=2, max_length=20, description="Network code")
-
-    @validator('open_channel_id', 'closed_channel_id')
-    def validate_channel_id(cls, v):
-        """Validate channel ID format"""
-        if not v.startswith('-'):
-            raise ValueError('Channel ID must start with "-"')
-        if not v[1:].isdigit():
-            raise ValueError('Channel ID must contain only digits after "-"')
-        return v
-
-    @validator('client_payout_currency', 'client_payout_network')
-    def to_uppercase(cls, v):
-        """Convert to uppercase"""
-        return v.upper()
+    client_payout_currency: UpperCode = Field(..., min_length=2, max_length=10, description="Currency code")
+    client_payout_network: UpperCode = Field(..., min_length=2, max_length=20, description="Network code")
 
 
 class ChannelRegistrationCreate(ChannelRegistrationBase):
@@ -51,6 +42,8 @@ class ChannelRegistrationCreate(ChannelRegistrationBase):
 
 class ChannelRegistrationResponse(BaseModel):
     """Schema for channel registration response"""
+    model_config = ConfigDict(from_attributes=True)
+
     id: int
     open_channel_id: str
     open_channel_title: str
@@ -60,20 +53,90 @@ class ChannelRegistrationResponse(BaseModel):
     is_active: bool
     verified: bool
 
-    class Config:
-        from_attributes = True
+
+class ChannelSearchResult(ChannelRegistrationResponse):
+    """Schema for one channel search hit"""
+    rank: float = Field(..., description="Relevance score (full-text rank plus title similarity)")
+
+
+class ChannelSearchResponse(BaseModel):
+    """Schema for a page of channel search results"""
+    results: List[ChannelSearchResult]
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to fetch the next page")
+
+
+class ChannelRegistrationListResponse(BaseModel):
+    """Schema for a page of channel registrations"""
+    results: List[ChannelRegistrationResponse]
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to fetch the next page")
+
+
+class ChannelModerationFilter(BaseModel):
+    """Criteria selecting registrations for a bulk moderation change"""
+    status: Literal["pending", "active", "inactive", "all"] = Field(
+        "pending", description="pending: active and not yet verified (the moderation queue)"
+    )
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+    client_payout_network: Optional[UpperCode] = Field(None, max_length=20)
+    client_payout_currency: Optional[UpperCode] = Field(None, max_length=10)
+
+
+class ChannelModerationChanges(BaseModel):
+    """Moderation fields to set; omitted fields are left as they are"""
+    verified: Optional[bool] = None
+    verification_notes: Optional[str] = Field(None, max_length=500)
+    is_active: Optional[bool] = None
+
+    @model_validator(mode='after')
+    def validate_not_empty(self) -> 'ChannelModerationChanges':
+        """Require at least one change; only verification_notes may be set to null"""
+        if not self.model_fields_set:
+            raise ValueError('No changes given')
+        if (self.verified is None and 'verified' in self.model_fields_set) or \
+                (self.is_active is None and 'is_active' in self.model_fields_set):
+            raise ValueError('verified and is_active cannot be null')
+        return self
+
+
+class ChannelBulkModerationRequest(BaseModel):
+    """Schema for a bulk moderation request: either registration ids or a filter"""
+    ids: Optional[List[int]] = Field(None, min_length=1, description="Registration ids")
+    filter: Optional[ChannelModerationFilter] = None
+    changes: ChannelModerationChanges
+
+    @model_validator(mode='after')
+    def validate_selection(self) -> 'ChannelBulkModerationRequest':
+        """Exactly one of ids and filter"""
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError('Give either ids or filter')
+        return self
+
+
+class ChannelBulkModerationResponse(BaseModel):
+    """Schema for the outcome of a bulk moderation request"""
+    matched: int = Field(..., description="Registrations selected by the ids or filter")
+    updated: int = Field(..., description="Registrations changed; the rest already had these values or do not exist")
+    batches: int
+    updated_ids: List[int]
+
+
+class ChannelAvailabilityResponse(BaseModel):
+    """Schema for a channel ID availability pre-check"""
+    channel_id: str
+    kind: Literal["open", "closed"]
+    available: bool = Field(..., description="Advisory; registration still rejects duplicates with 409")
 
 
 class NetworkCurrencyMappingSchema(BaseModel):
     """Schema for network-currency mapping"""
+    model_config = ConfigDict(from_attributes=True)
+
     network_code: str
     network_name: str
     currency_code: str
     currency_name: str
 
-    class Config:
-        from_attributes = True
-
 
 class HealthCheckResponse(BaseModel):
     """Health check response schema"""
@@ -81,3 +144,7 @@ class HealthCheckResponse(BaseModel):
     service: str
     version: str
     database: Optional[str] = None
+
+
+# Adapters are built once at import; constructing them per call rebuilds the core schema
+NetworkCurrencyMappingListAdapter = TypeAdapter(List[NetworkCurrencyMappingSchema])
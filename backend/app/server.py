@@ -0,0 +1,114 @@
+"""
+Production Server Entry Point
+Runs app.main:app under uvicorn with N worker processes sized from the CPU quota
+
+Usage:
+    python -m app.server
+"""
+from pathlib import Path
+from typing import Optional
+import importlib.util
+import logging
+import math
+import os
+
+from app.core.config import settings
+from app.core.logging_config import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def _read_cgroup_cpu_limit() -> Optional[float]:
+    """CPU limit from the container's cgroup (v2 or v1), or None when unlimited"""
+    cpu_max = Path("/sys/fs/cgroup/cpu.max")
+    try:
+        if cpu_max.exists():
+            quota, period = cpu_max.read_text().split()[:2]
+            if quota != "max":
+                return int(quota) / int(period)
+            return None
+
+        quota_file = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+        period_file = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+        if quota_file.exists() and period_file.exists():
+            quota = int(quota_file.read_text())
+            if quota > 0:
+                return quota / int(period_file.read_text())
+    except (OSError, ValueError) as e:
+        logger.warning("Could not read cgroup CPU limit: %s", e)
+    return None
+
+
+def available_cpus() -> float:
+    """CPUs this process may use: the cgroup quota if set, otherwise the affinity mask"""
+    try:
+        cpus = float(len(os.sched_getaffinity(0)))
+    except AttributeError:
+        cpus = float(os.cpu_count() or 1)
+
+    limit = _read_cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, limit)
+    return cpus
+
+
+def worker_count() -> int:
+    """
+    Number of worker processes: WEB_CONCURRENCY if set, otherwise one per available CPU,
+    capped at SERVER_MAX_WORKERS either way
+    """
+    if settings.WEB_CONCURRENCY > 0:
+        workers = settings.WEB_CONCURRENCY
+    else:
+        workers = max(1, math.ceil(available_cpus()))
+    return min(workers, settings.SERVER_MAX_WORKERS)
+
+
+def _best_available(candidates: list[tuple[str, str]], fallback: str) -> str:
+    for module, name in candidates:
+        if importlib.util.find_spec(module) is not None:
+            return name
+    return fallback
+
+
+def server_options(workers: Optional[int] = None, reload: bool = False) -> dict:
+    """Keyword arguments for uvicorn.run()"""
+    return {
+        "host": settings.SERVER_HOST,
+        "port": settings.PORT,
+        "workers": 1 if reload else (workers or worker_count()),
+        "reload": reload,
+        "loop": _best_available([("uvloop", "uvloop")], "asyncio"),
+        "http": _best_available([("httptools", "httptools")], "h11"),
+        "backlog": settings.SERVER_BACKLOG,
+        # Longer than the load balancer's idle timeout so it never reuses a closed socket
+        "timeout_keep_alive": settings.SERVER_KEEPALIVE_SECONDS,
+        # Finish in-flight requests on SIGTERM, inside Cloud Run's shutdown window
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        # X-Forwarded-For is only honoured from FORWARDED_ALLOW_IPS; from anyone else it is
+        # client-controlled and would let callers pick the IP every per-IP limit keys on
+        "proxy_headers": True,
+        "forwarded_allow_ips": settings.FORWARDED_ALLOW_IPS,
+        "server_header": False,
+        "access_log": settings.SERVER_ACCESS_LOG,
+        # uvicorn's records propagate to the root logger set up by configure_logging()
+        "log_config": None,
+        "log_level": settings.LOG_LEVEL.lower(),
+    }
+
+
+def run(workers: Optional[int] = None, reload: bool = False) -> None:
+    """Start uvicorn; with more than one worker uvicorn supervises the processes"""
+    import uvicorn
+
+    options = server_options(workers, reload)
+    logger.info(
+        "Starting server on %s:%s with %d worker(s), loop=%s, http=%s",
+        options["host"], options["port"], options["workers"], options["loop"], options["http"]
+    )
+    uvicorn.run("app.main:app", **options)
+
+
+if __name__ == "__main__":
+    configure_logging()
+    run()
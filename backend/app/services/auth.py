@@ -1,6 +1,7 @@
 import bcrypt
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from app.db.read_models import USER_CREDENTIALS, UserCredentials, fetch_row
 from app.models.user import User
 from app.schemas.auth import UserSignup, UserLogin
 from fastapi import HTTPException, status
@@ -29,10 +30,10 @@ class AuthService:
         """Create a new user account"""
         # Check if email already exists
         result = await db.execute(
-            select(User).where(User.email == signup_data.email)
+            select(User.id).where(User.email == signup_data.email)
         )
         existing_user = result.scalar_one_or_none()
-        if existing_user:
+        if existing_user is not None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
@@ -40,10 +41,10 @@ class AuthService:
 
         # Check if username already exists
         result = await db.execute(
-            select(User).where(User.username == signup_data.username.lower())
+            select(User.id).where(User.username == signup_data.username.lower())
         )
         existing_username = result.scalar_one_or_none()
-        if existing_username:
+        if existing_username is not None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Username already taken"
@@ -66,13 +67,10 @@ class AuthService:
         return new_user
 
     @staticmethod
-    async def authenticate_user(db: AsyncSession, login_data: UserLogin) -> User:
+    async def authenticate_user(db: AsyncSession, login_data: UserLogin) -> UserCredentials:
         """Authenticate a user by email and password"""
-        # Find user by email
-        result = await db.execute(
-            select(User).where(User.email == login_data.email)
-        )
-        user = result.scalar_one_or_none()
+        # Find user by email (read-model row; login never modifies the user)
+        user = await fetch_row(db, USER_CREDENTIALS.where(User.email == login_data.email), UserCredentials)
 
         if not user:
             raise HTTPException(
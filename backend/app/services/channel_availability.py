@@ -0,0 +1,188 @@
+"""
+Channel ID Availability
+Per-worker Bloom filter of registered open/closed channel IDs, so availability checks
+only reach Postgres when an ID may be taken
+"""
+from typing import Optional, Tuple
+import asyncio
+import hashlib
+import logging
+import math
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.channel import ChannelRegistration
+
+logger = logging.getLogger(__name__)
+
+# Registrations commit out of id order; re-reading this many ids below the highest
+# one seen picks up late commits (an ID added twice is counted once)
+_REFRESH_OVERLAP_IDS = 1000
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings
+
+    Sized for `capacity` items at `error_rate` false positives; no false negatives.
+    Positions come from one blake2b digest split into two 64-bit hashes (double hashing).
+    `count` estimates distinct items: an item whose bits were all set already is not counted.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item: str) -> bool:
+        """Set the item's bits; True if any was unset (the item is new)"""
+        new = False
+        for position in self._positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def estimated_error_rate(self) -> float:
+        return (1 - math.exp(-self.hash_count * self.count / self.size)) ** self.hash_count
+
+
+class ChannelIdIndex:
+    """
+    Registered channel IDs of this worker's view of the database
+
+    Filled in the background after startup and topped up every
+    CHANNEL_ID_FILTER_REFRESH_SECONDS with registrations committed since; this
+    worker's own inserts are added immediately. Until the first load completes
+    (or if it fails) every check falls through to the database. Once the count
+    passes the filter's capacity, the next refresh rebuilds it twice as large.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.filter = BloomFilter(capacity, error_rate)
+        self.ready = False
+        self.last_id = 0
+        self.loaded_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self.counters = {"checks": 0, "answered_from_filter": 0, "database_lookups": 0, "false_positives": 0}
+
+    @staticmethod
+    def _key(column: str, channel_id: str) -> str:
+        # Open and closed IDs are unique per column, so they are tracked separately
+        return f"{column}:{channel_id}"
+
+    def add(self, open_channel_id: str, closed_channel_id: str) -> None:
+        self.filter.add(self._key("open", open_channel_id))
+        self.filter.add(self._key("closed", closed_channel_id))
+
+    def might_be_taken(self, column: str, channel_id: str) -> bool:
+        """False means certainly available (as of the last refresh)"""
+        self.counters["checks"] += 1
+        if not self.ready:
+            return True
+        if self._key(column, channel_id) in self.filter:
+            return True
+        self.counters["answered_from_filter"] += 1
+        return False
+
+    async def is_taken(self, db: AsyncSession, column: str, channel_id: str) -> Tuple[bool, str]:
+        """(taken, source) where source is "filter" or "database" """
+        if not self.might_be_taken(column, channel_id):
+            return False, "filter"
+        self.counters["database_lookups"] += 1
+        model_column = getattr(ChannelRegistration, f"{column}_channel_id")
+        taken = (await db.execute(
+            select(ChannelRegistration.id).where(model_column == channel_id).limit(1)
+        )).first() is not None
+        if not taken and self.ready:
+            self.counters["false_positives"] += 1
+        return taken, "database"
+
+    async def refresh(self, session_factory) -> int:
+        """Add registrations with ids above the last seen one; returns how many were read"""
+        if self.filter.count >= self.filter.capacity:
+            logger.info("Channel ID filter at capacity (%d); rebuilding at %d",
+                        self.filter.capacity, self.filter.capacity * 2)
+            self.filter = BloomFilter(self.filter.capacity * 2, self.filter.error_rate)
+            self.last_id = 0
+            self.ready = False
+
+        statement = (
+            select(ChannelRegistration.id, ChannelRegistration.open_channel_id, ChannelRegistration.closed_channel_id)
+            .where(ChannelRegistration.id > max(0, self.last_id - _REFRESH_OVERLAP_IDS))
+            .order_by(ChannelRegistration.id)
+            .execution_options(yield_per=10000)
+        )
+        read = 0
+        async with session_factory() as session:
+            result = await session.stream(statement)
+            async for partition in result.partitions():
+                for registration_id, open_channel_id, closed_channel_id in partition:
+                    self.add(open_channel_id, closed_channel_id)
+                    self.last_id = max(self.last_id, registration_id)
+                read += len(partition)
+                # Yield to request handling between batches of a large initial load
+                await asyncio.sleep(0)
+        self.ready = True
+        self.loaded_at = time.time()
+        return read
+
+    async def _refresh_forever(self, session_factory) -> None:
+        while True:
+            started = time.monotonic()
+            try:
+                read = await self.refresh(session_factory)
+                logger.debug("Channel ID filter refreshed: %d rows in %.0f ms",
+                             read, (time.monotonic() - started) * 1000.0)
+            except Exception as e:
+                logger.warning("Channel ID filter refresh failed: %s", e)
+            await asyncio.sleep(settings.CHANNEL_ID_FILTER_REFRESH_SECONDS)
+
+    def start(self, session_factory) -> None:
+        """Startup hook: load and keep refreshing in the background"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_forever(session_factory))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "ids": self.filter.count,
+            "capacity": self.filter.capacity,
+            "size_bytes": len(self.filter.bits),
+            "hash_count": self.filter.hash_count,
+            "estimated_error_rate": round(self.filter.estimated_error_rate(), 6),
+            "last_id": self.last_id,
+            "loaded_at": self.loaded_at,
+            **self.counters,
+        }
+
+
+# Capacity counts IDs: two per registration
+channel_id_index = ChannelIdIndex(settings.CHANNEL_ID_FILTER_CAPACITY, settings.CHANNEL_ID_FILTER_ERROR_RATE)
@@ -0,0 +1,104 @@
+"""
+Circuit Breaker
+Stops calling a failing or slow dependency for a cooldown period instead of waiting on it
+"""
+from collections import deque
+from typing import Optional
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Count-based circuit breaker over the last `window` calls
+
+    Trips to OPEN when at least `min_calls` were recorded and either the failure
+    rate or the share of calls slower than `slow_call_seconds` reaches its
+    threshold. While OPEN, allow() returns False until `cooldown_seconds` have
+    passed; then one trial call is let through (HALF_OPEN). Its outcome closes
+    the breaker or opens it for another cooldown.
+
+    Single event loop use: no locking.
+    """
+
+    def __init__(self, name: str, window: int = 20, min_calls: int = 10,
+                 failure_rate_threshold: float = 0.5, slow_call_seconds: float = 1.0,
+                 slow_call_rate_threshold: float = 0.5, cooldown_seconds: float = 30.0):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.state = CLOSED
+        self._outcomes: deque = deque(maxlen=window)  # (failed, slow) per call
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.counters = {"calls": 0, "failures": 0, "slow_calls": 0, "rejected": 0, "trips": 0}
+
+    def allow(self) -> bool:
+        """Whether a call may go out now"""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+            self.state = HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.counters["rejected"] += 1
+        return False
+
+    def record(self, failed: bool, elapsed: float) -> None:
+        """Record the outcome of a call that allow() let through"""
+        slow = elapsed >= self.slow_call_seconds
+        self.counters["calls"] += 1
+        self.counters["failures"] += failed
+        self.counters["slow_calls"] += slow
+
+        if self.state == HALF_OPEN:
+            if failed or slow:
+                self._trip("trial call failed" if failed else f"trial call took {elapsed:.2f}s")
+            else:
+                logger.info("Circuit %s closed after successful trial call", self.name)
+                self.state = CLOSED
+                self._outcomes.clear()
+            self._trial_in_flight = False
+            return
+
+        self._outcomes.append((failed, slow))
+        if self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+            calls = len(self._outcomes)
+            failure_rate = sum(f for f, _ in self._outcomes) / calls
+            slow_rate = sum(s for _, s in self._outcomes) / calls
+            if failure_rate >= self.failure_rate_threshold:
+                self._trip(f"failure rate {failure_rate:.0%} over last {calls} calls")
+            elif slow_rate >= self.slow_call_rate_threshold:
+                self._trip(f"{slow_rate:.0%} of last {calls} calls slower than {self.slow_call_seconds}s")
+
+    def release(self) -> None:
+        """A call that allow() let through ended without telling anything about the dependency"""
+        if self.state == HALF_OPEN:
+            self._trial_in_flight = False
+
+    def _trip(self, reason: str) -> None:
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.counters["trips"] += 1
+        logger.warning("Circuit %s opened for %.0fs: %s", self.name, self.cooldown_seconds, reason)
+
+    def retry_after(self) -> Optional[float]:
+        """Seconds until the next trial call, or None when closed"""
+        if self.state == CLOSED:
+            return None
+        return max(0.0, self.cooldown_seconds - (time.monotonic() - self._opened_at))
+
+    def stats(self) -> dict:
+        return {"name": self.name, "state": self.state, "retry_after": self.retry_after(), **self.counters}
@@ -0,0 +1,165 @@
+"""
+Idempotency-Key Response Store
+Keeps the first response for a key so client retries can be replayed
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import logging
+import time
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models.idempotency import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IdempotencyRecord:
+    """Stored state for one Idempotency-Key"""
+    fingerprint: str
+    status_code: Optional[int] = None  # None while the first request is in flight
+    headers: Optional[list] = None
+    body: bytes = b""
+
+    @property
+    def completed(self) -> bool:
+        return self.status_code is not None
+
+
+class MemoryIdempotencyStore:
+    """Per-worker LRU store with per-entry TTL"""
+
+    def __init__(
+        self,
+        ttl_seconds: int = settings.IDEMPOTENCY_TTL_SECONDS,
+        max_entries: int = settings.IDEMPOTENCY_MAX_ENTRIES,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[float, IdempotencyRecord]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[IdempotencyRecord]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, record = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return record
+
+    async def claim(self, key: str, fingerprint: str) -> bool:
+        if await self.get(key) is not None:
+            return False
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, IdempotencyRecord(fingerprint))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return True
+
+    async def complete(self, key: str, status_code: int, headers: list, body: bytes) -> None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return
+        _, record = entry
+        record.status_code = status_code
+        record.headers = headers
+        record.body = body
+
+    async def release(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class PostgresIdempotencyStore:
+    """Store shared by all workers, backed by the idempotency_keys table"""
+
+    def __init__(self, ttl_seconds: int = settings.IDEMPOTENCY_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+
+    async def get(self, key: str) -> Optional[IdempotencyRecord]:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(
+                    IdempotencyKey.request_fingerprint,
+                    IdempotencyKey.status_code,
+                    IdempotencyKey.response_headers,
+                    IdempotencyKey.response_body,
+                ).where(
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.expires_at > datetime.now(timezone.utc),
+                )
+            )
+            row = result.first()
+
+        if row is None:
+            return None
+        return IdempotencyRecord(
+            fingerprint=row.request_fingerprint,
+            status_code=row.status_code,
+            headers=row.response_headers,
+            body=row.response_body or b"",
+        )
+
+    async def claim(self, key: str, fingerprint: str) -> bool:
+        now = datetime.now(timezone.utc)
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key,
+                    IdempotencyKey.expires_at <= now,
+                )
+            )
+            result = await session.execute(
+                insert(IdempotencyKey)
+                .values(
+                    key=key,
+                    request_fingerprint=fingerprint,
+                    expires_at=now + timedelta(seconds=self.ttl_seconds),
+                )
+                .on_conflict_do_nothing(index_elements=[IdempotencyKey.key])
+                .returning(IdempotencyKey.key)
+            )
+            claimed = result.first() is not None
+            await session.commit()
+        return claimed
+
+    async def complete(self, key: str, status_code: int, headers: list, body: bytes) -> None:
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .values(status_code=status_code, response_headers=headers, response_body=body)
+            )
+            await session.commit()
+
+    async def release(self, key: str) -> None:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key))
+            await session.commit()
+
+    async def purge_expired(self) -> int:
+        """Delete expired rows; returns the number removed"""
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.expires_at <= datetime.now(timezone.utc))
+            )
+            await session.commit()
+        return result.rowcount
+
+
+def create_idempotency_store():
+    """Build the store selected by IDEMPOTENCY_BACKEND"""
+    if settings.IDEMPOTENCY_BACKEND == "postgres":
+        return PostgresIdempotencyStore()
+    if settings.IDEMPOTENCY_BACKEND != "memory":
+        logger.warning("Unknown IDEMPOTENCY_BACKEND '%s', using memory", settings.IDEMPOTENCY_BACKEND)
+    return MemoryIdempotencyStore()
@@ -0,0 +1,231 @@
+"""
+Login Throttling
+Per-email and per-IP token buckets with exponential lockout, checked before bcrypt
+"""
+from collections import OrderedDict
+from typing import Optional
+import logging
+import threading
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _Bucket:
+    """Token bucket plus failure/lockout state for a single key"""
+
+    __slots__ = ("tokens", "updated", "failures", "last_failure", "locked_until")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated = now
+        self.failures = 0
+        self.last_failure = 0.0
+        self.locked_until = 0.0
+
+
+class _BucketTable:
+    """Bounded LRU table of buckets for one key kind (email or IP)"""
+
+    def __init__(self, capacity: float, refill_per_second: float, lockout_after: int, max_entries: int):
+        self.capacity = float(capacity)
+        self.refill_per_second = refill_per_second
+        self.lockout_after = lockout_after
+        self.max_entries = max_entries
+        self._buckets: "OrderedDict[str, _Bucket]" = OrderedDict()
+
+    def get(self, key: str, now: float) -> _Bucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _Bucket(self.capacity, now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_entries:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            elapsed = now - bucket.updated
+            if elapsed > 0:
+                bucket.tokens = min(self.capacity, bucket.tokens + elapsed * self.refill_per_second)
+                bucket.updated = now
+        return bucket
+
+    def peek(self, key: str) -> Optional[_Bucket]:
+        return self._buckets.get(key)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+class LoginThrottle:
+    """
+    Cheap admission check for login attempts
+
+    Each attempt consumes one token from the email bucket and one from the IP
+    bucket. Repeated failures lock the key out for an exponentially growing
+    period. Failure counts are forgotten after LOGIN_THROTTLE_FAILURE_WINDOW_SECONDS
+    without a failure; a successful login clears the account's count and halves
+    the IP's, so a shared (NAT) address is not locked out by failures collected
+    slowly over days, nor can one valid account wipe it. All checks run in memory; when LOGIN_THROTTLE_STORAGE_URI is set,
+    failure counts and lockouts are also mirrored to a shared `limits` storage
+    (e.g. redis://) so every worker sees them.
+    """
+
+    def __init__(
+        self,
+        email_burst: int = settings.LOGIN_THROTTLE_EMAIL_BURST,
+        email_per_minute: float = settings.LOGIN_THROTTLE_EMAIL_PER_MINUTE,
+        ip_burst: int = settings.LOGIN_THROTTLE_IP_BURST,
+        ip_per_minute: float = settings.LOGIN_THROTTLE_IP_PER_MINUTE,
+        email_lockout_after: int = settings.LOGIN_THROTTLE_EMAIL_LOCKOUT_AFTER,
+        ip_lockout_after: int = settings.LOGIN_THROTTLE_IP_LOCKOUT_AFTER,
+        lockout_base_seconds: float = settings.LOGIN_THROTTLE_LOCKOUT_BASE_SECONDS,
+        lockout_max_seconds: float = settings.LOGIN_THROTTLE_LOCKOUT_MAX_SECONDS,
+        failure_window_seconds: float = settings.LOGIN_THROTTLE_FAILURE_WINDOW_SECONDS,
+        max_entries: int = settings.LOGIN_THROTTLE_MAX_ENTRIES,
+        storage_uri: str = settings.LOGIN_THROTTLE_STORAGE_URI,
+    ):
+        self.lockout_base_seconds = lockout_base_seconds
+        self.lockout_max_seconds = lockout_max_seconds
+        self.failure_window_seconds = failure_window_seconds
+        self._emails = _BucketTable(email_burst, email_per_minute / 60.0, email_lockout_after, max_entries)
+        self._ips = _BucketTable(ip_burst, ip_per_minute / 60.0, ip_lockout_after, max_entries)
+        self._lock = threading.Lock()
+        self._storage = None
+
+        if storage_uri:
+            from limits.storage import storage_from_string
+            self._storage = storage_from_string(storage_uri)
+
+    def lockout_seconds(self, failures: int, lockout_after: int) -> float:
+        """Lockout duration after `failures` consecutive failed attempts"""
+        if failures < lockout_after:
+            return 0.0
+        exponent = min(failures - lockout_after, 32)
+        return min(self.lockout_base_seconds * (2 ** exponent), self.lockout_max_seconds)
+
+    def check(self, email: str, ip: str) -> Optional[float]:
+        """
+        Admit or reject a login attempt
+        Returns: None if admitted, otherwise seconds until the caller may retry
+        """
+        email = email.lower()
+        now = time.monotonic()
+
+        with self._lock:
+            email_bucket = self._emails.get(email, now)
+            ip_bucket = self._ips.get(ip, now)
+
+            locked_until = max(email_bucket.locked_until, ip_bucket.locked_until)
+            if locked_until > now:
+                return locked_until - now
+
+            if email_bucket.tokens < 1.0 or ip_bucket.tokens < 1.0:
+                return max(
+                    self._time_to_token(email_bucket, self._emails),
+                    self._time_to_token(ip_bucket, self._ips),
+                )
+
+            email_bucket.tokens -= 1.0
+            ip_bucket.tokens -= 1.0
+
+        if self._storage is not None:
+            return self._check_shared(email, ip)
+
+        return None
+
+    def record_failure(self, email: str, ip: str) -> None:
+        """Register a failed login; may start or extend a lockout"""
+        email = email.lower()
+        now = time.monotonic()
+
+        with self._lock:
+            for key, table in ((email, self._emails), (ip, self._ips)):
+                bucket = table.get(key, now)
+                # Quiet for a full window (counted from the end of any lockout): earlier
+                # failures no longer count as consecutive
+                if now - max(bucket.last_failure, bucket.locked_until) >= self.failure_window_seconds:
+                    bucket.failures = 0
+                bucket.failures += 1
+                bucket.last_failure = now
+                duration = self.lockout_seconds(bucket.failures, table.lockout_after)
+                if duration:
+                    bucket.locked_until = now + duration
+
+        if self._storage is not None:
+            self._record_shared_failure(email, ip)
+
+    def record_success(self, email: str, ip: str) -> None:
+        """Clear failure state for the account and decay it for the IP after a successful login"""
+        email = email.lower()
+
+        with self._lock:
+            bucket = self._emails.peek(email)
+            if bucket is not None:
+                bucket.failures = 0
+                bucket.locked_until = 0.0
+            bucket = self._ips.peek(ip)
+            if bucket is not None:
+                # Halved rather than cleared: other users behind the address may still be failing
+                bucket.failures //= 2
+
+        if self._storage is not None:
+            try:
+                self._storage.clear(self._failure_key("email", email))
+                self._storage.clear(self._lock_key("email", email))
+            except Exception as e:
+                logger.warning("Login throttle storage error: %s", e)
+
+    @staticmethod
+    def _time_to_token(bucket: _Bucket, table: _BucketTable) -> float:
+        if bucket.tokens >= 1.0 or table.refill_per_second <= 0:
+            return 0.0
+        return (1.0 - bucket.tokens) / table.refill_per_second
+
+    @staticmethod
+    def _failure_key(kind: str, key: str) -> str:
+        return f"login-throttle/failures/{kind}/{key}"
+
+    @staticmethod
+    def _lock_key(kind: str, key: str) -> str:
+        return f"login-throttle/lock/{kind}/{key}"
+
+    def _check_shared(self, email: str, ip: str) -> Optional[float]:
+        try:
+            retry_after = 0.0
+            for kind, key in (("email", email), ("ip", ip)):
+                lock_key = self._lock_key(kind, key)
+                if self._storage.get(lock_key) > 0:
+                    retry_after = max(retry_after, self._storage.get_expiry(lock_key) - time.time())
+            return retry_after if retry_after > 0 else None
+        except Exception as e:
+            # Shared storage is an optimisation; never block logins on it
+            logger.warning("Login throttle storage error: %s", e)
+            return None
+
+    def _record_shared_failure(self, email: str, ip: str) -> None:
+        try:
+            for kind, key, table in (("email", email, self._emails), ("ip", ip, self._ips)):
+                # The shared count expires a window after its first failure
+                failures = self._storage.incr(
+                    self._failure_key(kind, key),
+                    max(int(self.failure_window_seconds), 1),
+                )
+                duration = self.lockout_seconds(failures, table.lockout_after)
+                if duration:
+                    lock_key = self._lock_key(kind, key)
+                    self._storage.clear(lock_key)
+                    self._storage.incr(lock_key, max(int(duration), 1))
+        except Exception as e:
+            logger.warning("Login throttle storage error: %s", e)
+
+    def reset(self) -> None:
+        """Drop all in-memory state"""
+        with self._lock:
+            self._emails._buckets.clear()
+            self._ips._buckets.clear()
+
+
+# Global throttle instance
+login_throttle = LoginThrottle()
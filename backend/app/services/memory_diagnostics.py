@@ -0,0 +1,229 @@
+"""
+Memory Diagnostics
+tracemalloc control with named snapshots and allocation diffs, plus the sizes of the
+process's long-lived caches, tables and pools; all per worker
+"""
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import List, Optional
+import gc
+import logging
+import os
+import resource
+import threading
+import tracemalloc
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Allocations made by tracemalloc and the import system are noise in every diff
+_NOISE_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def _rss_bytes() -> Optional[int]:
+    """Current resident set size (Linux), or None"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _location(traceback: tracemalloc.Traceback, group_by: str):
+    """file, file:line, or the list of file:line frames (most recent last)"""
+    if group_by == "traceback":
+        return [f"{frame.filename}:{frame.lineno}" for frame in traceback]
+    frame = traceback[0]
+    return frame.filename if group_by == "filename" else f"{frame.filename}:{frame.lineno}"
+
+
+class MemoryDiagnostics:
+    """
+    Named tracemalloc snapshots of this worker
+
+    Tracing is off until start() and costs CPU and memory while on. At most
+    MEMORY_MAX_SNAPSHOTS snapshots are kept; the oldest is dropped first.
+    """
+
+    def __init__(self, max_snapshots: int):
+        self.max_snapshots = max_snapshots
+        # name -> (summary, snapshot)
+        self._snapshots: "OrderedDict[str, tuple[dict, tracemalloc.Snapshot]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, frames: int) -> None:
+        if tracemalloc.is_tracing():
+            return
+        tracemalloc.start(frames)
+        logger.warning("tracemalloc started with %d frame(s) per allocation", frames)
+
+    def stop(self) -> None:
+        """Stop tracing; existing snapshots stay available for diffs"""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            logger.warning("tracemalloc stopped")
+
+    def take_snapshot(self, name: str) -> dict:
+        """Blocking (it walks every traced block): call from a worker thread"""
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running")
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces(_NOISE_FILTERS)
+        summary = {
+            "name": name,
+            "taken_at": datetime.now(timezone.utc).isoformat(),
+            "traceback_limit": snapshot.traceback_limit,
+            "traced_bytes": sum(trace.size for trace in snapshot.traces),
+            "blocks": len(snapshot.traces),
+        }
+        with self._lock:
+            self._snapshots.pop(name, None)
+            self._snapshots[name] = (summary, snapshot)
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return summary
+
+    def delete(self, name: str) -> bool:
+        with self._lock:
+            return self._snapshots.pop(name, None) is not None
+
+    def list(self) -> List[dict]:
+        with self._lock:
+            return [summary for summary, _ in self._snapshots.values()]
+
+    def diff(self, name: str, against: Optional[str] = None, group_by: str = "lineno",
+             limit: int = 25) -> Optional[dict]:
+        """
+        Top allocation growth from snapshot `name` to `against` (or to a snapshot taken now),
+        grouped by "lineno" (file and line), "filename" or "traceback"
+        Returns None when a named snapshot does not exist. Blocking: call from a worker thread.
+        """
+        with self._lock:
+            base = self._snapshots.get(name)
+            target = self._snapshots.get(against) if against is not None else None
+        if base is None or (against is not None and target is None):
+            return None
+        if target is None:
+            if not tracemalloc.is_tracing():
+                raise RuntimeError("tracemalloc is not running; name a second snapshot to compare against")
+            gc.collect()
+            target = ({}, tracemalloc.take_snapshot().filter_traces(_NOISE_FILTERS))
+
+        stats = target[1].compare_to(base[1], group_by)
+        return {
+            "from": name,
+            "to": against or "now",
+            "group_by": group_by,
+            "size_diff_bytes": sum(stat.size_diff for stat in stats),
+            "count_diff": sum(stat.count_diff for stat in stats),
+            "top": [
+                {
+                    "location": _location(stat.traceback, group_by),
+                    "size_diff_bytes": stat.size_diff,
+                    "size_bytes": stat.size,
+                    "count_diff": stat.count_diff,
+                    "count": stat.count,
+                }
+                for stat in stats[:limit]
+            ],
+        }
+
+    def status(self) -> dict:
+        tracing = tracemalloc.is_tracing()
+        traced, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            "pid": os.getpid(),
+            "rss_bytes": _rss_bytes(),
+            # ru_maxrss is in KiB on Linux
+            "max_rss_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+            "gc_counts": gc.get_count(),
+            "tracing": tracing,
+            "traceback_limit": tracemalloc.get_traceback_limit() if tracing else None,
+            "traced_bytes": traced,
+            "traced_peak_bytes": peak,
+            "tracemalloc_overhead_bytes": tracemalloc.get_tracemalloc_memory() if tracing else 0,
+            "snapshots": self.list(),
+        }
+
+
+def _compiled_cache(engine) -> Optional[dict]:
+    if engine is None or engine._compiled_cache is None:
+        return None
+    return {"entries": len(engine._compiled_cache), "capacity": engine._compiled_cache.capacity}
+
+
+def _rate_limit_storage(limiter) -> dict:
+    storage = limiter._storage
+    # limits' MemoryStorage keeps counters and moving-window events per key until they expire
+    return {
+        "storage": type(storage).__name__,
+        "counters": len(getattr(storage, "storage", ())),
+        "windows": len(getattr(storage, "events", ())),
+    }
+
+
+def component_sizes() -> dict:
+    """Entry counts of the worker's in-process caches, tables, pools and queues"""
+    # Imported here: the components live across the app, several of them beside routes
+    from app.api.v1.endpoints.registration import limiter
+    from app.db import database
+    from app.db.group_commit import group_commit_stats
+    from app.db.query_stats import query_stats
+    from app.middleware.admission import admission_stats
+    from app.middleware.idempotency import idempotency_stats
+    from app.services.channel_availability import channel_id_index
+    from app.services.login_throttle import login_throttle
+    from app.services.recaptcha import RecaptchaService
+    from app.services.registration_events import registration_events
+    from app.services.response_cache import cache_stats
+
+    recaptcha_client = RecaptchaService._client
+    pool = getattr(getattr(recaptcha_client, "_transport", None), "_pool", None)
+    return {
+        "response_caches": [
+            {"name": cache["name"], "entries": cache["entries"], "max_entries": cache["max_entries"]}
+            for cache in cache_stats()
+        ],
+        "login_throttle": {
+            "emails": len(login_throttle._emails),
+            "ips": len(login_throttle._ips),
+            "max_entries": login_throttle._emails.max_entries,
+        },
+        "idempotency": idempotency_stats(),
+        "recent_writes": {
+            "entries": len(database.recent_writes._entries),
+            "max_entries": database.recent_writes.max_entries,
+        },
+        "query_stats": {
+            "statements": len(query_stats._statements),
+            "routes": len(query_stats._routes),
+            "max_statements": query_stats.max_statements,
+        },
+        "rate_limits": _rate_limit_storage(limiter),
+        "recaptcha_client": {
+            "created": recaptcha_client is not None,
+            "connections": len(pool.connections) if pool is not None else 0,
+        },
+        "sqlalchemy_compiled_cache": {
+            "primary": _compiled_cache(database.async_engine.sync_engine),
+            "replica": _compiled_cache(database.replica_engine.sync_engine if database.replica_engine else None),
+            "sync": _compiled_cache(database._sync_engine),
+        },
+        "pools": database.pool_metrics(),
+        "group_commit": group_commit_stats(),
+        "admission": admission_stats(),
+        "channel_id_filter": {
+            "ids": channel_id_index.filter.count,
+            "size_bytes": len(channel_id_index.filter.bits),
+        },
+        "registration_events": registration_events.stats(),
+    }
+
+
+memory_diagnostics = MemoryDiagnostics(settings.MEMORY_MAX_SNAPSHOTS)
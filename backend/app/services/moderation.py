@@ -0,0 +1,134 @@
+"""
+Registration Moderation Service
+Bulk verification and activation changes, applied as chunked set-based UPDATEs
+(verification_notes is the column added by migration 007)
+"""
+from typing import List, Optional, Sequence
+import logging
+
+from fastapi import HTTPException, status
+from sqlalchemy import Integer, and_, any_, bindparam, or_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.deadline import DeadlineExceeded
+from app.models.channel import ChannelRegistration
+from app.schemas.channel import (
+    ChannelBulkModerationRequest, ChannelBulkModerationResponse, ChannelModerationFilter,
+)
+
+logger = logging.getLogger(__name__)
+
+# One statement text for every chunk (a single prepared statement on asyncpg), unlike IN (...)
+_ID_IS_IN_CHUNK = ChannelRegistration.id == any_(bindparam("ids", type_=ARRAY(Integer)))
+
+
+class RegistrationModerationService:
+    """Verify, annotate, activate and deactivate registrations in bulk"""
+
+    @staticmethod
+    def filter_criteria(criteria: ChannelModerationFilter) -> list:
+        """WHERE clauses for a moderation filter"""
+        clauses = []
+        if criteria.status == "pending":
+            # Same predicate as ix_channel_registrations_pending_created_at
+            clauses += [ChannelRegistration.is_active, ~ChannelRegistration.verified]
+        elif criteria.status == "active":
+            clauses.append(ChannelRegistration.is_active)
+        elif criteria.status == "inactive":
+            clauses.append(~ChannelRegistration.is_active)
+        if criteria.created_after is not None:
+            clauses.append(ChannelRegistration.created_at >= criteria.created_after)
+        if criteria.created_before is not None:
+            clauses.append(ChannelRegistration.created_at < criteria.created_before)
+        if criteria.client_payout_network is not None:
+            clauses.append(ChannelRegistration.client_payout_network == criteria.client_payout_network)
+        if criteria.client_payout_currency is not None:
+            clauses.append(ChannelRegistration.client_payout_currency == criteria.client_payout_currency)
+        return clauses
+
+    @staticmethod
+    async def select_ids(db: AsyncSession, criteria: ChannelModerationFilter, limit: int) -> List[int]:
+        """Ids matching a filter, oldest first; at most `limit` + 1 so callers can detect overflow"""
+        statement = (
+            select(ChannelRegistration.id)
+            .where(*RegistrationModerationService.filter_criteria(criteria))
+            .order_by(ChannelRegistration.created_at, ChannelRegistration.id)
+            .limit(limit + 1)
+        )
+        ids = list((await db.execute(statement)).scalars())
+        # End the read transaction before the updates start
+        await db.commit()
+        return ids
+
+    @staticmethod
+    def build_update(changes: dict, criteria: Optional[ChannelModerationFilter] = None):
+        """
+        UPDATE ... SET <changes> WHERE id = ANY(:ids) RETURNING id
+        Rows that already hold every new value are skipped, so they are neither locked nor
+        rewritten; with a filter, rows that stopped matching it since selection are skipped too
+        """
+        differs = [getattr(ChannelRegistration, field).is_distinct_from(value) for field, value in changes.items()]
+        clauses = [_ID_IS_IN_CHUNK, or_(*differs)]
+        if criteria is not None:
+            clauses += RegistrationModerationService.filter_criteria(criteria)
+        return (
+            update(ChannelRegistration)
+            .where(and_(*clauses))
+            .values(**changes)
+            .returning(ChannelRegistration.id)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def apply(db: AsyncSession, request: ChannelBulkModerationRequest) -> ChannelBulkModerationResponse:
+        """
+        Apply the changes in chunks of MODERATION_BATCH_SIZE ids, one short transaction each,
+        so row locks are held only for the duration of one chunk
+        """
+        limit = settings.MODERATION_MAX_SELECTION
+        if request.ids is not None:
+            # Order is irrelevant to the result; sorted ids lock rows in a consistent order
+            ids: Sequence[int] = sorted(set(request.ids))
+        else:
+            ids = await RegistrationModerationService.select_ids(db, request.filter, limit)
+        if len(ids) > limit:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Selection exceeds {limit} registrations; narrow the filter or split the ids"
+            )
+
+        changes = request.changes.model_dump(exclude_unset=True)
+        statement = RegistrationModerationService.build_update(changes, request.filter)
+        batch_size = settings.MODERATION_BATCH_SIZE
+        updated_ids: List[int] = []
+        batches = 0
+        for start in range(0, len(ids), batch_size):
+            chunk = list(ids[start:start + batch_size])
+            try:
+                result = await db.execute(statement, {"ids": chunk})
+                chunk_updated = list(result.scalars())
+                await db.commit()
+            except Exception as e:
+                await db.rollback()
+                # Earlier chunks are committed; repeating the request only touches the rest
+                detail = (f"Moderation stopped after {len(updated_ids)} of {len(ids)} registrations were "
+                          "updated. Retrying the same request applies the remainder.")
+                if isinstance(e, DeadlineExceeded):
+                    # The request budget ran out between chunks; nothing failed
+                    raise DeadlineExceeded(detail)
+                logger.error("Bulk moderation stopped after %d of %d registrations: %s",
+                             len(updated_ids), len(ids), e)
+                raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=detail)
+            updated_ids.extend(chunk_updated)
+            batches += 1
+
+        logger.info("Bulk moderation of %s: %d matched, %d updated in %d batches",
+                    ", ".join(changes), len(ids), len(updated_ids), batches)
+        return ChannelBulkModerationResponse(
+            matched=len(ids),
+            updated=len(updated_ids),
+            batches=batches,
+            updated_ids=updated_ids,
+        )
@@ -0,0 +1,89 @@
+"""
+Network Registry
+Single source of truth for supported networks: address validator, display names and payout currencies
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Callable, Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from app.services.validators import CryptoAddressValidator
+
+# Display names, shared by every network that carries the currency
+CURRENCY_NAMES: Mapping[str, str] = MappingProxyType({
+    "BTC": "Bitcoin",
+    "ETH": "Ethereum",
+    "USDT": "Tether USD",
+    "USDC": "USD Coin",
+    "DAI": "Dai Stablecoin",
+    "BNB": "BNB",
+    "BUSD": "Binance USD",
+    "MATIC": "Polygon",
+    "AVAX": "Avalanche",
+    "SOL": "Solana",
+    "TRX": "Tron",
+    "TON": "Toncoin",
+})
+
+
+@dataclass(frozen=True)
+class Network:
+    """A supported payout network"""
+    code: str
+    name: str
+    validate_address: Callable[[str], bool]
+    currencies: Tuple[str, ...]
+
+
+_evm = CryptoAddressValidator.validate_ethereum
+
+# Order is the order the API lists networks and currencies in
+_NETWORKS = (
+    Network("BTC", "Bitcoin", CryptoAddressValidator.validate_bitcoin, ("BTC",)),
+    Network("ETH", "Ethereum", _evm, ("ETH", "USDT", "USDC", "DAI")),
+    Network("BSC", "Binance Smart Chain", _evm, ("BNB", "USDT", "USDC", "BUSD")),
+    Network("POLYGON", "Polygon", _evm, ("MATIC", "USDT", "USDC")),
+    Network("ARBITRUM", "Arbitrum", _evm, ("ETH", "USDT", "USDC")),
+    Network("OPTIMISM", "Optimism", _evm, ("ETH", "USDT", "USDC")),
+    Network("AVALANCHE", "Avalanche C-Chain", _evm, ("AVAX", "USDT", "USDC")),
+    Network("BASE", "Base", _evm, ("ETH", "USDC")),
+    Network("LINEA", "Linea", _evm, ("ETH", "USDC")),
+    Network("SOL", "Solana", CryptoAddressValidator.validate_solana, ("SOL", "USDT", "USDC")),
+    Network("TRX", "Tron", CryptoAddressValidator.validate_tron, ("TRX", "USDT", "USDC")),
+    Network("TON", "The Open Network", CryptoAddressValidator.validate_ton, ("TON", "USDT")),
+)
+
+NETWORKS: Mapping[str, Network] = MappingProxyType({network.code: network for network in _NETWORKS})
+
+# (network_code, currency_code) pairs accepted for payouts
+SUPPORTED_PAIRS: FrozenSet[Tuple[str, str]] = frozenset(
+    (network.code, currency) for network in _NETWORKS for currency in network.currencies
+)
+
+# Flattened rows, in the shape of network_currency_mappings and NetworkCurrencyMappingSchema
+MAPPINGS: Tuple[Mapping[str, str], ...] = tuple(
+    MappingProxyType({
+        "network_code": network.code,
+        "network_name": network.name,
+        "currency_code": currency,
+        "currency_name": CURRENCY_NAMES[currency],
+    })
+    for network in _NETWORKS for currency in network.currencies
+)
+
+
+def get_network(code: str) -> Optional[Network]:
+    return NETWORKS.get(code.upper())
+
+
+def is_supported_pair(network_code: str, currency_code: str) -> bool:
+    """Whether `currency_code` can be paid out on `network_code` (codes already upper-cased)"""
+    return (network_code, currency_code) in SUPPORTED_PAIRS
+
+
+def network_list() -> List[Dict[str, str]]:
+    return [{"code": network.code, "name": network.name} for network in _NETWORKS]
+
+
+def currency_list() -> List[Dict[str, str]]:
+    currencies = dict.fromkeys(currency for network in _NETWORKS for currency in network.currencies)
+    return [{"code": code, "name": CURRENCY_NAMES[code]} for code in currencies]
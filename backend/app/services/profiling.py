@@ -0,0 +1,162 @@
+"""
+Request Profiling
+Captures per-request CPU profiles and stores them as files shared by all workers
+"""
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional
+import asyncio
+import cProfile
+import importlib.util
+import json
+import logging
+import os
+import re
+import time
+import uuid
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]+-[0-9]+-[0-9a-f]{8}$")
+
+FORMAT_EXTENSIONS = {"collapsed": ".collapsed", "pstats": ".pstats"}
+
+
+@dataclass
+class ProfileArtifact:
+    """Metadata for one stored profile; the data sits next to it in PROFILING_DIR"""
+    id: str
+    method: str
+    path: str
+    status_code: Optional[int]
+    duration_ms: float
+    created_at: float
+    format: str  # "collapsed" (pyinstrument, includes await time) or "pstats" (cProfile)
+    request_id: Optional[str] = None
+    # Other requests that ran on the worker meanwhile; a pstats profile includes their frames too
+    concurrent_requests: int = 0
+
+
+def new_profile_id() -> str:
+    return f"{int(time.time() * 1000)}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+def sampling_available() -> bool:
+    return importlib.util.find_spec("pyinstrument") is not None
+
+
+class RequestProfiler:
+    """
+    One profiling session around a request
+
+    Uses pyinstrument (statistical, attributes time spent in awaits to the awaiting
+    frame) when installed (requirements-profiling.txt) and PROFILER allows it, otherwise
+    cProfile (deterministic, CPU-bound functions only; time while suspended shows up in
+    the event loop). cProfile hooks the whole event-loop thread, so it also records any
+    other request the loop runs while the session is open.
+    """
+
+    def __init__(self):
+        self.format = "pstats"
+        self._profiler = None
+        if settings.PROFILER in ("auto", "sampling") and sampling_available():
+            from pyinstrument import Profiler
+            self.format = "collapsed"
+            self._profiler = Profiler(interval=settings.PROFILING_INTERVAL_MS / 1000.0, async_mode="enabled")
+        else:
+            self._profiler = cProfile.Profile()
+
+    @property
+    def captures_whole_thread(self) -> bool:
+        return self.format == "pstats"
+
+    def start(self) -> None:
+        if self.format == "collapsed":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self) -> None:
+        if self.format == "collapsed":
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+
+    def write(self, data_path: Path) -> None:
+        if self.format == "pstats":
+            self._profiler.dump_stats(str(data_path))
+            return
+        lines: List[str] = []
+        root = self._profiler.last_session.root_frame()
+        if root is not None:
+            _collapse(root, [], lines)
+        data_path.write_text("\n".join(lines) + "\n")
+
+
+def _collapse(frame, stack: List[str], lines: List[str]) -> None:
+    """Brendan Gregg's collapsed format: 'outer;inner;leaf <microseconds>' per line"""
+    if frame.is_synthetic:
+        label = frame.function  # [await], [self], ...
+    else:
+        label = f"{frame.function} ({frame.file_path_short}:{frame.line_no})"
+    stack = stack + [label]
+    child_time = 0.0
+    for child in frame.children:
+        child_time += child.time
+        _collapse(child, stack, lines)
+    own_time = frame.time - child_time
+    if own_time > 0:
+        lines.append(f"{';'.join(stack)} {int(own_time * 1_000_000)}")
+
+
+class ProfileStore:
+    """Profile artifacts in a directory; oldest files are pruned beyond PROFILING_MAX_ARTIFACTS"""
+
+    def __init__(self, directory: str, max_artifacts: int):
+        self.directory = Path(directory)
+        self.max_artifacts = max_artifacts
+
+    def data_path(self, artifact_id: str, fmt: str) -> Path:
+        return self.directory / f"{artifact_id}{FORMAT_EXTENSIONS[fmt]}"
+
+    def _save(self, artifact: ProfileArtifact, profiler: RequestProfiler) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profiler.write(self.data_path(artifact.id, artifact.format))
+        (self.directory / f"{artifact.id}.json").write_text(json.dumps(asdict(artifact)))
+        self._prune()
+
+    async def save(self, artifact: ProfileArtifact, profiler: RequestProfiler) -> None:
+        # Rendering and file I/O stay off the event loop
+        try:
+            await asyncio.to_thread(self._save, artifact, profiler)
+        except OSError as e:
+            logger.warning("Could not store profile %s: %s", artifact.id, e)
+
+    def _prune(self) -> None:
+        metadata = sorted(self.directory.glob("*.json"))
+        for meta_path in metadata[:max(0, len(metadata) - self.max_artifacts)]:
+            for extension in (".json", *FORMAT_EXTENSIONS.values()):
+                meta_path.with_suffix(extension).unlink(missing_ok=True)
+
+    def list(self) -> List[ProfileArtifact]:
+        artifacts = []
+        for meta_path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                artifacts.append(ProfileArtifact(**json.loads(meta_path.read_text())))
+            except (OSError, ValueError, TypeError):
+                continue  # pruned or half-written by another worker
+        return artifacts
+
+    def get(self, artifact_id: str) -> Optional[ProfileArtifact]:
+        if not PROFILE_ID_PATTERN.match(artifact_id):
+            return None
+        try:
+            return ProfileArtifact(**json.loads((self.directory / f"{artifact_id}.json").read_text()))
+        except (OSError, ValueError, TypeError):
+            return None
+
+
+# Global store instance
+profile_store = ProfileStore(settings.PROFILING_DIR, settings.PROFILING_MAX_ARTIFACTS)
@@ -1,57 +1,147 @@
 """
 Google reCAPTCHA v3 Integration
 """
-from typing import Optional
-import httpx
+from typing import TYPE_CHECKING, Optional
+import asyncio
+import re
+import time
 from app.core.config import settings
+from app.core.deadline import cap_timeout
+from app.services.circuit_breaker import CircuitBreaker
 import logging
 
+if TYPE_CHECKING:
+    import httpx
+
 logger = logging.getLogger(__name__)
 
+# reCAPTCHA tokens are URL-safe base64 text; anything else cannot verify
+TOKEN_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
 
 class RecaptchaService:
     """Service for verifying reCAPTCHA v3 tokens"""
 
-    VERIFY_URL = "https://www.google.com/recaptcha/api/siteverify"
+    VERIFY_URL = settings.RECAPTCHA_VERIFY_URL
+
+    # Shared across requests so connections to siteverify are reused
+    _client: Optional["httpx.AsyncClient"] = None
+
+    breaker = CircuitBreaker(
+        "recaptcha",
+        window=settings.RECAPTCHA_BREAKER_WINDOW,
+        min_calls=settings.RECAPTCHA_BREAKER_MIN_CALLS,
+        failure_rate_threshold=settings.RECAPTCHA_BREAKER_FAILURE_RATE,
+        slow_call_seconds=settings.RECAPTCHA_BREAKER_SLOW_CALL_SECONDS,
+        slow_call_rate_threshold=settings.RECAPTCHA_BREAKER_SLOW_CALL_RATE,
+        cooldown_seconds=settings.RECAPTCHA_BREAKER_COOLDOWN_SECONDS,
+    )
+
+    @staticmethod
+    def is_well_formed(token: str) -> bool:
+        """Structural pre-check; malformed tokens are rejected without a network call"""
+        return (
+            settings.RECAPTCHA_TOKEN_MIN_LENGTH <= len(token) <= settings.RECAPTCHA_TOKEN_MAX_LENGTH
+            and TOKEN_PATTERN.match(token) is not None
+        )
+
+    @classmethod
+    def _get_client(cls) -> "httpx.AsyncClient":
+        if cls._client is None:
+            # Imported on first verification: httpx and its transports are a large share
+            # of cold-start import time, and development runs without a secret never need it
+            import httpx
+            cls._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return cls._client
+
+    @classmethod
+    async def close(cls) -> None:
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
 
     @staticmethod
-    async def verify_token(token: str, remote_ip: Optional[str] = None) -> tuple[bool, float]:
+    def _unavailable(reason: str) -> tuple[bool, float]:
+        """Outcome when Google could not give an answer, per RECAPTCHA_FAILURE_POLICY"""
+        if settings.RECAPTCHA_FAILURE_POLICY == "open":
+            logger.warning("reCAPTCHA unavailable (%s); failing open", reason)
+            return True, 0.0
+        logger.warning("reCAPTCHA unavailable (%s); failing closed", reason)
+        return False, 0.0
+
+    @staticmethod
+    async def verify_token(token: str, remote_ip: Optional[str] = None,
+                           timeout: Optional[float] = None) -> tuple[bool, float]:
         """
         Verify reCAPTCHA token with Google
+        The wait is capped by RECAPTCHA_TIMEOUT_SECONDS, `timeout` and the time left
+        in the current request's deadline, whichever is smallest
         Returns: (is_valid, score)
         """
         if not settings.RECAPTCHA_SECRET_KEY:
             logger.warning("reCAPTCHA secret key not configured, skipping verification")
             return True, 1.0  # Allow in development
 
+        if not RecaptchaService.is_well_formed(token):
+            logger.warning("Malformed reCAPTCHA token rejected locally")
+            return False, 0.0
+
+        requested = settings.RECAPTCHA_TIMEOUT_SECONDS if timeout is None else min(timeout, settings.RECAPTCHA_TIMEOUT_SECONDS)
+        budget = cap_timeout(requested)
+        if budget <= 0:
+            # Our own overload, not Google's: the breaker is neither consulted nor told
+            return RecaptchaService._unavailable("request deadline exhausted")
+
+        breaker = RecaptchaService.breaker
+        if not breaker.allow():
+            return RecaptchaService._unavailable(f"circuit open, retry in {breaker.retry_after():.0f}s")
+
+        started = time.monotonic()
+        failed = True
+        # A timeout only counts against Google when it had the full configured wait
+        cut_short = False
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
+            response = await asyncio.wait_for(
+                RecaptchaService._get_client().post(
                     RecaptchaService.VERIFY_URL,
                     data={
                         'secret': settings.RECAPTCHA_SECRET_KEY,
                         'response': token,
                         'remoteip': remote_ip
                     },
-                    timeout=5.0
-                )
+                    timeout=budget
+                ),
+                timeout=budget
+            )
+            response.raise_for_status()
+            result = response.json()
+            failed = False
+
+        except asyncio.TimeoutError:
+            cut_short = budget < requested
+            return RecaptchaService._unavailable(f"no answer within {budget:.2f}s")
 
-                result = response.json()
+        except Exception as e:
+            logger.error("reCAPTCHA verification error: %s", e)
+            return RecaptchaService._unavailable(type(e).__name__)
 
-                if not result.get('success', False):
-                    logger.warning(f"reCAPTCHA verification failed: {result.get('error-codes', [])}")
-                    return False, 0.0
+        finally:
+            if cut_short:
+                breaker.release()
+            else:
+                breaker.record(failed, time.monotonic() - started)
 
-                score = result.get('score', 0.0)
-                logger.info(f"reCAPTCHA verification successful. Score: {score}")
+        # A definitive answer from Google, even a rejection, is a healthy upstream
+        if not result.get('success', False):
+            logger.warning("reCAPTCHA verification failed: %s", result.get('error-codes', []))
+            return False, 0.0
 
-                # Check against threshold
-                is_valid = score >= settings.RECAPTCHA_THRESHOLD
+        score = result.get('score', 0.0)
+        logger.info("reCAPTCHA verification successful. Score: %s", score)
 
-                return is_valid, score
+        # Check against threshold
+        is_valid = score >= settings.RECAPTCHA_THRESHOLD
 
-        except Exception as e:
-            logger.error(f"reCAPTCHA verification error: {e}")
-            # In case of error, you might want to fail closed (return False)
-            # or fail open (return True) depending on your security requirements
-            return False, 0.0  # Fail closed
+        return is_valid, score
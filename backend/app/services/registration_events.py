@@ -0,0 +1,152 @@
+"""
+Registration Events
+Fans out Postgres NOTIFYs on registration_events (migration 008) from one LISTEN connection
+per worker to in-process subscribers, each with a bounded buffer
+"""
+from typing import Optional, Set
+import asyncio
+import json
+import logging
+import random
+
+import asyncpg
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "registration_events"
+
+# Control events put in subscriber queues alongside registration payloads
+RECONNECTED = {"type": "stream.reconnected"}  # events may have been missed; clients should refetch
+CLOSED = {"type": "stream.closed"}  # server shutting down
+OVERFLOW = {"type": "stream.overflow"}  # this stream fell too far behind and was dropped
+
+
+def encode_event(event: dict) -> str:
+    """One Server-Sent Events message; the event type doubles as the SSE event name"""
+    return f"event: {event.get('type', 'message')}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+class Subscriber:
+    """One stream's queue; `overflowed` is set when it fell a full buffer behind and was dropped"""
+
+    def __init__(self, buffer_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.overflowed = False
+
+
+class RegistrationEventHub:
+    """
+    LISTEN connection plus the subscribers it feeds
+
+    The connection is opened with the first subscriber and kept until shutdown. If it
+    drops, it is reopened with backoff and subscribers receive a reconnected event.
+    A subscriber whose buffer is full is disconnected rather than slowing the others;
+    browsers reconnect on their own and refetch.
+    """
+
+    def __init__(self):
+        self.subscribers: Set[Subscriber] = set()
+        self.listening = False
+        self._task: Optional[asyncio.Task] = None
+        self._lost = asyncio.Event()
+        self.counters = {"notifications": 0, "delivered": 0, "dropped_subscribers": 0, "reconnects": 0}
+
+    def has_capacity(self) -> bool:
+        return len(self.subscribers) < settings.EVENTS_MAX_SUBSCRIBERS
+
+    def subscribe(self) -> Optional[Subscriber]:
+        """A new subscriber, or None when EVENTS_MAX_SUBSCRIBERS are already connected"""
+        if not self.has_capacity():
+            return None
+        subscriber = Subscriber(settings.EVENTS_SUBSCRIBER_BUFFER)
+        self.subscribers.add(subscriber)
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen_forever())
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.subscribers.discard(subscriber)
+
+    def publish(self, event: dict) -> None:
+        for subscriber in list(self.subscribers):
+            try:
+                subscriber.queue.put_nowait(event)
+                self.counters["delivered"] += 1
+            except asyncio.QueueFull:
+                subscriber.overflowed = True
+                self.subscribers.discard(subscriber)
+                self.counters["dropped_subscribers"] += 1
+                logger.warning("Dropped a registration event subscriber %d events behind",
+                               subscriber.queue.qsize())
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        self.counters["notifications"] += 1
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed %s payload: %.200s", CHANNEL, payload)
+            return
+        self.publish(event)
+
+    def _on_connection_lost(self, connection) -> None:
+        self._lost.set()
+
+    async def _listen_forever(self) -> None:
+        delay = 1.0
+        first = True
+        while True:
+            connection = None
+            try:
+                self._lost.clear()
+                connection = await asyncpg.connect(settings.database_url)
+                connection.add_termination_listener(self._on_connection_lost)
+                await connection.add_listener(CHANNEL, self._on_notification)
+                self.listening = True
+                if not first:
+                    self.counters["reconnects"] += 1
+                    self.publish(RECONNECTED)
+                logger.info("Listening on %s", CHANNEL)
+                first = False
+                delay = 1.0
+                while not self._lost.is_set():
+                    try:
+                        await asyncio.wait_for(self._lost.wait(), settings.EVENTS_HEARTBEAT_SECONDS)
+                    except asyncio.TimeoutError:
+                        # Notices half-open connections that never report termination
+                        await connection.execute("SELECT 1")
+                logger.warning("Registration event listener connection lost; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Registration event listener failed: %s; retrying in about %.0fs", e, delay)
+            finally:
+                self.listening = False
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+            await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+            delay = min(delay * 2, 30.0)
+
+    async def close(self) -> None:
+        """Shutdown: end every stream and close the LISTEN connection"""
+        self.publish(CLOSED)
+        self.subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "listening": self.listening,
+            "subscribers": len(self.subscribers),
+            "buffered": sum(subscriber.queue.qsize() for subscriber in self.subscribers),
+            **self.counters,
+        }
+
+
+registration_events = RegistrationEventHub()
@@ -0,0 +1,89 @@
+"""
+Registration Read Service
+Lookups, keyset-paged listings and exports of channel registrations, loaded as read-model rows
+"""
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.read_models import (
+    REGISTRATION_EXPORT, REGISTRATION_SUMMARY, RegistrationExportRow, RegistrationSummary,
+    fetch_row, fetch_rows, stream_rows,
+)
+from app.models.channel import ChannelRegistration
+
+
+class RegistrationReadService:
+    """Read-only access to channel registrations"""
+
+    @staticmethod
+    def encode_cursor(created_at: datetime, registration_id: int) -> str:
+        raw = json.dumps([created_at.isoformat(), registration_id], separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            created_at, registration_id = json.loads(raw)
+            return datetime.fromisoformat(created_at), int(registration_id)
+        except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
+    @staticmethod
+    async def get(db: AsyncSession, registration_id: int) -> Optional[RegistrationSummary]:
+        statement = REGISTRATION_SUMMARY.where(ChannelRegistration.id == registration_id)
+        return await fetch_row(db, statement, RegistrationSummary)
+
+    @staticmethod
+    def build_listing(listing_status: str, limit: int, after: Optional[Tuple[datetime, int]] = None):
+        """
+        One page of registrations in (created_at, id) order
+        "pending" runs oldest first on ix_channel_registrations_pending_created_at,
+        "active" and "all" newest first on ix_channel_registrations_created_at
+        """
+        key = tuple_(ChannelRegistration.created_at, ChannelRegistration.id)
+        statement = REGISTRATION_SUMMARY
+        if listing_status == "pending":
+            # Same predicate as the partial index, so the planner can use it
+            statement = statement.where(ChannelRegistration.is_active, ~ChannelRegistration.verified)
+            if after is not None:
+                statement = statement.where(key > tuple_(*after))
+            statement = statement.order_by(ChannelRegistration.created_at, ChannelRegistration.id)
+        else:
+            if listing_status == "active":
+                statement = statement.where(ChannelRegistration.is_active)
+            if after is not None:
+                statement = statement.where(key < tuple_(*after))
+            statement = statement.order_by(ChannelRegistration.created_at.desc(), ChannelRegistration.id.desc())
+        # One extra row tells whether there is a next page
+        return statement.limit(limit + 1)
+
+    @staticmethod
+    async def list_page(db: AsyncSession, listing_status: str = "pending", limit: int = 50,
+                        cursor: Optional[str] = None) -> Tuple[List[RegistrationSummary], Optional[str]]:
+        after = RegistrationReadService.decode_cursor(cursor) if cursor else None
+        statement = RegistrationReadService.build_listing(listing_status, limit, after)
+        rows = await fetch_rows(db, statement, RegistrationSummary)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = RegistrationReadService.encode_cursor(rows[-1].created_at, rows[-1].id)
+        return rows, next_cursor
+
+    @staticmethod
+    def export(db: AsyncSession, include_inactive: bool = False) -> AsyncIterator[RegistrationExportRow]:
+        """Every registration in id order, streamed from a server-side cursor"""
+        statement = REGISTRATION_EXPORT
+        if not include_inactive:
+            statement = statement.where(ChannelRegistration.is_active)
+        return stream_rows(db, statement.order_by(ChannelRegistration.id), RegistrationExportRow)
@@ -0,0 +1,313 @@
+"""
+Response Cache
+In-process cache for GET endpoints: LRU-bounded, per-entry TTL, single-flight loads
+and stale-while-revalidate
+"""
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+import asyncio
+import functools
+import inspect
+import logging
+import time
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_STATUS_HEADER = "X-Cache"
+
+# Per-response headers that are recomputed for every replay
+_SKIPPED_HEADERS = {"content-length", "content-type", "date", "set-cookie"}
+
+
+class CachedResponse:
+    """Serialized response body plus what is needed to rebuild the Response"""
+
+    __slots__ = ("body", "status_code", "media_type", "headers", "stored_at", "fresh_until", "stale_until")
+
+    def __init__(self, body: bytes, status_code: int, media_type: Optional[str], headers: Dict[str, str]):
+        self.body = body
+        self.status_code = status_code
+        self.media_type = media_type
+        self.headers = headers
+        self.stored_at = 0.0
+        self.fresh_until = 0.0
+        self.stale_until = 0.0
+
+    @classmethod
+    def from_result(cls, result) -> "CachedResponse":
+        if not isinstance(result, Response):
+            result = JSONResponse(content=jsonable_encoder(result))
+        headers = {k: v for k, v in result.headers.items() if k not in _SKIPPED_HEADERS}
+        return cls(bytes(result.body), result.status_code, result.media_type, headers)
+
+    @property
+    def cacheable(self) -> bool:
+        return 200 <= self.status_code < 300
+
+    def to_response(self, cache_status: str) -> Response:
+        headers = dict(self.headers)
+        headers[CACHE_STATUS_HEADER] = cache_status
+        return Response(content=self.body, status_code=self.status_code, media_type=self.media_type, headers=headers)
+
+
+class ResponseCache:
+    """
+    Named cache of serialized responses
+
+    - fresh for `ttl` seconds, then served stale for up to `stale_ttl` more seconds
+      while one background load refreshes it
+    - concurrent misses for the same key share one load (single-flight)
+    - at most `max_entries` entries, least recently used evicted first
+    - keys combine method, path, sorted query string and the `vary_headers` values
+
+    Background refreshes run after the triggering response was sent, so loaders used
+    with stale_ttl > 0 must not rely on request-scoped dependencies such as the
+    session from get_read_db; open their own session instead.
+    """
+
+    def __init__(self, name: str, ttl: float, stale_ttl: float = 0.0, max_entries: int = 256,
+                 vary_headers: Iterable[str] = ()):
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.vary_headers = tuple(h.lower() for h in vary_headers)
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refreshes: set = set()
+        self._invalidation_hooks: List[Callable[[Optional[str]], None]] = []
+        # Bumped by invalidate(); loads that started before it do not store their result
+        self._generation = 0
+        self.counters = {
+            "hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0,
+            "refreshes": 0, "evictions": 0, "invalidations": 0, "errors": 0,
+        }
+
+    def key_for(self, request: Request) -> str:
+        query = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+        key = f"{request.method}:{request.url.path}?{query}"
+        if self.vary_headers:
+            key += "|" + "|".join(request.headers.get(h, "") for h in self.vary_headers)
+        return key
+
+    async def get_or_load(self, key: str,
+                          loader: Callable[[], Awaitable[CachedResponse]]) -> Tuple[CachedResponse, str]:
+        """Return (entry, cache status) where status is HIT, STALE or MISS"""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if now < entry.fresh_until:
+                self._entries.move_to_end(key)
+                self.counters["hits"] += 1
+                return entry, "HIT"
+            if now < entry.stale_until:
+                self._entries.move_to_end(key)
+                self.counters["stale_hits"] += 1
+                if key not in self._inflight:
+                    task = asyncio.create_task(self._refresh(key, loader))
+                    self._refreshes.add(task)
+                    task.add_done_callback(self._refreshes.discard)
+                return entry, "STALE"
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.counters["coalesced"] += 1
+            while inflight is not None:
+                entry = await asyncio.shield(inflight)
+                if entry is not None:
+                    return entry, "MISS"
+                # The loading request was cancelled: the first waiter takes the load over with
+                # its own loader (and request-scoped dependencies), the rest wait for it
+                inflight = self._inflight.get(key)
+            return await self._load(key, loader), "MISS"
+
+        self.counters["misses"] += 1
+        return await self._load(key, loader), "MISS"
+
+    async def _load(self, key: str, loader: Callable[[], Awaitable[CachedResponse]]) -> CachedResponse:
+        # Resolves to the entry, or to None if this load was cancelled
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self._generation
+        try:
+            entry = await loader()
+        except asyncio.CancelledError:
+            # Not future.cancel(): that would fail every coalesced waiter whose client is
+            # still connected. None tells them to take over the load instead.
+            future.set_result(None)
+            raise
+        except Exception as e:
+            self.counters["errors"] += 1
+            future.set_exception(e)
+            # Waiters re-raise it; mark it retrieved so an unwaited future does not warn
+            future.exception()
+            raise
+        else:
+            if entry.cacheable and generation == self._generation:
+                self._store(key, entry)
+            future.set_result(entry)
+            return entry
+        finally:
+            self._inflight.pop(key, None)
+
+    async def _refresh(self, key: str, loader: Callable[[], Awaitable[CachedResponse]]) -> None:
+        self.counters["refreshes"] += 1
+        try:
+            await self._load(key, loader)
+        except Exception as e:
+            # Keep serving the stale entry until it expires
+            logger.warning("Background refresh of %s cache entry %s failed: %s", self.name, key, e)
+
+    def _store(self, key: str, entry: CachedResponse) -> None:
+        entry.stored_at = time.monotonic()
+        entry.fresh_until = entry.stored_at + self.ttl
+        entry.stale_until = entry.fresh_until + self.stale_ttl
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    def invalidate(self, prefix: Optional[str] = None) -> int:
+        """
+        Drop entries whose key starts with `prefix` (all entries when None)
+        Keys look like "GET:/api/v1/networks/list?"; returns the number dropped
+        """
+        self._generation += 1
+        if prefix is None:
+            dropped = len(self._entries)
+            self._entries.clear()
+        else:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                del self._entries[key]
+            dropped = len(keys)
+        self.counters["invalidations"] += dropped
+        for hook in self._invalidation_hooks:
+            hook(prefix)
+        return dropped
+
+    def on_invalidate(self, hook: Callable[[Optional[str]], None]) -> None:
+        """Register a callback run after every invalidate(), e.g. to notify other workers"""
+        self._invalidation_hooks.append(hook)
+
+    def stats(self) -> dict:
+        lookups = self.counters["hits"] + self.counters["stale_hits"] + self.counters["misses"] + self.counters["coalesced"]
+        served_from_cache = self.counters["hits"] + self.counters["stale_hits"]
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "stale_ttl": self.stale_ttl,
+            "hit_ratio": round(served_from_cache / lookups, 4) if lookups else None,
+            **self.counters,
+        }
+
+
+# All caches by name, for stats and invalidation
+_caches: Dict[str, ResponseCache] = {}
+
+
+def get_cache(name: str, ttl: float = 60.0, stale_ttl: float = 0.0, max_entries: int = 256,
+              vary_headers: Iterable[str] = ()) -> ResponseCache:
+    """Return the cache called `name`, creating it with these settings on first use"""
+    cache = _caches.get(name)
+    if cache is None:
+        cache = ResponseCache(name, ttl, stale_ttl, max_entries, vary_headers)
+        _caches[name] = cache
+    return cache
+
+
+def invalidate_caches(*names: str, prefix: Optional[str] = None) -> int:
+    """Invalidation hook for write paths: drop matching entries from the named caches"""
+    return sum(_caches[name].invalidate(prefix) for name in names if name in _caches)
+
+
+def cache_stats() -> List[dict]:
+    return [cache.stats() for cache in _caches.values()]
+
+
+def cached(name: str, ttl: float = 60.0, stale_ttl: float = 0.0, max_entries: int = 256,
+           vary_headers: Iterable[str] = ()):
+    """
+    Route decorator caching the handler's response
+
+    Place it below the @router.get(...) decorator. The handler's return value is
+    serialized once (Response bodies are kept as is, anything else is JSON encoded),
+    so response_model filtering does not apply to cached routes. Non-2xx responses
+    and exceptions are not cached.
+    """
+    cache = get_cache(name, ttl, stale_ttl, max_entries, vary_headers)
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        request_param = next(
+            (p.name for p in signature.parameters.values() if p.annotation is Request), None
+        )
+        injected = request_param is None
+        if injected:
+            # FastAPI injects parameters from the signature; ask it for the Request too
+            request_param = "_cache_request"
+            signature = signature.replace(parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(request_param, inspect.Parameter.KEYWORD_ONLY, annotation=Request),
+            ])
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            request = kwargs.pop(request_param) if injected else kwargs[request_param]
+            if not settings.RESPONSE_CACHE_ENABLED:
+                return await func(*args, **kwargs)
+
+            async def loader() -> CachedResponse:
+                return CachedResponse.from_result(await func(*args, **kwargs))
+
+            entry, cache_status = await cache.get_or_load(cache.key_for(request), loader)
+            return entry.to_response(cache_status)
+
+        wrapper.__signature__ = signature
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def cache_dependency(name: str, ttl: float = 60.0, stale_ttl: float = 0.0, max_entries: int = 256,
+                     vary_headers: Iterable[str] = ()):
+    """
+    Dependency form, for handlers that cache only part of their work:
+
+        async def handler(cache: RequestCache = Depends(cache_dependency("listings", ttl=30))):
+            return await cache.respond(lambda: build_listing())
+    """
+    cache = get_cache(name, ttl, stale_ttl, max_entries, vary_headers)
+
+    async def dependency(request: Request) -> "RequestCache":
+        return RequestCache(cache, request)
+
+    return dependency
+
+
+class RequestCache:
+    """A cache bound to the current request's key"""
+
+    def __init__(self, cache: ResponseCache, request: Request):
+        self.cache = cache
+        self.key = cache.key_for(request)
+
+    async def respond(self, produce: Callable[[], Awaitable[object]]) -> Response:
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return CachedResponse.from_result(await produce()).to_response("BYPASS")
+
+        async def loader() -> CachedResponse:
+            return CachedResponse.from_result(await produce())
+
+        entry, cache_status = await self.cache.get_or_load(self.key, loader)
+        return entry.to_response(cache_status)
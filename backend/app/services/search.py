@@ -0,0 +1,105 @@
+"""
+Channel Search Service
+Ranked full-text + trigram search over channel registrations with keyset paging
+"""
+from typing import List, Optional, Tuple
+import base64
+import binascii
+import json
+
+from fastapi import HTTPException, status
+from sqlalchemy import and_, cast, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.channel import ChannelRegistration
+from app.schemas.channel import ChannelSearchResponse, ChannelSearchResult
+
+
+class ChannelSearchService:
+    """Search channels by title and description"""
+
+    @staticmethod
+    def encode_cursor(rank: float, registration_id: int) -> str:
+        """Opaque cursor for the row after (rank, id) in result order"""
+        raw = json.dumps([rank, registration_id], separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[float, int]:
+        """Inverse of encode_cursor; raises 400 for anything it did not produce"""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            rank, registration_id = json.loads(raw)
+            return float(rank), int(registration_id)
+        except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
+    @staticmethod
+    def build_query(query: str, limit: int, after: Optional[Tuple[float, int]] = None,
+                    include_inactive: bool = False):
+        """
+        Build the search statement
+        Matches use the GIN indexes from migration 004: the tsvector index for words
+        and the trigram indexes for misspelled or partial titles
+        """
+        ts_query = func.websearch_to_tsquery(cast(literal("simple"), REGCONFIG), query)
+        rank = (
+            func.ts_rank_cd(ChannelRegistration.search_vector, ts_query)
+            + func.greatest(
+                func.similarity(ChannelRegistration.open_channel_title, query),
+                func.similarity(ChannelRegistration.closed_channel_title, query)
+            )
+        ).label("rank")
+
+        matches = select(
+            ChannelRegistration.id,
+            ChannelRegistration.open_channel_id,
+            ChannelRegistration.open_channel_title,
+            ChannelRegistration.closed_channel_id,
+            ChannelRegistration.closed_channel_title,
+            ChannelRegistration.created_at,
+            ChannelRegistration.is_active,
+            ChannelRegistration.verified,
+            rank
+        ).where(
+            or_(
+                ChannelRegistration.search_vector.op("@@")(ts_query),
+                ChannelRegistration.open_channel_title.op("%")(query),
+                ChannelRegistration.closed_channel_title.op("%")(query)
+            )
+        )
+        if not include_inactive:
+            matches = matches.where(ChannelRegistration.is_active.is_(True))
+        matches = matches.subquery("matches")
+
+        statement = select(matches)
+        if after is not None:
+            # Keyset: continue strictly after the last row of the previous page
+            after_rank, after_id = after
+            statement = statement.where(
+                or_(
+                    matches.c.rank < after_rank,
+                    and_(matches.c.rank == after_rank, matches.c.id < after_id)
+                )
+            )
+        # Fetch one extra row to know whether there is a next page
+        return statement.order_by(matches.c.rank.desc(), matches.c.id.desc()).limit(limit + 1)
+
+    @staticmethod
+    async def search(db: AsyncSession, query: str, limit: int = 20, cursor: Optional[str] = None,
+                     include_inactive: bool = False) -> ChannelSearchResponse:
+        """Return one page of ranked results"""
+        after = ChannelSearchService.decode_cursor(cursor) if cursor else None
+        statement = ChannelSearchService.build_query(query, limit, after, include_inactive)
+        rows = (await db.execute(statement)).mappings().all()
+
+        results: List[ChannelSearchResult] = [ChannelSearchResult.model_validate(dict(row)) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = results[-1]
+            next_cursor = ChannelSearchService.encode_cursor(last.rank, last.id)
+        return ChannelSearchResponse(results=results, next_cursor=next_cursor)
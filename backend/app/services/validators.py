@@ -2,10 +2,18 @@
 Cryptocurrency Address Validators
 Validates wallet addresses for different blockchain networks
 """
+from functools import lru_cache
 import re
 from typing import Optional
 
 
+@lru_cache(maxsize=None)
+def _networks():
+    """The network registry, imported on first use: it imports this module for the validators"""
+    from app.services.network_registry import NETWORKS
+    return NETWORKS
+
+
 class CryptoAddressValidator:
     """Validator for cryptocurrency addresses across different networks"""
 
@@ -80,31 +88,13 @@ class CryptoAddressValidator:
         Returns: (is_valid, error_message)
         """
         address = address.strip()
-
-        # Network to validator mapping
-        validators = {
-            'BTC': CryptoAddressValidator.validate_bitcoin,
-            'ETH': CryptoAddressValidator.validate_ethereum,
-            'BSC': CryptoAddressValidator.validate_ethereum,  # BSC uses Ethereum format
-            'POLYGON': CryptoAddressValidator.validate_ethereum,
-            'ARBITRUM': CryptoAddressValidator.validate_ethereum,
-            'OPTIMISM': CryptoAddressValidator.validate_ethereum,
-            'AVALANCHE': CryptoAddressValidator.validate_ethereum,
-            'BASE': CryptoAddressValidator.validate_ethereum,
-            'LINEA': CryptoAddressValidator.validate_ethereum,
-            'SOL': CryptoAddressValidator.validate_solana,
-            'TRX': CryptoAddressValidator.validate_tron,
-            'TON': CryptoAddressValidator.validate_ton,
-        }
-
         network_upper = network.upper()
 
-        if network_upper not in validators:
+        network_info = _networks().get(network_upper)
+        if network_info is None:
             return False, f"Unsupported network: {network}"
 
-        validator = validators[network_upper]
-
-        if not validator(address):
+        if not network_info.validate_address(address):
             return False, f"Invalid {network_upper} address format"
 
         return True, None
@@ -0,0 +1,45 @@
+"""
+Schema Validation Benchmarks
+Pydantic validation of ChannelRegistrationCreate and UserSignup request bodies
+"""
+import json
+
+from pydantic import ValidationError
+
+from app.schemas.auth import UserSignup
+from app.schemas.channel import ChannelRegistrationCreate
+from benchmarks import inputs
+from benchmarks.registry import register
+
+
+def _expect_invalid(model, payload: dict):
+    def run():
+        try:
+            model.model_validate(payload)
+        except ValidationError:
+            return
+        raise AssertionError(f"{model.__name__} accepted an invalid payload")
+    return run
+
+
+_CASES = [
+    ("channel_registration", ChannelRegistrationCreate, {
+        "typical": inputs.REGISTRATION_PAYLOAD,
+        "max_length": inputs.REGISTRATION_PAYLOAD_MAX,
+    }, inputs.REGISTRATION_PAYLOAD_INVALID),
+    ("user_signup", UserSignup, {
+        "typical": inputs.SIGNUP_PAYLOAD,
+        "max_length": inputs.SIGNUP_PAYLOAD_MAX,
+    }, inputs.SIGNUP_PAYLOAD_INVALID),
+]
+
+for _name, _model, _payloads, _invalid in _CASES:
+    for _variant, _payload in _payloads.items():
+        # From a dict (what FastAPI passes after JSON decoding)
+        register(f"schemas.{_name}.{_variant}.python",
+                 lambda model=_model, payload=_payload: model.model_validate(payload))
+        # Straight from the raw request body
+        _body = json.dumps(_payload)
+        register(f"schemas.{_name}.{_variant}.json",
+                 lambda model=_model, body=_body: model.model_validate_json(body))
+    register(f"schemas.{_name}.invalid", _expect_invalid(_model, _invalid))
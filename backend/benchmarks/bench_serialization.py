@@ -0,0 +1,98 @@
+"""
+Response Serialization Benchmarks
+FastAPI's response_model path versus direct model_dump_json for registration and auth responses
+"""
+from datetime import datetime, timezone
+from typing import List
+import json
+
+from fastapi import Response
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import model_json_response
+from app.models.channel import ChannelRegistration
+from app.models.user import User
+from app.schemas.auth import AuthResponse, UserResponse
+from app.schemas.channel import (
+    ChannelRegistrationResponse,
+    NetworkCurrencyMappingListAdapter,
+    NetworkCurrencyMappingSchema,
+)
+from app.services.network_registry import MAPPINGS
+from benchmarks import inputs
+from benchmarks.registry import register
+
+
+def _run(coro):
+    """Drive a coroutine that never actually suspends (serialize_response with is_coroutine=True)"""
+    try:
+        coro.send(None)
+    except StopIteration as e:
+        return e.value
+    raise RuntimeError("coroutine suspended")
+
+
+def _response_model_path(field, content) -> Response:
+    """What FastAPI does with a returned object when the route declares response_model"""
+    serialized = _run(serialize_response(field=field, response_content=content))
+    body = json.dumps(serialized, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"))
+    return Response(body.encode("utf-8"), media_type="application/json")
+
+
+_registration = ChannelRegistration(
+    id=12345,
+    **{k: v for k, v in inputs.REGISTRATION_PAYLOAD.items() if k != "captcha_token"},
+    created_at=datetime.now(timezone.utc),
+    is_active=True,
+    verified=False,
+)
+_registration_field = create_response_field("response", ChannelRegistrationResponse, mode="serialization")
+
+register(
+    "serialization.registration.response_model",
+    lambda: _response_model_path(_registration_field, _registration),
+)
+register(
+    "serialization.registration.direct",
+    lambda: model_json_response(ChannelRegistrationResponse.model_validate(_registration), status_code=201),
+)
+
+_user = User(
+    id=42,
+    email=inputs.SIGNUP_PAYLOAD["email"],
+    username=inputs.SIGNUP_PAYLOAD["username"].lower(),
+    password_hash="$2b$12$" + "x" * 53,
+    is_active=True,
+    is_verified=False,
+    created_at=datetime.now(timezone.utc),
+)
+_auth_field = create_response_field("response", AuthResponse, mode="serialization")
+
+
+def _auth_response() -> AuthResponse:
+    return AuthResponse(user=UserResponse.model_validate(_user), message="Login successful!", token=None)
+
+
+register(
+    "serialization.auth.response_model",
+    lambda: _response_model_path(_auth_field, _auth_response()),
+)
+register(
+    "serialization.auth.direct",
+    lambda: model_json_response(_auth_response()),
+)
+
+_mappings_field = create_response_field("response", List[NetworkCurrencyMappingSchema], mode="serialization")
+_mappings_json = NetworkCurrencyMappingListAdapter.dump_json(
+    NetworkCurrencyMappingListAdapter.validate_python(MAPPINGS)
+)
+
+register(
+    "serialization.network_mappings.response_model",
+    lambda: _response_model_path(_mappings_field, MAPPINGS),
+)
+register(
+    "serialization.network_mappings.precomputed",
+    lambda: Response(content=_mappings_json, media_type="application/json"),
+)
@@ -0,0 +1,47 @@
+"""
+Validator and Sanitizer Benchmarks
+Wallet address regexes per network, channel ID checks and sanitize_input
+"""
+from app.services.validators import CryptoAddressValidator, validate_channel_id, sanitize_input
+from benchmarks import inputs
+from benchmarks.registry import register
+
+
+def _register_addresses(kind: str, addresses: dict) -> None:
+    for key, address in addresses.items():
+        network = inputs.ADDRESS_NETWORKS[key]
+        register(
+            f"validators.address.{kind}.{key}",
+            lambda address=address, network=network: CryptoAddressValidator.validate_address(address, network),
+        )
+
+
+_register_addresses("valid", inputs.VALID_ADDRESSES)
+_register_addresses("adversarial", inputs.ADVERSARIAL_ADDRESSES)
+
+register(
+    "validators.address.unsupported_network",
+    lambda: CryptoAddressValidator.validate_address(inputs.VALID_ADDRESSES["ETH"], "DOGE"),
+)
+
+register("validators.channel_id.typical", lambda: validate_channel_id(inputs.CHANNEL_ID))
+register("validators.channel_id.max_length", lambda: validate_channel_id(inputs.CHANNEL_ID_MAX))
+register("validators.channel_id.invalid", lambda: validate_channel_id(inputs.CHANNEL_ID_INVALID))
+
+_SANITIZE_CASES = {
+    "title_typical": (inputs.TITLE_TYPICAL, 200),
+    "title_max": (inputs.TITLE_MAX, 200),
+    "description_typical": (inputs.DESCRIPTION_TYPICAL, 1000),
+    "description_max": (inputs.DESCRIPTION_MAX, 1000),
+    "description_markup": (inputs.DESCRIPTION_WITH_MARKUP, 1000),
+    "adversarial_script": (inputs.DESCRIPTION_ADVERSARIAL_SCRIPT, 1000),
+    "adversarial_iframe": (inputs.DESCRIPTION_ADVERSARIAL_IFRAME, 1000),
+    "adversarial_handler": (inputs.DESCRIPTION_ADVERSARIAL_HANDLER, 1000),
+}
+
+for _name, (_text, _max_length) in _SANITIZE_CASES.items():
+    register(
+        f"sanitize_input.{_name}",
+        lambda text=_text, max_length=_max_length: sanitize_input(text, max_length),
+        group="sanitize",
+    )
@@ -0,0 +1,193 @@
+"""
+Group Commit Benchmark
+Fires bursts of concurrent registration inserts at a scratch database, once with a transaction
+per registration and once through GroupCommitWriter, and reports throughput, commits and latency
+
+Run from the backend directory against a dedicated database (channel_registrations is truncated):
+    python -m benchmarks.group_commit --requests 5000 --concurrency 500
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.api.v1.endpoints.registration import REGISTRATION_RESPONSE_COLUMNS
+from app.db.group_commit import GroupCommitWriter
+from app.models.channel import ChannelRegistration
+from benchmarks.query_plans import migrate
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def registration_values(n: int) -> dict:
+    return {
+        "open_channel_id": f"-100{n}",
+        "open_channel_title": f"Burst Channel {n}",
+        "open_channel_description": "Campaign signup",
+        "closed_channel_id": f"-200{n}",
+        "closed_channel_title": f"Premium Burst {n}",
+        "closed_channel_description": "Members only",
+        "sub_1_price": 9.99,
+        "sub_1_time": 30,
+        "client_wallet_address": "0x" + f"{n:040x}",
+        "client_payout_currency": "USDT",
+        "client_payout_network": "ETH",
+    }
+
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def committed_transactions(engine) -> int:
+    async with engine.connect() as conn:
+        return await conn.scalar(text(
+            "SELECT xact_commit FROM pg_stat_database WHERE datname = current_database()"
+        ))
+
+
+async def run_mode(mode: str, engine, args) -> dict:
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    writer = None
+    if mode == "group":
+        writer = GroupCommitWriter(
+            ChannelRegistration, REGISTRATION_RESPONSE_COLUMNS, ("open_channel_id", "closed_channel_id"),
+            window_ms=args.window_ms, max_batch=args.max_batch, session_factory=session_factory
+        )
+
+    async with engine.begin() as conn:
+        await conn.execute(text("TRUNCATE channel_registrations RESTART IDENTITY"))
+
+    # Some submissions repeat an earlier channel ID, as retried form posts do
+    rng = random.Random(42)
+    ids = [rng.randrange(n) if n and rng.random() < args.duplicate_rate else n for n in range(args.requests)]
+    latencies, outcomes = [], {"created": 0, "conflict": 0, "error": 0}
+    gate = asyncio.Semaphore(args.concurrency)
+
+    async def register(n: int) -> None:
+        values = registration_values(n)
+        async with gate:
+            started = time.perf_counter()
+            try:
+                if writer is not None:
+                    created = await writer.insert(values)
+                else:
+                    async with session_factory() as session:
+                        result = await session.execute(
+                            pg_insert(ChannelRegistration).values(**values)
+                            .on_conflict_do_nothing().returning(*REGISTRATION_RESPONSE_COLUMNS)
+                        )
+                        created = result.mappings().one_or_none()
+                        await session.commit()
+                outcomes["created" if created is not None else "conflict"] += 1
+            except Exception:
+                outcomes["error"] += 1
+            latencies.append((time.perf_counter() - started) * 1000.0)
+
+    commits_before = await committed_transactions(engine)
+    started = time.perf_counter()
+    await asyncio.gather(*(register(n) for n in ids))
+    elapsed = time.perf_counter() - started
+    # The stats collector lags by up to PGSTAT_MIN_INTERVAL; give it a moment
+    await asyncio.sleep(1.0)
+    commits = await committed_transactions(engine) - commits_before
+
+    result = {
+        "mode": mode,
+        "elapsed_s": round(elapsed, 3),
+        "registrations_per_s": round(args.requests / elapsed, 1),
+        "commits": commits,
+        "commits_per_s": round(commits / elapsed, 1),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p95": round(percentile(latencies, 0.95), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+            "max": round(max(latencies), 2),
+            "mean": round(statistics.fmean(latencies), 2),
+        },
+        **outcomes,
+    }
+    if writer is not None:
+        result["writer"] = writer.stats()
+    return result
+
+
+async def run(args, url: str) -> list:
+    # Same pool shape as the application's primary engine
+    engine = create_async_engine(url, pool_size=args.pool_size, max_overflow=args.max_overflow)
+    try:
+        return [await run_mode(mode, engine, args) for mode in args.modes]
+    finally:
+        await engine.dispose()
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Transaction-per-request vs group-commit registration inserts")
+    parser.add_argument("--requests", type=int, default=5000, help="Registrations per mode")
+    parser.add_argument("--concurrency", type=int, default=500, help="Registrations in flight at once")
+    parser.add_argument("--duplicate-rate", type=float, default=0.02, help="Share of submissions reusing a channel ID")
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    parser.add_argument("--max-batch", type=int, default=100)
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--max-overflow", type=int, default=10)
+    parser.add_argument("--modes", nargs="+", choices=["single", "group"], default=["single", "group"])
+    parser.add_argument("--db-host", default=os.environ.get("DB_HOST", "localhost"))
+    parser.add_argument("--db-port", type=int, default=int(os.environ.get("DB_PORT", 5432)))
+    parser.add_argument("--db-name", default=os.environ.get("DB_NAME_EXPLAIN", "paygate_explain"))
+    parser.add_argument("--db-user", default=os.environ.get("DB_USER", "postgres"))
+    parser.add_argument("--db-password", default=os.environ.get("DB_PASSWORD", "devpassword123"))
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    env.update({
+        "DB_HOST": args.db_host,
+        "DB_PORT": str(args.db_port),
+        "DB_NAME": args.db_name,
+        "DB_USER": args.db_user,
+        "DB_PASSWORD": args.db_password,
+    })
+    migrate("head", env)
+
+    url = f"postgresql+asyncpg://{args.db_user}:{args.db_password}@{args.db_host}:{args.db_port}/{args.db_name}"
+    results = asyncio.run(run(args, url))
+
+    print(f"\n{args.requests} registrations, {args.concurrency} in flight, pool {args.pool_size}+{args.max_overflow}")
+    print(f"{'mode':8} {'regs/s':>9} {'commits':>8} {'commits/s':>10} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'max ms':>8} {'conflicts':>10} {'errors':>7}")
+    for result in results:
+        latency = result["latency_ms"]
+        print(f"{result['mode']:8} {result['registrations_per_s']:>9} {result['commits']:>8} "
+              f"{result['commits_per_s']:>10} {latency['p50']:>8} {latency['p99']:>8} {latency['max']:>8} "
+              f"{result['conflict']:>10} {result['error']:>7}")
+        if "writer" in result:
+            print(f"         {result['writer']['batches']} batches, "
+                  f"{result['writer']['rows_per_batch']} rows/batch, largest {result['writer']['largest_batch']}")
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "settings": {key: value for key, value in vars(args).items()
+                     if key not in ("db_password", "output")},
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"group_commit_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, default=str) + "\n")
+    print(f"\nReport written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
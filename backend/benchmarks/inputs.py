@@ -0,0 +1,123 @@
+"""
+Benchmark Inputs
+Representative and adversarial inputs for validators, sanitizers and schemas
+"""
+
+# Representative valid addresses, one per validator format
+VALID_ADDRESSES = {
+    "BTC": "1A1zP1eP5QGefi2DMPTfTL5SLmv7DivfNa",
+    "BTC_P2SH": "3J98t1WpEZ73CNmQviecrnyiWrnqRhWNLy",
+    "BTC_BECH32": "bc1qar0srrr7xfkvy5l643lydnw9re59gtzzwf5mdqxyzq",
+    "ETH": "0x742d35Cc6634C0532925a3b844Bc454e4438f44e",
+    "SOL": "7EcDhSYGxXyscszYEp35KHN8vvw3svAuLKTzXwCFLtV",
+    "TRX": "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t",
+    "TON": "EQDtFpEwcFAEcRe5mLVh2N6C0x-_hJEM7W61_JLnSF74p4q2",
+    "TON_RAW": "0:" + "a3" * 32,
+}
+
+# Addresses that fail late: the longest matching prefix before the mismatch
+ADVERSARIAL_ADDRESSES = {
+    "BTC": "1" + "A" * 33 + "0",
+    "BTC_BECH32": "bc1" + "q" * 86 + "O",
+    "ETH": "0x" + "a" * 39 + "g",
+    "SOL": "1" * 43 + "0",
+    "TRX": "T" + "a" * 32 + "!",
+    "TON": "EQ" + "A" * 45 + "+",
+    "TON_RAW": "0:" + "a" * 63 + "z",
+    # Length limit of client_wallet_address, no valid prefix for any network
+    "MAX_LENGTH": "z" * 110,
+}
+
+# validate_address network code for each address key
+ADDRESS_NETWORKS = {
+    "BTC": "BTC",
+    "BTC_P2SH": "BTC",
+    "BTC_BECH32": "BTC",
+    "ETH": "ETH",
+    "SOL": "SOL",
+    "TRX": "TRX",
+    "TON": "TON",
+    "TON_RAW": "TON",
+    "MAX_LENGTH": "ETH",
+}
+
+CHANNEL_ID = "-1001234567890"
+CHANNEL_ID_MAX = "-" + "9" * 49
+CHANNEL_ID_INVALID = "-" + "9" * 48 + "x"
+
+# Text fields: typical, at the schema max length, and built to stress the sanitizer regexes
+TITLE_TYPICAL = "Crypto Signals Premium"
+TITLE_MAX = ("Premium Trading Signals & Analysis " * 6)[:200]
+DESCRIPTION_TYPICAL = (
+    "Daily market analysis, entry and exit levels, and weekly live sessions "
+    "for members of our premium channel."
+)
+DESCRIPTION_MAX = ("Daily market analysis with entry and exit levels. " * 20)[:1000]
+# Unterminated tags force the lazy `.*?` scan to run to the end of the text for every opener
+DESCRIPTION_ADVERSARIAL_SCRIPT = ("<script>" * 125)[:1000]
+DESCRIPTION_ADVERSARIAL_IFRAME = ("<iframe " * 125)[:1000]
+# Many `on` prefixes followed by whitespace runs without `=`
+DESCRIPTION_ADVERSARIAL_HANDLER = ("onclick   " * 100)[:1000]
+DESCRIPTION_WITH_MARKUP = (
+    "Join us! <script>alert(1)</script> <iframe src=x></iframe> "
+    "javascript:void(0) <img onerror=alert(1)> " * 8
+)[:1000]
+
+REGISTRATION_PAYLOAD = {
+    "open_channel_id": CHANNEL_ID,
+    "open_channel_title": TITLE_TYPICAL,
+    "open_channel_description": DESCRIPTION_TYPICAL,
+    "closed_channel_id": "-1009876543210",
+    "closed_channel_title": TITLE_TYPICAL + " VIP",
+    "closed_channel_description": DESCRIPTION_TYPICAL,
+    "sub_1_price": 9.99,
+    "sub_1_time": 30,
+    "sub_2_price": 24.99,
+    "sub_2_time": 90,
+    "client_wallet_address": VALID_ADDRESSES["ETH"],
+    "client_payout_currency": "usdt",
+    "client_payout_network": "eth",
+    "captcha_token": "03AGdBq24" + "x" * 400,
+}
+
+REGISTRATION_PAYLOAD_MAX = {
+    **REGISTRATION_PAYLOAD,
+    "open_channel_id": CHANNEL_ID_MAX,
+    "open_channel_title": TITLE_MAX,
+    "open_channel_description": DESCRIPTION_MAX,
+    "closed_channel_id": "-" + "8" * 49,
+    "closed_channel_title": TITLE_MAX,
+    "closed_channel_description": DESCRIPTION_MAX,
+    "sub_3_price": 99.99,
+    "sub_3_time": 365,
+    "client_wallet_address": VALID_ADDRESSES["BTC_BECH32"],
+    "client_payout_network": "btc",
+    "client_payout_currency": "btc",
+}
+
+REGISTRATION_PAYLOAD_INVALID = {
+    **REGISTRATION_PAYLOAD,
+    "open_channel_id": CHANNEL_ID_INVALID,
+    "closed_channel_id": "1009876543210",
+}
+
+SIGNUP_PAYLOAD = {
+    "email": "channel.owner@example.com",
+    "username": "Channel_Owner-42",
+    "password": "correct-horse-battery",
+    "confirm_password": "correct-horse-battery",
+}
+
+SIGNUP_PAYLOAD_MAX = {
+    "email": ("a" * 64) + "@" + ("b" * 60) + ".example.com",
+    "username": "u" * 30,
+    "password": "p" * 100,
+    "confirm_password": "p" * 100,
+}
+
+SIGNUP_PAYLOAD_INVALID = {
+    "email": "not-an-email",
+    "username": "bad name!" * 3,
+    "password": "short",
+    "confirm_password": "short",
+}
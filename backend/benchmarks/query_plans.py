@@ -0,0 +1,259 @@
+"""
+Query Plan Report
+Seeds a scratch database, runs EXPLAIN (ANALYZE, BUFFERS) for the application's query shapes
+and reports the plans, timings, buffer usage and index sizes
+
+Run from the backend directory against a dedicated database (its tables are truncated):
+    python -m benchmarks.query_plans --revision 004 --output before.json
+    python -m benchmarks.query_plans --revision head --compare before.json
+"""
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from sqlalchemy import create_engine, text
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+SEED_REGISTRATIONS = """
+    INSERT INTO channel_registrations (
+        open_channel_id, open_channel_title, open_channel_description,
+        closed_channel_id, closed_channel_title, closed_channel_description,
+        sub_1_price, sub_1_time, client_wallet_address, client_payout_currency, client_payout_network,
+        is_active, verified, created_at
+    )
+    SELECT
+        '-100' || g,
+        (ARRAY['Crypto', 'Signals', 'Trading', 'Alpha', 'DeFi', 'News'])[1 + g % 6] || ' Channel ' || g,
+        'Daily market notes and trade ideas #' || g,
+        '-200' || g,
+        'Premium ' || (ARRAY['Crypto', 'Signals', 'Trading', 'Alpha', 'DeFi', 'News'])[1 + g % 6] || ' ' || g,
+        'Members-only analysis #' || g,
+        9.99, 30, '0x' || md5(g::text) || '00000000', 'USDT', 'ETH',
+        g % 20 <> 0,   -- 95% active
+        g % 10 <> 0,   -- 90% verified
+        now() - make_interval(secs => g * 30)
+    FROM generate_series(1, :rows) AS g
+"""
+
+SEED_USERS = """
+    INSERT INTO users (email, username, password_hash, is_active, is_verified)
+    SELECT 'user' || g || '@example.com', 'user' || g, 'x', true, g % 2 = 0
+    FROM generate_series(1, :rows) AS g
+"""
+
+# Query shapes issued by the API, with representative parameters
+QUERIES = {
+    "registration.by_id": (
+        "SELECT * FROM channel_registrations WHERE id = :id",
+        {"id": 12345},
+    ),
+    "registration.pending_review": (
+        "SELECT id, open_channel_title, created_at FROM channel_registrations "
+        "WHERE is_active AND NOT verified ORDER BY created_at LIMIT 50",
+        {},
+    ),
+    "registration.active_newest": (
+        "SELECT id, open_channel_title, created_at FROM channel_registrations "
+        "WHERE is_active ORDER BY created_at DESC LIMIT 50",
+        {},
+    ),
+    "registration.count_active": (
+        "SELECT count(*) FROM channel_registrations WHERE is_active",
+        {},
+    ),
+    "mappings.active_by_network": (
+        "SELECT currency_code, currency_name FROM network_currency_mappings "
+        "WHERE network_code = :network AND is_active",
+        {"network": "ETH"},
+    ),
+    "users.login_lookup": (
+        "SELECT * FROM users WHERE email = :email",
+        {"email": "user4242@example.com"},
+    ),
+}
+
+INDEX_SIZES = """
+    SELECT indexrelname AS index, pg_relation_size(indexrelid) AS bytes
+    FROM pg_stat_user_indexes
+    WHERE relname IN ('channel_registrations', 'network_currency_mappings', 'users')
+    ORDER BY relname, indexrelname
+"""
+
+
+def _alembic(env: dict, *args: str) -> str:
+    """Run an alembic command; its stdout, or SystemExit with its stderr when it fails"""
+    completed = subprocess.run(
+        [sys.executable, "-m", "alembic", *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise SystemExit(f"alembic {' '.join(args)} failed:\n{completed.stderr.strip()}")
+    return completed.stdout
+
+
+def migrate(revision: str, env: dict) -> None:
+    """Bring the schema to `revision`: downgrade if it is behind the database's current revision, else upgrade"""
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+    from alembic.util import CommandError
+
+    script = ScriptDirectory.from_config(Config(str(BACKEND_DIR / "alembic.ini")))
+    try:
+        target = script.get_revision(revision)
+    except CommandError as e:
+        raise SystemExit(f"Unknown revision {revision!r}: {e}")
+    # `alembic current` prints e.g. "005" or "009 (head)"; nothing for an empty database
+    lines = _alembic(env, "current").split()
+    current = lines[0] if lines else None
+    if current is not None and target is not None and target.revision != current:
+        behind = {rev.revision for rev in script.iterate_revisions(current, "base")}
+        if target.revision in behind:
+            _alembic(env, "downgrade", target.revision)
+            return
+    _alembic(env, "upgrade", revision)
+
+
+def seed(engine, rows: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("TRUNCATE channel_registrations, users RESTART IDENTITY"))
+        conn.execute(text(SEED_REGISTRATIONS), {"rows": rows})
+        conn.execute(text(SEED_USERS), {"rows": max(1, rows // 10)})
+    # VACUUM cannot run inside a transaction; it also sets the visibility map for index-only scans
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("VACUUM ANALYZE channel_registrations"))
+        conn.execute(text("VACUUM ANALYZE network_currency_mappings"))
+        conn.execute(text("VACUUM ANALYZE users"))
+
+
+def _walk(node: dict, nodes: list, indexes: set) -> None:
+    nodes.append(node["Node Type"])
+    if "Index Name" in node:
+        indexes.add(node["Index Name"])
+    for child in node.get("Plans", []):
+        _walk(child, nodes, indexes)
+
+
+def explain(conn, sql: str, params: dict, repeats: int) -> dict:
+    """Run EXPLAIN (ANALYZE, BUFFERS) `repeats` times; report the median timings and the last plan"""
+    execution, planning = [], []
+    plan = None
+    for _ in range(repeats):
+        result = conn.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), params).scalar()
+        plan = result[0]
+        execution.append(plan["Execution Time"])
+        planning.append(plan["Planning Time"])
+
+    nodes, indexes = [], set()
+    _walk(plan["Plan"], nodes, indexes)
+    return {
+        "execution_ms": round(statistics.median(execution), 3),
+        "planning_ms": round(statistics.median(planning), 3),
+        "shared_hit_blocks": plan["Plan"].get("Shared Hit Blocks", 0),
+        "shared_read_blocks": plan["Plan"].get("Shared Read Blocks", 0),
+        "rows": plan["Plan"].get("Actual Rows"),
+        "nodes": nodes,
+        "indexes": sorted(indexes),
+    }
+
+
+def compare(current: dict, baseline_path: Path) -> None:
+    """Print per-query execution time and buffer deltas against an earlier report"""
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\nComparison against {baseline_path.name} (revision {baseline.get('revision')})")
+    print(f"{'query':34} {'execution ms':>30} {'shared blocks':>22}")
+    for name, stats in current["queries"].items():
+        old = baseline.get("queries", {}).get(name)
+        if not old:
+            continue
+        change = ""
+        if old["execution_ms"]:
+            change = f"{(stats['execution_ms'] - old['execution_ms']) / old['execution_ms'] * 100:+7.1f}%"
+        old_blocks = old["shared_hit_blocks"] + old["shared_read_blocks"]
+        new_blocks = stats["shared_hit_blocks"] + stats["shared_read_blocks"]
+        print(f"{name:34} {old['execution_ms']:>9} -> {stats['execution_ms']:<9} {change:>8} "
+              f"{old_blocks:>9} -> {new_blocks:<9}")
+
+    old_total = sum(baseline.get("index_bytes", {}).values())
+    new_total = sum(current["index_bytes"].values())
+    print(f"\nTotal index size: {old_total / 1024 / 1024:.1f} MiB -> {new_total / 1024 / 1024:.1f} MiB")
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="EXPLAIN (ANALYZE, BUFFERS) report over seeded data")
+    parser.add_argument("--revision", default="head", help="Alembic revision to migrate the database to first")
+    parser.add_argument("--rows", type=int, default=200_000, help="Channel registrations to seed")
+    parser.add_argument("--repeats", type=int, default=5, help="EXPLAIN ANALYZE runs per query (median reported)")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse the data already in the database")
+    parser.add_argument("--db-host", default=os.environ.get("DB_HOST", "localhost"))
+    parser.add_argument("--db-port", type=int, default=int(os.environ.get("DB_PORT", 5432)))
+    parser.add_argument("--db-name", default=os.environ.get("DB_NAME_EXPLAIN", "paygate_explain"))
+    parser.add_argument("--db-user", default=os.environ.get("DB_USER", "postgres"))
+    parser.add_argument("--db-password", default=os.environ.get("DB_PASSWORD", "devpassword123"))
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier report to compare against")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    env.update({
+        "DB_HOST": args.db_host,
+        "DB_PORT": str(args.db_port),
+        "DB_NAME": args.db_name,
+        "DB_USER": args.db_user,
+        "DB_PASSWORD": args.db_password,
+    })
+    migrate(args.revision, env)
+
+    engine = create_engine(
+        f"postgresql://{args.db_user}:{args.db_password}@{args.db_host}:{args.db_port}/{args.db_name}"
+    )
+    try:
+        if not args.skip_seed:
+            print(f"Seeding {args.rows} registrations into {args.db_name}...")
+            seed(engine, args.rows)
+
+        with engine.connect() as conn:
+            revision = conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+            queries = {}
+            print(f"\n{'query':34} {'exec ms':>9} {'plan ms':>8} {'blocks':>8}  plan")
+            for name, (sql, params) in QUERIES.items():
+                stats = explain(conn, sql, params, args.repeats)
+                queries[name] = stats
+                blocks = stats["shared_hit_blocks"] + stats["shared_read_blocks"]
+                plan = " > ".join(stats["nodes"])
+                if stats["indexes"]:
+                    plan += f" [{', '.join(stats['indexes'])}]"
+                print(f"{name:34} {stats['execution_ms']:>9} {stats['planning_ms']:>8} {blocks:>8}  {plan}")
+            index_bytes = {row.index: row.bytes for row in conn.execute(text(INDEX_SIZES))}
+    finally:
+        engine.dispose()
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "revision": revision,
+        "rows": args.rows,
+        "queries": queries,
+        "index_bytes": index_bytes,
+    }
+    print("\nIndexes:")
+    for index, size in index_bytes.items():
+        print(f"  {index:56} {size / 1024:>10.0f} KiB")
+
+    if args.compare:
+        compare(report, args.compare)
+
+    output = args.output or RESULTS_DIR / f"plans_{revision}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nReport written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+"""
+Read Model Benchmark
+Loads N channel registrations three ways and reports rows/sec and retained memory per 100k rows:
+full ORM instances, Core Row objects of the projected columns, and read-model named tuples
+
+    python -m benchmarks.read_models --backend sqlite               # in-memory, Python-side cost only
+    python -m benchmarks.read_models --backend postgres --rows 200000
+
+The postgres backend seeds the scratch database used by query_plans.py (its tables are truncated).
+"""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Optional
+import argparse
+import gc
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import Column, MetaData, Table, create_engine, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.db.read_models import REGISTRATION_SUMMARY, RegistrationSummary
+from app.models.channel import ChannelRegistration
+from benchmarks.query_plans import migrate, seed
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def create_sqlite_engine(rows: int):
+    """In-memory table with the registration columns (no Postgres-only search vector)"""
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    table = Table("channel_registrations", metadata, *[
+        Column(column.name, column.type, primary_key=column.primary_key)
+        for column in ChannelRegistration.__table__.columns if column.name != "search_vector"
+    ])
+    metadata.create_all(engine)
+    now = datetime.now(timezone.utc)
+    with engine.begin() as conn:
+        conn.execute(insert(table), [
+            {
+                "id": n,
+                "open_channel_id": f"-100{n}",
+                "open_channel_title": f"Signals Channel {n}",
+                "open_channel_description": f"Daily market notes and trade ideas #{n}",
+                "closed_channel_id": f"-200{n}",
+                "closed_channel_title": f"Premium Signals {n}",
+                "closed_channel_description": f"Members-only analysis #{n}",
+                "sub_1_price": 9.99,
+                "sub_1_time": 30,
+                "client_wallet_address": "0x" + f"{n:040x}",
+                "client_payout_currency": "USDT",
+                "client_payout_network": "ETH",
+                "created_at": now - timedelta(seconds=30 * n),
+                "is_active": n % 20 != 0,
+                "verified": n % 10 != 0,
+            }
+            for n in range(1, rows + 1)
+        ])
+    return engine
+
+
+def load_orm(engine) -> list:
+    with Session(engine) as session:
+        rows = session.execute(select(ChannelRegistration)).scalars().all()
+        # Instances stay referenced by the caller after the session closes
+        session.expunge_all()
+    return rows
+
+
+def load_core_rows(engine) -> list:
+    with engine.connect() as conn:
+        return conn.execute(REGISTRATION_SUMMARY).all()
+
+
+def load_read_models(engine) -> list:
+    with engine.connect() as conn:
+        return [RegistrationSummary._make(row) for row in conn.execute(REGISTRATION_SUMMARY).tuples()]
+
+
+LOADERS = {
+    "orm": load_orm,
+    "core_rows": load_core_rows,
+    "read_model": load_read_models,
+}
+
+
+def measure(loader: Callable, engine, repeats: int) -> dict:
+    timings = []
+    count = 0
+    for _ in range(repeats):
+        gc.collect()
+        started = time.perf_counter()
+        rows = loader(engine)
+        timings.append(time.perf_counter() - started)
+        count = len(rows)
+        del rows
+
+    # Memory retained by the loaded rows (allocations still alive after loading)
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    rows = loader(engine)
+    gc.collect()
+    retained = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, "filename"))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+
+    best = min(timings)
+    return {
+        "rows": count,
+        "best_s": round(best, 4),
+        "median_s": round(statistics.median(timings), 4),
+        "rows_per_s": round(count / best),
+        "retained_mib_per_100k": round(retained / count * 100_000 / 2**20, 2) if count else None,
+        "peak_mib_per_100k": round(peak / count * 100_000 / 2**20, 2) if count else None,
+    }
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="ORM instances vs read-model rows: throughput and memory")
+    parser.add_argument("--backend", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeats", type=int, default=3, help="Timed loads per mode (best reported)")
+    parser.add_argument("--modes", nargs="+", choices=list(LOADERS), default=list(LOADERS))
+    parser.add_argument("--db-host", default=os.environ.get("DB_HOST", "localhost"))
+    parser.add_argument("--db-port", type=int, default=int(os.environ.get("DB_PORT", 5432)))
+    parser.add_argument("--db-name", default=os.environ.get("DB_NAME_EXPLAIN", "paygate_explain"))
+    parser.add_argument("--db-user", default=os.environ.get("DB_USER", "postgres"))
+    parser.add_argument("--db-password", default=os.environ.get("DB_PASSWORD", "devpassword123"))
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    if args.backend == "sqlite":
+        engine = create_sqlite_engine(args.rows)
+    else:
+        env = dict(os.environ)
+        env.update({
+            "DB_HOST": args.db_host,
+            "DB_PORT": str(args.db_port),
+            "DB_NAME": args.db_name,
+            "DB_USER": args.db_user,
+            "DB_PASSWORD": args.db_password,
+        })
+        migrate("head", env)
+        engine = create_engine(
+            f"postgresql://{args.db_user}:{args.db_password}@{args.db_host}:{args.db_port}/{args.db_name}"
+        )
+        seed(engine, args.rows)
+        with engine.connect() as conn:
+            count = conn.execute(text("SELECT count(*) FROM channel_registrations")).scalar()
+        print(f"Seeded {count} registrations into {args.db_name}")
+
+    results = {}
+    try:
+        print(f"\n{'mode':12} {'rows':>8} {'best s':>8} {'rows/s':>10} {'MiB/100k kept':>14} {'MiB/100k peak':>14}")
+        for mode in args.modes:
+            stats = measure(LOADERS[mode], engine, args.repeats)
+            results[mode] = stats
+            print(f"{mode:12} {stats['rows']:>8} {stats['best_s']:>8} {stats['rows_per_s']:>10} "
+                  f"{stats['retained_mib_per_100k']:>14} {stats['peak_mib_per_100k']:>14}")
+    finally:
+        engine.dispose()
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "backend": args.backend,
+        "rows": args.rows,
+        "python": sys.version.split()[0],
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"read_models_{args.backend}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nReport written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""
+Benchmark Registry
+Decorator and table used by the bench_* modules to register hot-path cases
+"""
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass
+class Benchmark:
+    """A registered benchmark: `func` is called with no arguments once per loop"""
+    name: str
+    func: Callable[[], object]
+    group: str
+
+
+REGISTRY: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, group: str = "") -> Callable:
+    """Register a zero-argument callable as a benchmark"""
+    def decorator(func: Callable[[], object]) -> Callable[[], object]:
+        if name in REGISTRY:
+            raise ValueError(f"Duplicate benchmark name: {name}")
+        REGISTRY[name] = Benchmark(name, func, group or func.__module__.rsplit(".", 1)[-1].removeprefix("bench_"))
+        return func
+    return decorator
+
+
+def register(name: str, func: Callable[[], object], group: str = "") -> None:
+    """Register a benchmark without the decorator (for generated cases)"""
+    benchmark(name, group)(func)
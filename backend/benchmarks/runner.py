@@ -0,0 +1,174 @@
+"""
+Microbenchmark Runner
+Times registered hot functions with calibrated loops and compares against stored baselines
+
+Run from the backend directory:
+    python -m benchmarks.runner                      # run all, compare with default baseline
+    python -m benchmarks.runner --filter validators  # subset by name substring
+    python -m benchmarks.runner --save-baseline      # record a new baseline
+"""
+from pathlib import Path
+from typing import Callable, Optional
+import argparse
+import gc
+import importlib
+import json
+import platform
+import statistics
+import sys
+import time
+
+from benchmarks.registry import REGISTRY, Benchmark
+
+BENCHMARK_MODULES = [
+    "benchmarks.bench_validators",
+    "benchmarks.bench_schemas",
+    "benchmarks.bench_serialization",
+]
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+DEFAULT_BASELINE = BASELINE_DIR / "micro.json"
+
+
+def _time_loops(func: Callable[[], object], loops: int) -> int:
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter_ns()
+        for _ in range(loops):
+            func()
+        return time.perf_counter_ns() - start
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def calibrate(func: Callable[[], object], target_ns: int) -> int:
+    """Find a loop count whose total runtime is at least `target_ns`"""
+    loops = 1
+    while True:
+        elapsed = _time_loops(func, loops)
+        if elapsed >= target_ns or loops >= 10_000_000:
+            return loops
+        # Grow geometrically but aim close to the target on the next attempt
+        loops = max(loops * 2, int(loops * target_ns / max(elapsed, 1) * 1.1))
+
+
+def measure(bench: Benchmark, repeats: int, target_ms: float) -> dict:
+    """Return per-call timing statistics in nanoseconds"""
+    loops = calibrate(bench.func, int(target_ms * 1_000_000))
+    _time_loops(bench.func, loops)  # warm-up pass
+    samples = [_time_loops(bench.func, loops) / loops for _ in range(repeats)]
+    return {
+        "group": bench.group,
+        "loops": loops,
+        "repeats": repeats,
+        "min_ns": round(min(samples), 1),
+        "median_ns": round(statistics.median(samples), 1),
+        "stdev_ns": round(statistics.stdev(samples), 1) if len(samples) > 1 else 0.0,
+    }
+
+
+def load_benchmarks(modules: Optional[list] = None) -> dict[str, Benchmark]:
+    for module in modules or BENCHMARK_MODULES:
+        importlib.import_module(module)
+    return dict(REGISTRY)
+
+
+def host_info() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def _format_ns(value: float) -> str:
+    if value >= 1_000_000:
+        return f"{value / 1_000_000:.2f} ms"
+    if value >= 1_000:
+        return f"{value / 1_000:.2f} us"
+    return f"{value:.0f} ns"
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Return (name, baseline_ns, current_ns, ratio) for benchmarks slower than threshold"""
+    regressions = []
+    for name, stats in results.items():
+        old = baseline.get("benchmarks", {}).get(name)
+        if not old:
+            continue
+        # Compare minimums: least sensitive to scheduler and frequency noise
+        ratio = stats["min_ns"] / old["min_ns"] if old["min_ns"] else 1.0
+        stats["baseline_min_ns"] = old["min_ns"]
+        stats["change"] = round(ratio - 1.0, 4)
+        if ratio > 1.0 + threshold:
+            regressions.append((name, old["min_ns"], stats["min_ns"], ratio))
+    return regressions
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run backend microbenchmarks")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--repeats", type=int, default=7, help="Timed repeats per benchmark")
+    parser.add_argument("--target-ms", type=float, default=50.0, help="Minimum runtime of one repeat")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="Baseline file to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results to --baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative slowdown that counts as a regression (0.25 = 25%%)")
+    parser.add_argument("--json", type=Path, default=None, help="Also write results to this file")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    benches = load_benchmarks()
+    selected = [b for name, b in sorted(benches.items()) if args.filter in name]
+
+    if args.list:
+        for bench in selected:
+            print(f"{bench.group:16} {bench.name}")
+        return 0
+
+    results = {}
+    for bench in selected:
+        results[bench.name] = measure(bench, args.repeats, args.target_ms)
+        stats = results[bench.name]
+        print(f"{bench.name:60} {_format_ns(stats['min_ns']):>12} (median {_format_ns(stats['median_ns'])})")
+
+    payload = {"host": host_info(), "benchmarks": results}
+
+    regressions = []
+    if args.save_baseline:
+        saved = payload
+        if args.baseline.exists() and args.filter:
+            # Partial runs only refresh the benchmarks they measured
+            saved = json.loads(args.baseline.read_text())
+            saved["host"] = payload["host"]
+            saved.setdefault("benchmarks", {}).update(results)
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(saved, indent=2, sort_keys=True) + "\n")
+        print(f"\nBaseline written to {args.baseline}")
+    elif args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("host", {}).get("python") != payload["host"]["python"]:
+            print(f"\nNote: baseline recorded on Python {baseline['host'].get('python')}, "
+                  f"running {payload['host']['python']}")
+        regressions = compare(results, baseline, args.threshold)
+        print(f"\nCompared with {args.baseline.name}:")
+        for name, stats in results.items():
+            if "change" in stats:
+                print(f"  {name:58} {stats['change'] * 100:+7.1f}%")
+
+    if args.json:
+        args.json.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}:")
+        for name, old, new, ratio in regressions:
+            print(f"  {name}: {_format_ns(old)} -> {_format_ns(new)} ({ratio:.2f}x)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Cold Start Benchmark
+Measures what a fresh worker pays before it can serve: `import app.main` (with a
+`-X importtime` breakdown by package) and time from process spawn to the first 200
+from /api/v1/health under the production entry point (`python -m app.server`)
+
+    python -m benchmarks.startup                                  # fails past the default budgets
+    python -m benchmarks.startup --import-budget-ms 800 --first-200-budget-ms 2000
+    python -m benchmarks.startup --top 30                         # longer import breakdown
+
+Exits with status 1 when the median of either measurement is over its budget, so it can gate CI.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def _env(**overrides: str) -> dict:
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env.update(overrides)
+    return env
+
+
+def parse_importtime(stderr: str) -> Tuple[List[Tuple[str, int, int]], int]:
+    """(module, self_us, cumulative_us) per imported module, and the cumulative time of app.main"""
+    modules = []
+    total_us = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not self_us.isdigit():
+            continue  # header line
+        modules.append((name, int(self_us), int(cumulative_us)))
+        if name == "app.main":
+            total_us = int(cumulative_us)
+    return modules, total_us
+
+
+def measure_import() -> Tuple[float, Dict[str, float]]:
+    """Milliseconds to import app.main in a fresh interpreter, and self time per top-level package"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=_env(), capture_output=True, text=True, check=True,
+    )
+    modules, total_us = parse_importtime(completed.stderr)
+    by_package: Dict[str, float] = defaultdict(float)
+    for name, self_us, _ in modules:
+        package = name.split(".")[0]
+        # Keep the app's own modules apart; they are what this repo can change
+        if package == "app":
+            package = ".".join(name.split(".")[:2])
+        by_package[package] += self_us / 1000.0
+    return total_us / 1000.0, dict(by_package)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_200(timeout: float) -> float:
+    """Milliseconds from spawning one server worker to its first 200 on /api/v1/health"""
+    port = _free_port()
+    env = _env(SERVER_HOST="127.0.0.1", PORT=str(port), WEB_CONCURRENCY="1", LOG_LEVEL="WARNING")
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "app.server"], cwd=BACKEND_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited with status {process.returncode} before serving")
+            try:
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1.0)
+                conn.request("GET", "/api/v1/health")
+                status = conn.getresponse().status
+                conn.close()
+                if status == 200:
+                    return (time.perf_counter() - started) * 1000.0
+            except OSError:
+                pass
+            time.sleep(0.005)
+        raise RuntimeError(f"no 200 from /api/v1/health within {timeout:.0f}s")
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import time and time-to-first-200 of a fresh worker")
+    parser.add_argument("--repeats", type=int, default=5, help="Fresh processes per measurement (median reported)")
+    parser.add_argument("--import-budget-ms", type=float,
+                        default=float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", 1500)))
+    parser.add_argument("--first-200-budget-ms", type=float,
+                        default=float(os.environ.get("STARTUP_FIRST_200_BUDGET_MS", 3000)))
+    parser.add_argument("--top", type=int, default=15, help="Packages shown in the import breakdown")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for the first 200")
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args(argv)
+
+    # One untimed import so .pyc files exist, as they do in the built image
+    measure_import()
+
+    import_times = []
+    breakdowns = []
+    for _ in range(args.repeats):
+        total_ms, by_package = measure_import()
+        import_times.append(total_ms)
+        breakdowns.append(by_package)
+    first_200_times = [measure_first_200(args.timeout) for _ in range(args.repeats)]
+
+    packages = {name for breakdown in breakdowns for name in breakdown}
+    breakdown = sorted(
+        ((name, statistics.median(b.get(name, 0.0) for b in breakdowns)) for name in packages),
+        key=lambda item: -item[1],
+    )
+    import_ms = statistics.median(import_times)
+    first_200_ms = statistics.median(first_200_times)
+
+    print(f"\nimport app.main self time by package (median of {args.repeats}):")
+    for name, ms in breakdown[:args.top]:
+        print(f"  {name:40} {ms:8.1f} ms")
+    print(f"\n{'measurement':22} {'median ms':>10} {'min ms':>10} {'budget ms':>10}")
+    print(f"{'import app.main':22} {import_ms:>10.1f} {min(import_times):>10.1f} {args.import_budget_ms:>10.0f}")
+    print(f"{'first 200':22} {first_200_ms:>10.1f} {min(first_200_times):>10.1f} {args.first_200_budget_ms:>10.0f}")
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import app.main {import_ms:.0f} ms > {args.import_budget_ms:.0f} ms")
+    if first_200_ms > args.first_200_budget_ms:
+        failures.append(f"first 200 {first_200_ms:.0f} ms > {args.first_200_budget_ms:.0f} ms")
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "repeats": args.repeats,
+        "import_ms": {"median": round(import_ms, 1), "runs": [round(t, 1) for t in import_times]},
+        "first_200_ms": {"median": round(first_200_ms, 1), "runs": [round(t, 1) for t in first_200_times]},
+        "budgets_ms": {"import": args.import_budget_ms, "first_200": args.first_200_budget_ms},
+        "import_breakdown_ms": {name: round(ms, 2) for name, ms in breakdown},
+        "over_budget": failures,
+    }
+    output = args.output or RESULTS_DIR / f"startup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nReport written to {output}")
+
+    for failure in failures:
+        print(f"OVER BUDGET: {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
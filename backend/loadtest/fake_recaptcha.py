@@ -0,0 +1,63 @@
+"""
+Local reCAPTCHA siteverify Stand-in
+Answers like Google's siteverify endpoint with configurable latency, for load tests
+
+Run with:
+    python -m loadtest.fake_recaptcha --port 9001 --latency-ms 80 --jitter-ms 40
+"""
+import argparse
+import asyncio
+import random
+
+from fastapi import FastAPI, Request
+
+
+def create_app(latency_ms: float = 0.0, jitter_ms: float = 0.0, score: float = 0.9,
+               failure_rate: float = 0.0) -> FastAPI:
+    """Build the fake siteverify app"""
+    app = FastAPI(title="Fake reCAPTCHA siteverify", docs_url=None, redoc_url=None, openapi_url=None)
+
+    @app.post("/recaptcha/api/siteverify")
+    async def siteverify(request: Request):
+        body = await request.body()
+
+        delay = latency_ms + random.uniform(0.0, jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000.0)
+
+        # Tokens containing "invalid" (or a random share of requests) fail verification
+        if b"invalid" in body or random.random() < failure_rate:
+            return {"success": False, "error-codes": ["invalid-input-response"]}
+
+        return {
+            "success": True,
+            "score": score,
+            "action": "register",
+            "hostname": "localhost",
+        }
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy", "service": "fake-recaptcha"}
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake reCAPTCHA siteverify server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9001)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform random extra latency")
+    parser.add_argument("--score", type=float, default=0.9, help="Score returned for valid tokens")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of tokens to reject")
+    args = parser.parse_args()
+
+    app = create_app(args.latency_ms, args.jitter_ms, args.score, args.failure_rate)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+
+if __name__ == "__main__":
+    main()
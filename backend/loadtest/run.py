@@ -0,0 +1,299 @@
+"""
+End-to-end Load Test Runner
+Boots app.main:app against a local Postgres and a fake siteverify server,
+drives a weighted traffic mix and reports throughput and latency percentiles per route
+
+Run from the backend directory:
+    python -m loadtest.run --duration 60 --concurrency 50 --recaptcha-latency-ms 80
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from loadtest.scenarios import DEFAULT_MIX, SCENARIOS, Outcome, ScenarioState, parse_mix
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values: list, pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100.0 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(outcomes: list, elapsed: float) -> dict:
+    """Aggregate outcomes into per-route and overall statistics (latencies in ms)"""
+    by_route = defaultdict(list)
+    for outcome in outcomes:
+        by_route[outcome.route].append(outcome)
+    by_route["ALL"] = list(outcomes)
+
+    routes = {}
+    for route, items in sorted(by_route.items()):
+        latencies = sorted(item.latency * 1000.0 for item in items)
+        statuses = defaultdict(int)
+        for item in items:
+            statuses[str(item.status_code) if item.status_code else "error"] += 1
+        routes[route] = {
+            "requests": len(items),
+            "rps": round(len(items) / elapsed, 2) if elapsed else 0.0,
+            "errors": sum(1 for item in items if item.status_code is None or item.status_code >= 500),
+            "status_codes": dict(sorted(statuses.items())),
+            "latency_ms": {
+                "mean": round(sum(latencies) / len(latencies), 2) if latencies else None,
+                "p50": _round(percentile(latencies, 50)),
+                "p95": _round(percentile(latencies, 95)),
+                "p99": _round(percentile(latencies, 99)),
+                "max": _round(latencies[-1] if latencies else None),
+            },
+        }
+    return routes
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+async def _wait_until_healthy(url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                response = await client.get(url, timeout=1.0)
+                if response.status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Service at {url} did not become healthy within {timeout}s")
+
+
+async def drive(base_url: str, mix: dict, duration: float, concurrency: int,
+                warmup_users: int, target_rps: Optional[float]) -> tuple[list, float]:
+    """Run the weighted scenario mix with `concurrency` workers for `duration` seconds"""
+    state = ScenarioState()
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        # Create accounts up front so the login scenario has something to hit
+        for _ in range(warmup_users if "login" in mix else 0):
+            await SCENARIOS["signup"](client, state)
+
+        outcomes: list = []
+        start = time.perf_counter()
+        stop_at = start + duration
+        interval = concurrency / target_rps if target_rps else 0.0
+
+        async def worker() -> None:
+            next_at = time.perf_counter()
+            while time.perf_counter() < stop_at:
+                if interval:
+                    next_at += interval
+                    delay = next_at - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                scenario = SCENARIOS[random.choices(names, weights)[0]]
+                began = time.perf_counter()
+                try:
+                    route, response = await scenario(client, state)
+                    outcomes.append(Outcome(route, response.status_code, time.perf_counter() - began))
+                except httpx.HTTPError as e:
+                    outcomes.append(Outcome(scenario.__name__.replace("run_", ""), None,
+                                            time.perf_counter() - began, error=type(e).__name__))
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return outcomes, elapsed
+
+
+def _service_env(args, recaptcha_port: int) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "DB_HOST": args.db_host,
+        "DB_PORT": str(args.db_port),
+        "DB_NAME": args.db_name,
+        "DB_USER": args.db_user,
+        "DB_PASSWORD": args.db_password,
+        "RECAPTCHA_SECRET_KEY": "loadtest-secret",
+        "RECAPTCHA_VERIFY_URL": f"http://127.0.0.1:{recaptcha_port}/recaptcha/api/siteverify",
+        "PYTHONUNBUFFERED": "1",
+    })
+    if not args.keep_limits:
+        # All load comes from one IP; per-IP limits would only measure the limiter
+        env["RATE_LIMIT_ENABLED"] = "false"
+        env["LOGIN_THROTTLE_ENABLED"] = "false"
+    return env
+
+
+def _prepare_database(args, env: dict) -> None:
+    if not args.skip_migrations:
+        subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=BACKEND_DIR, env=env, check=True)
+    if args.reset:
+        from sqlalchemy import create_engine, text
+        url = f"postgresql://{args.db_user}:{args.db_password}@{args.db_host}:{args.db_port}/{args.db_name}"
+        engine = create_engine(url)
+        with engine.begin() as conn:
+            conn.execute(text("TRUNCATE channel_registrations, users RESTART IDENTITY"))
+        engine.dispose()
+
+
+def compare(current: dict, baseline_path: Path) -> None:
+    """Print per-route throughput and p95/p99 deltas against an earlier result file"""
+    baseline = json.loads(baseline_path.read_text())
+    print(f"\nComparison against {baseline_path.name}")
+    print(f"{'route':32} {'rps':>28} {'p95 ms':>28} {'p99 ms':>28}")
+    for route, stats in current["routes"].items():
+        old = baseline.get("routes", {}).get(route)
+        if not old:
+            continue
+        cells = []
+        for new_value, old_value in (
+            (stats["rps"], old["rps"]),
+            (stats["latency_ms"]["p95"], old["latency_ms"]["p95"]),
+            (stats["latency_ms"]["p99"], old["latency_ms"]["p99"]),
+        ):
+            if new_value is None or not old_value:
+                cells.append(f"{'n/a':>28}")
+            else:
+                change = (new_value - old_value) / old_value * 100.0
+                cells.append(f"{old_value:>8} -> {new_value:<8} {change:+6.1f}%")
+        print(f"{route:32} " + " ".join(cells))
+
+
+def print_report(routes: dict, elapsed: float) -> None:
+    print(f"\nDuration: {elapsed:.1f}s")
+    print(f"{'route':32} {'reqs':>8} {'rps':>9} {'err':>6} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for route, stats in routes.items():
+        latency = stats["latency_ms"]
+        print(
+            f"{route:32} {stats['requests']:>8} {stats['rps']:>9} {stats['errors']:>6} "
+            f"{latency['p50']!s:>9} {latency['p95']!s:>9} {latency['p99']!s:>9}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="PayGate Prime end-to-end load test")
+    parser.add_argument("--duration", type=float, default=30.0, help="Measured run length in seconds")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent virtual users")
+    parser.add_argument("--rps", type=float, default=None, help="Target total request rate (default: closed loop)")
+    parser.add_argument("--mix", default=",".join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+                        help="Scenario weights, e.g. register=10,signup=10,login=20,networks=60")
+    parser.add_argument("--warmup-users", type=int, default=20, help="Accounts created before the run for login")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes for the app")
+    parser.add_argument("--recaptcha-latency-ms", type=float, default=50.0)
+    parser.add_argument("--recaptcha-jitter-ms", type=float, default=20.0)
+    parser.add_argument("--recaptcha-failure-rate", type=float, default=0.0)
+    parser.add_argument("--db-host", default=os.environ.get("DB_HOST", "localhost"))
+    parser.add_argument("--db-port", type=int, default=int(os.environ.get("DB_PORT", 5432)))
+    parser.add_argument("--db-name", default=os.environ.get("DB_NAME", "paygate_loadtest"))
+    parser.add_argument("--db-user", default=os.environ.get("DB_USER", "postgres"))
+    parser.add_argument("--db-password", default=os.environ.get("DB_PASSWORD", "devpassword123"))
+    parser.add_argument("--skip-migrations", action="store_true", help="Do not run alembic upgrade head first")
+    parser.add_argument("--reset", action="store_true", help="Truncate registrations and users before the run")
+    parser.add_argument("--keep-limits", action="store_true", help="Leave per-IP rate limits and login throttling on")
+    parser.add_argument("--base-url", default=None, help="Target an already running app instead of booting one")
+    parser.add_argument("--label", default="", help="Free-form label stored with the results")
+    parser.add_argument("--output", type=Path, default=None, help="Results file (default: loadtest/results/<timestamp>.json)")
+    parser.add_argument("--compare", type=Path, default=None, help="Earlier results file to diff against")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+    mix = parse_mix(args.mix)
+
+    processes = []
+    try:
+        base_url = args.base_url
+        if base_url is None:
+            recaptcha_port = _free_port()
+            app_port = _free_port()
+            env = _service_env(args, recaptcha_port)
+
+            processes.append(subprocess.Popen(
+                [sys.executable, "-m", "loadtest.fake_recaptcha", "--port", str(recaptcha_port),
+                 "--latency-ms", str(args.recaptcha_latency_ms),
+                 "--jitter-ms", str(args.recaptcha_jitter_ms),
+                 "--failure-rate", str(args.recaptcha_failure_rate)],
+                cwd=BACKEND_DIR, env=env,
+            ))
+            _prepare_database(args, env)
+            processes.append(subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+                 "--port", str(app_port), "--workers", str(args.workers),
+                 "--log-level", "warning", "--no-access-log"],
+                cwd=BACKEND_DIR, env=env,
+            ))
+            base_url = f"http://127.0.0.1:{app_port}"
+            asyncio.run(_wait_until_healthy(f"http://127.0.0.1:{recaptcha_port}/health"))
+
+        asyncio.run(_wait_until_healthy(f"{base_url}/api/v1/health"))
+        outcomes, elapsed = asyncio.run(drive(
+            base_url, mix, args.duration, args.concurrency, args.warmup_users, args.rps,
+        ))
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=15)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    routes = summarize(outcomes, elapsed)
+    result = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "label": args.label,
+        "host": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "config": {
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "target_rps": args.rps,
+            "mix": mix,
+            "workers": args.workers,
+            "recaptcha_latency_ms": args.recaptcha_latency_ms,
+            "recaptcha_jitter_ms": args.recaptcha_jitter_ms,
+            "keep_limits": args.keep_limits,
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "routes": routes,
+    }
+
+    print_report(routes, elapsed)
+
+    output = args.output or RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(result, args.compare)
+
+
+if __name__ == "__main__":
+    main()
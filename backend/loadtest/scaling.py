@@ -0,0 +1,111 @@
+"""
+Worker Scaling Benchmark
+Starts the production entry point (python -m app.server) with 1..N workers and measures
+throughput and latency at each step
+
+Run from the backend directory:
+    python -m loadtest.scaling --max-workers 4 --duration 20 --concurrency 64
+"""
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import os
+import platform
+import signal
+import subprocess
+import sys
+
+from loadtest.run import BACKEND_DIR, RESULTS_DIR, _free_port, _wait_until_healthy, drive, summarize
+from loadtest.scenarios import parse_mix
+
+
+def _client(base_url: str, mix: dict, duration: float, concurrency: int) -> tuple[list, float]:
+    return asyncio.run(drive(base_url, mix, duration, concurrency, warmup_users=0, target_rps=None))
+
+
+def measure(workers: int, args, mix: dict) -> dict:
+    port = _free_port()
+    env = dict(os.environ)
+    env.update({
+        "PORT": str(port),
+        "SERVER_HOST": "127.0.0.1",
+        "WEB_CONCURRENCY": str(workers),
+        "SERVER_MAX_WORKERS": str(workers),
+        "RATE_LIMIT_ENABLED": "false",
+        "LOGIN_THROTTLE_ENABLED": "false",
+        "LOG_LEVEL": "WARNING",
+    })
+    server = subprocess.Popen([sys.executable, "-m", "app.server"], cwd=BACKEND_DIR, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(_wait_until_healthy(f"{base_url}/api/v1/health"))
+        # Spread the load generator over several processes so it is not the bottleneck
+        per_client = max(1, args.concurrency // args.client_processes)
+        with ProcessPoolExecutor(args.client_processes) as pool:
+            futures = [
+                pool.submit(_client, base_url, mix, args.duration, per_client)
+                for _ in range(args.client_processes)
+            ]
+            runs = [future.result() for future in futures]
+    finally:
+        server.send_signal(signal.SIGTERM)
+        try:
+            server.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+    outcomes = [outcome for run_outcomes, _ in runs for outcome in run_outcomes]
+    elapsed = max(elapsed for _, elapsed in runs)
+    return summarize(outcomes, elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure throughput scaling over uvicorn worker counts")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds measured per worker count")
+    parser.add_argument("--concurrency", type=int, default=64, help="Total concurrent virtual users")
+    parser.add_argument("--client-processes", type=int, default=2, help="Load generator processes")
+    parser.add_argument("--mix", default="networks=1",
+                        help="Scenario weights; the default needs no database")
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    mix = parse_mix(args.mix)
+    steps = {}
+    for workers in range(1, args.max_workers + 1):
+        routes = measure(workers, args, mix)
+        steps[str(workers)] = routes
+        overall = routes["ALL"]
+        print(
+            f"workers={workers:<3} rps={overall['rps']:>9}  p50={overall['latency_ms']['p50']}ms  "
+            f"p95={overall['latency_ms']['p95']}ms  p99={overall['latency_ms']['p99']}ms  "
+            f"errors={overall['errors']}"
+        )
+
+    base_rps = steps["1"]["ALL"]["rps"] or 1.0
+    print("\nSpeed-up over 1 worker:")
+    for workers, routes in steps.items():
+        print(f"  {workers:>3} worker(s): {routes['ALL']['rps'] / base_rps:.2f}x")
+
+    result = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "host": {"python": platform.python_version(), "machine": platform.machine(), "cpus": os.cpu_count()},
+        "config": {
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "client_processes": args.client_processes,
+            "mix": mix,
+        },
+        "workers": steps,
+    }
+    output = args.output or RESULTS_DIR / f"scaling_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Load Test Scenarios
+Request generators for registration, signup, login and networks traffic
+"""
+from dataclasses import dataclass, field
+from typing import Optional
+import random
+import secrets
+
+import httpx
+
+DEFAULT_MIX = {"register": 10, "signup": 10, "login": 20, "networks": 60}
+
+LOGIN_PASSWORD = "LoadTest-Password-1"
+
+# (network, currency, address factory) pairs accepted by the validators
+_PAYOUT_TARGETS = [
+    ("ETH", "USDT", lambda: "0x" + secrets.token_hex(20)),
+    ("BSC", "USDC", lambda: "0x" + secrets.token_hex(20)),
+    ("POLYGON", "USDC", lambda: "0x" + secrets.token_hex(20)),
+    ("TRX", "USDT", lambda: "T" + "".join(random.choices("ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz123456789", k=33))),
+    ("SOL", "USDC", lambda: "".join(random.choices("ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz123456789", k=44))),
+]
+
+_NETWORK_PATHS = ["/api/v1/networks/mappings", "/api/v1/networks/list", "/api/v1/networks/currencies"]
+
+
+@dataclass
+class Outcome:
+    """Result of one scenario request"""
+    route: str
+    status_code: Optional[int]
+    latency: float
+    error: Optional[str] = None
+
+
+@dataclass
+class ScenarioState:
+    """Shared state between scenario runs (e.g. accounts available for login)"""
+    users: list = field(default_factory=list)
+
+
+def _channel_id() -> str:
+    return "-100" + "".join(random.choices("0123456789", k=10))
+
+
+def registration_payload() -> dict:
+    network, currency, address = random.choice(_PAYOUT_TARGETS)
+    payload = {
+        "open_channel_id": _channel_id(),
+        "open_channel_title": f"Load test open channel {secrets.token_hex(4)}",
+        "open_channel_description": "Public channel created by the load test harness. " * 4,
+        "closed_channel_id": _channel_id(),
+        "closed_channel_title": f"Load test premium channel {secrets.token_hex(4)}",
+        "closed_channel_description": "Premium channel created by the load test harness. " * 4,
+        "sub_1_price": 9.99,
+        "sub_1_time": 30,
+        "client_wallet_address": address(),
+        "client_payout_currency": currency,
+        "client_payout_network": network,
+        "captcha_token": "loadtest-" + secrets.token_urlsafe(48),
+    }
+    if random.random() < 0.5:
+        payload.update({"sub_2_price": 24.99, "sub_2_time": 90})
+    return payload
+
+
+def signup_payload() -> dict:
+    suffix = secrets.token_hex(6)
+    return {
+        "email": f"loadtest+{suffix}@example.com",
+        "username": f"lt_{suffix}",
+        "password": LOGIN_PASSWORD,
+        "confirm_password": LOGIN_PASSWORD,
+    }
+
+
+async def run_register(client: httpx.AsyncClient, state: ScenarioState) -> tuple[str, httpx.Response]:
+    return "POST /register/", await client.post("/api/v1/register/", json=registration_payload())
+
+
+async def run_signup(client: httpx.AsyncClient, state: ScenarioState) -> tuple[str, httpx.Response]:
+    payload = signup_payload()
+    response = await client.post("/api/v1/auth/signup", json=payload)
+    if response.status_code == 201:
+        state.users.append(payload["email"])
+    return "POST /auth/signup", response
+
+
+async def run_login(client: httpx.AsyncClient, state: ScenarioState) -> tuple[str, httpx.Response]:
+    if not state.users:
+        return await run_signup(client, state)
+    email = random.choice(state.users)
+    # One in five attempts uses a wrong password, like real traffic
+    password = LOGIN_PASSWORD if random.random() >= 0.2 else "wrong-password"
+    return "POST /auth/login", await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+
+
+async def run_networks(client: httpx.AsyncClient, state: ScenarioState) -> tuple[str, httpx.Response]:
+    path = random.choice(_NETWORK_PATHS)
+    return f"GET {path.replace('/api/v1', '')}", await client.get(path)
+
+
+SCENARIOS = {
+    "register": run_register,
+    "signup": run_signup,
+    "login": run_login,
+    "networks": run_networks,
+}
+
+
+def parse_mix(value: str) -> dict:
+    """Parse 'register=10,login=20' into a weight dict"""
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario: {name}")
+        mix[name] = float(weight)
+    return mix
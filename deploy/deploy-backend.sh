@@ -11,6 +11,9 @@ SERVICE_NAME="mcp-test-paygate-api"
 DB_INSTANCE_NAME="mcp-test-paygate-db"
 DB_NAME="paygate_prime"
 DB_USER="paygate_user"
+# Addresses of the proxy in front of the container whose X-Forwarded-For is trusted.
+# Required: the app's default (127.0.0.1) would give every client the proxy's address.
+FORWARDED_ALLOW_IPS="${FORWARDED_ALLOW_IPS:?Set FORWARDED_ALLOW_IPS to the front-end proxy address(es)}"
 
 # Get Cloud SQL connection name
 CONNECTION_NAME=$(gcloud sql instances describe $DB_INSTANCE_NAME --format='value(connectionName)')
@@ -39,6 +42,7 @@ gcloud run deploy $SERVICE_NAME \
     --set-env-vars="RECAPTCHA_THRESHOLD=0.5" \
     --set-env-vars="RATE_LIMIT_ENABLED=true" \
     --set-env-vars="ENVIRONMENT=production" \
+    --set-env-vars="^@^FORWARDED_ALLOW_IPS=$FORWARDED_ALLOW_IPS" \
     --add-cloudsql-instances=$CONNECTION_NAME \
     --max-instances=10 \
     --min-instances=0 \
@@ -1,6 +1,7 @@
 #!/bin/bash
 
 # Run database migrations on Cloud SQL
+# DRY_RUN=1 prints the pending SQL with the lock each statement takes, without applying it
 
 set -e
 
@@ -38,6 +39,13 @@ PROXY_PID=$!
 # Wait for proxy to be ready
 sleep 5
 
+if [ "${DRY_RUN:-0}" = "1" ]; then
+    echo "Dry run: pending migrations and expected locks"
+    python -m app.db.online_migrations plan
+    kill $PROXY_PID
+    exit 0
+fi
+
 # Run Alembic migrations
 echo "Running Alembic migrations..."
 alembic upgrade head